@@ -0,0 +1,45 @@
+"""add post revisions
+
+Revision ID: 0b6e2d9a4f15
+Revises: f5a18c3d7b20
+Create Date: 2025-08-23 14:07:52.381046
+
+Adds post_revisions. A post's history starts at its first edit, which
+records the replaced version as revision 1, so existing posts need no
+backfill. uq_post_revisions_post_id_number is also the index revisions are
+listed and rebuilt through.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6e2d9a4f15'
+down_revision: Union[str, None] = 'f5a18c3d7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('post_revisions',
+    sa.Column('post_id', postgresql.UUID(as_uuid=False), nullable=False),
+    sa.Column('number', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('content', sa.String(), nullable=True),
+    sa.Column('delta', sa.JSON(), nullable=True),
+    sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('post_id', 'number', name='uq_post_revisions_post_id_number')
+    )
+    op.create_index(op.f('ix_post_revisions_id'), 'post_revisions', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_post_revisions_id'), table_name='post_revisions')
+    op.drop_table('post_revisions')
@@ -0,0 +1,35 @@
+"""add opening balances
+
+Revision ID: 1c8f4e7b2a93
+Revises: 0b6e2d9a4f15
+Create Date: 2025-08-30 10:12:45.902716
+
+Adds account_balances.opening_balance, the sum of each email's
+transactions in detached partitions, so reconciling balances does not
+reset them to the months still attached. With a constant default the new
+column is added without rewriting the table. Partitions detached before
+this revision are not counted; reattach them and detach them again with
+`python -m app.scripts.transaction_partitions detach` before reconciling.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c8f4e7b2a93'
+down_revision: Union[str, None] = '0b6e2d9a4f15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'account_balances',
+        sa.Column('opening_balance', sa.Float(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('account_balances', 'opening_balance')
@@ -0,0 +1,50 @@
+"""add account balances table
+
+Revision ID: a3c9e1f04b27
+Revises: 753a43b12ef0
+Create Date: 2025-07-12 10:04:18.220931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c9e1f04b27'
+down_revision: Union[str, None] = '753a43b12ef0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('account_balances',
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('balance', sa.Float(), nullable=False),
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_account_balances_email'), 'account_balances', ['email'], unique=True)
+    op.create_index(op.f('ix_account_balances_id'), 'account_balances', ['id'], unique=False)
+
+    # Seed balances from the existing transaction history so reads are correct
+    # straight after the upgrade. Later drift is fixed with
+    # `python -m app.scripts.reconcile_balances`.
+    op.execute(
+        """
+        INSERT INTO account_balances (id, email, balance)
+        SELECT gen_random_uuid()::text, email,
+               SUM(CASE WHEN type = 'withdrawal' THEN -amount ELSE amount END)
+        FROM transactions
+        GROUP BY email
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_account_balances_id'), table_name='account_balances')
+    op.drop_index(op.f('ix_account_balances_email'), table_name='account_balances')
+    op.drop_table('account_balances')
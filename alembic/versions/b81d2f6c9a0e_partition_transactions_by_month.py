@@ -0,0 +1,118 @@
+"""partition transactions by month
+
+Revision ID: b81d2f6c9a0e
+Revises: a3c9e1f04b27
+Create Date: 2025-07-19 14:37:02.518240
+
+Rebuilds `transactions` as a table range partitioned by month on created_at.
+Postgres requires the partition key in every unique constraint, so the primary
+key becomes (id, created_at). Range queries only scan the partitions they
+overlap, and old months can be removed with DETACH PARTITION instead of a
+bulk DELETE. New months are created ahead of time with
+`python -m app.scripts.transaction_partitions create`; rows outside every
+monthly partition land in transactions_default.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81d2f6c9a0e'
+down_revision: Union[str, None] = 'a3c9e1f04b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Number of monthly partitions created after the current month
+MONTHS_AHEAD = 3
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE transactions RENAME TO transactions_legacy")
+    op.execute("ALTER INDEX ix_transactions_email RENAME TO ix_transactions_legacy_email")
+    op.execute("ALTER INDEX ix_transactions_id RENAME TO ix_transactions_legacy_id")
+    op.execute("ALTER TABLE transactions_legacy RENAME CONSTRAINT transactions_pkey TO transactions_legacy_pkey")
+
+    op.execute(
+        """
+        CREATE TABLE transactions (
+            email VARCHAR NOT NULL,
+            amount FLOAT NOT NULL,
+            type VARCHAR NOT NULL,
+            id VARCHAR NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            CONSTRAINT transactions_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT")
+
+    # One partition per month from the oldest existing row up to MONTHS_AHEAD
+    # months from now
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month DATE := date_trunc(
+                'month', COALESCE((SELECT min(created_at) FROM transactions_legacy), now())
+            );
+            last_month DATE := date_trunc('month', now()) + interval '{MONTHS_AHEAD} months';
+        BEGIN
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF transactions FOR VALUES FROM (%L) TO (%L)',
+                    'transactions_' || to_char(month, 'YYYY_MM'),
+                    month,
+                    month + interval '1 month'
+                );
+                month := month + interval '1 month';
+            END LOOP;
+        END
+        $$
+        """
+    )
+
+    op.execute("CREATE INDEX ix_transactions_id ON transactions (id)")
+    op.execute("CREATE INDEX ix_transactions_email_created_at ON transactions (email, created_at)")
+    op.execute("CREATE INDEX ix_transactions_created_at_brin ON transactions USING brin (created_at)")
+
+    op.execute(
+        """
+        INSERT INTO transactions (email, amount, type, id, created_at, updated_at)
+        SELECT email, amount, type, id, COALESCE(created_at, now()), updated_at
+        FROM transactions_legacy
+        """
+    )
+    op.execute("DROP TABLE transactions_legacy")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE transactions RENAME TO transactions_partitioned")
+    op.execute("ALTER INDEX ix_transactions_id RENAME TO ix_transactions_partitioned_id")
+    op.execute("ALTER TABLE transactions_partitioned RENAME CONSTRAINT transactions_pkey TO transactions_partitioned_pkey")
+
+    op.execute(
+        """
+        CREATE TABLE transactions (
+            email VARCHAR NOT NULL,
+            amount FLOAT NOT NULL,
+            type VARCHAR NOT NULL,
+            id VARCHAR NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            CONSTRAINT transactions_pkey PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO transactions (email, amount, type, id, created_at, updated_at)
+        SELECT email, amount, type, id, created_at, updated_at
+        FROM transactions_partitioned
+        """
+    )
+    op.execute("DROP TABLE transactions_partitioned CASCADE")
+    op.create_index('ix_transactions_email', 'transactions', ['email'], unique=False)
+    op.create_index('ix_transactions_id', 'transactions', ['id'], unique=False)
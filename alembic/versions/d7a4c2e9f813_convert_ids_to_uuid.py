@@ -0,0 +1,201 @@
+"""convert ids to uuid
+
+Revision ID: d7a4c2e9f813
+Revises: c4e7a93d15f2
+Create Date: 2025-08-02 11:26:40.118305
+
+Converts every `id` column, and `posts.author_id`, from VARCHAR holding
+uuid7 text to native UUID (16 bytes instead of 37, compared as integers),
+online. Requires PostgreSQL 13+ (row triggers on the partitioned
+transactions table).
+
+1. Each table gets a nullable `<column>_uuid` shadow column, kept in sync
+   for new and updated rows by a trigger.
+2. Existing rows are backfilled in batches of BATCH_SIZE ids, each batch
+   committed on its own, so locks are short and replicas keep up.
+3. NOT NULL checks are added NOT VALID and validated, and the unique and
+   plain indexes on the shadow columns are built CONCURRENTLY (per
+   partition for transactions), all without blocking writes.
+4. One short transaction swaps the columns: it drops the old columns (and
+   with them the old primary keys and indexes), renames the shadow columns
+   and turns the prebuilt indexes into the primary keys. The foreign key
+   of posts.author_id is re-added NOT VALID and validated afterwards.
+
+The application binds and reads ids through `app.db.types.GUID`, which
+works against either column type, so it can be deployed before or after
+this migration. The downgrade converts back in place with table rewrites.
+"""
+from typing import Dict, List, Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a4c2e9f813'
+down_revision: Union[str, None] = 'c4e7a93d15f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows converted per committed batch
+BATCH_SIZE = 10_000
+
+# Columns converted per table; users must be swapped together with posts,
+# whose author_id references it
+COLUMNS: Dict[str, List[str]] = {
+    "users": ["id"],
+    "posts": ["id", "author_id"],
+    "account_balances": ["id"],
+    "idempotency_keys": ["id"],
+    "transactions": ["id"],
+}
+
+
+def _partitions(table: str) -> List[str]:
+    return op.get_bind().execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+            JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+            WHERE parent.relname = :table
+            ORDER BY child.relname
+            """
+        ),
+        {"table": table},
+    ).scalars().all()
+
+
+def _add_shadow_columns(table: str, columns: List[str]) -> None:
+    for column in columns:
+        op.execute(f"ALTER TABLE {table} ADD COLUMN {column}_uuid UUID")
+    assignments = " ".join(f"NEW.{column}_uuid := NEW.{column}::uuid;" for column in columns)
+    op.execute(
+        f"""
+        CREATE FUNCTION {table}_fill_uuid() RETURNS trigger AS $$
+        BEGIN
+            {assignments}
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        f"CREATE TRIGGER {table}_fill_uuid BEFORE INSERT OR UPDATE ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION {table}_fill_uuid()"
+    )
+
+
+def _backfill(table: str, columns: List[str]) -> None:
+    """Walks the table in id order (using ix_<table>_id), one batch per commit."""
+    connection = op.get_bind()
+    assignments = ", ".join(f"{column}_uuid = {column}::uuid" for column in columns)
+    last = ""
+    while True:
+        upper = connection.execute(
+            text(
+                f"SELECT max(id) FROM (SELECT id FROM {table} WHERE id > :last "
+                f"ORDER BY id LIMIT :batch_size) AS batch"
+            ),
+            {"last": last, "batch_size": BATCH_SIZE},
+        ).scalar()
+        if upper is None:
+            break
+        connection.execute(
+            text(
+                f"UPDATE {table} SET {assignments} "
+                f"WHERE id > :last AND id <= :upper AND id_uuid IS NULL"
+            ),
+            {"last": last, "upper": upper},
+        )
+        last = upper
+
+
+def _add_not_null_checks(table: str, columns: List[str]) -> None:
+    # A validated check lets SET NOT NULL in the swap skip its table scan
+    for column in columns:
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_{column}_uuid_not_null "
+            f"CHECK ({column}_uuid IS NOT NULL) NOT VALID"
+        )
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{column}_uuid_not_null")
+
+
+def _build_indexes(table: str) -> None:
+    if table == "transactions":
+        # Partitioned: the primary key is (id, created_at) and indexes cannot
+        # be built concurrently on the parent, so they are built on each
+        # partition and attached to the parent's in the swap
+        for partition in _partitions(table):
+            op.execute(
+                f"CREATE UNIQUE INDEX CONCURRENTLY {partition}_id_uuid_key "
+                f"ON {partition} (id_uuid, created_at)"
+            )
+            op.execute(f"CREATE INDEX CONCURRENTLY {partition}_id_uuid_idx ON {partition} (id_uuid)")
+        return
+    op.execute(f"CREATE UNIQUE INDEX CONCURRENTLY {table}_id_uuid_key ON {table} (id_uuid)")
+    op.execute(f"CREATE INDEX CONCURRENTLY ix_{table}_id_uuid ON {table} (id_uuid)")
+
+
+def _swap_columns(table: str, columns: List[str]) -> None:
+    op.execute(f"DROP TRIGGER {table}_fill_uuid ON {table}")
+    op.execute(f"DROP FUNCTION {table}_fill_uuid()")
+    for column in columns:
+        # Dropping id also drops the old primary key and ix_<table>_id
+        op.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+        op.execute(f"ALTER TABLE {table} RENAME COLUMN {column}_uuid TO {column}")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL")
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {table}_{column}_uuid_not_null")
+
+    if table == "transactions":
+        # The parent's primary key and index attach the partitions' own
+        # instead of building new ones
+        for partition in _partitions(table):
+            op.execute(
+                f"ALTER TABLE {partition} ADD CONSTRAINT {partition}_pkey "
+                f"PRIMARY KEY USING INDEX {partition}_id_uuid_key"
+            )
+        op.execute("ALTER TABLE transactions ADD CONSTRAINT transactions_pkey PRIMARY KEY (id, created_at)")
+        op.execute("CREATE INDEX ix_transactions_id ON transactions (id)")
+        return
+    op.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY USING INDEX {table}_id_uuid_key"
+    )
+    op.execute(f"ALTER INDEX ix_{table}_id_uuid RENAME TO ix_{table}_id")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, columns in COLUMNS.items():
+            _add_shadow_columns(table, columns)
+        for table, columns in COLUMNS.items():
+            _backfill(table, columns)
+            _add_not_null_checks(table, columns)
+            _build_indexes(table)
+
+    # The swap: catalog changes only, under short exclusive locks
+    op.execute(f"LOCK TABLE {', '.join(COLUMNS)} IN ACCESS EXCLUSIVE MODE")
+    op.execute("ALTER TABLE posts DROP CONSTRAINT posts_author_id_fkey")
+    for table, columns in COLUMNS.items():
+        _swap_columns(table, columns)
+    op.execute(
+        "ALTER TABLE posts ADD CONSTRAINT posts_author_id_fkey "
+        "FOREIGN KEY (author_id) REFERENCES users (id) NOT VALID"
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE posts VALIDATE CONSTRAINT posts_author_id_fkey")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE posts DROP CONSTRAINT posts_author_id_fkey")
+    for table, columns in COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR USING {column}::text"
+            )
+    op.execute(
+        "ALTER TABLE posts ADD CONSTRAINT posts_author_id_fkey "
+        "FOREIGN KEY (author_id) REFERENCES users (id)"
+    )
@@ -0,0 +1,52 @@
+"""cascade post deletes
+
+Revision ID: e3b9f06a4c71
+Revises: d7a4c2e9f813
+Create Date: 2025-08-09 16:42:13.507921
+
+Deleting a user now deletes their posts in the database (ON DELETE
+CASCADE) instead of SQLAlchemy loading and deleting them one by one.
+posts.author_id gets an index, which the cascade, the chunked purge of
+large accounts and the author feed all look posts up by; users get
+deleted_at, set while a large account is purged in the background.
+
+The index is built CONCURRENTLY and the new foreign key is added NOT
+VALID and validated separately, so posts stays writable throughout.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b9f06a4c71'
+down_revision: Union[str, None] = 'd7a4c2e9f813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_posts_author_id ON posts (author_id)")
+
+    op.execute("ALTER TABLE posts DROP CONSTRAINT posts_author_id_fkey")
+    op.execute(
+        "ALTER TABLE posts ADD CONSTRAINT posts_author_id_fkey "
+        "FOREIGN KEY (author_id) REFERENCES users (id) ON DELETE CASCADE NOT VALID"
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE posts VALIDATE CONSTRAINT posts_author_id_fkey")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE posts DROP CONSTRAINT posts_author_id_fkey")
+    op.execute(
+        "ALTER TABLE posts ADD CONSTRAINT posts_author_id_fkey "
+        "FOREIGN KEY (author_id) REFERENCES users (id)"
+    )
+    op.drop_index(op.f('ix_posts_author_id'), table_name='posts')
+    op.drop_column('users', 'deleted_at')
@@ -0,0 +1,53 @@
+"""add post tags
+
+Revision ID: f5a18c3d7b20
+Revises: e3b9f06a4c71
+Create Date: 2025-08-16 09:51:27.640193
+
+Adds tags, with their post counts, and the post_tags association. The
+primary key (tag_id, post_id) holds each tag's posting list, which tag
+filters are driven from; ix_post_tags_post_id_tag_id gives a post's tags
+and is what the other tags of a multi-tag filter are probed through. Both
+tables are new, so nothing here locks existing ones.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a18c3d7b20'
+down_revision: Union[str, None] = 'e3b9f06a4c71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('tags',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('post_count', sa.Integer(), nullable=False),
+    sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tags_name'), 'tags', ['name'], unique=True)
+    op.create_index(op.f('ix_tags_id'), 'tags', ['id'], unique=False)
+    op.create_table('post_tags',
+    sa.Column('tag_id', postgresql.UUID(as_uuid=False), nullable=False),
+    sa.Column('post_id', postgresql.UUID(as_uuid=False), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tag_id', 'post_id')
+    )
+    op.create_index('ix_post_tags_post_id_tag_id', 'post_tags', ['post_id', 'tag_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_post_tags_post_id_tag_id', table_name='post_tags')
+    op.drop_table('post_tags')
+    op.drop_index(op.f('ix_tags_id'), table_name='tags')
+    op.drop_index(op.f('ix_tags_name'), table_name='tags')
+    op.drop_table('tags')
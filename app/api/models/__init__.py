@@ -1,3 +1,7 @@
 from app.api.models.user import User  # noqa: F401
 from app.api.models.post import Post  # noqa: F401
 from app.api.models.transaction import Transaction  # noqa: F401
+from app.api.models.balance import AccountBalance  # noqa: F401
+from app.api.models.idempotency_key import IdempotencyKey  # noqa: F401
+from app.api.models.tag import Tag  # noqa: F401
+from app.api.models.post_revision import PostRevision  # noqa: F401
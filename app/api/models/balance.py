@@ -0,0 +1,26 @@
+""" Account balance data model """
+
+from sqlalchemy import Column, String, Float
+from app.core.base.model import BaseTableModel
+
+
+class AccountBalance(BaseTableModel):
+    """Running balance per email, maintained alongside every transaction insert."""
+
+    __tablename__ = "account_balances"
+
+    email = Column(String, nullable=False, unique=True, index=True)
+    balance = Column(Float, nullable=False, default=0.0)
+    # Sum of the transactions in detached partitions, which are no longer in
+    # the transactions table (see app/scripts/transaction_partitions.py)
+    opening_balance = Column(Float, nullable=False, default=0.0, server_default="0")
+
+    def __str__(self):
+        return f"AccountBalance(email={self.email}, balance={self.balance})"
+
+    def to_dict(self):
+        return {
+            "email": self.email,
+            "balance": self.balance,
+            "updated_at": self.updated_at.isoformat(),
+        }
@@ -0,0 +1,25 @@
+""" Idempotency key data model """
+
+from sqlalchemy import Column, String, Integer, DateTime, JSON
+from app.core.base.model import BaseTableModel
+
+
+class IdempotencyKey(BaseTableModel):
+    """Stored outcome of a request made with an `Idempotency-Key` header.
+
+    The row is inserted before the request is processed (`response` is null
+    while in progress) and completed in the same commit as the request's own
+    writes, so a completed key always matches what was persisted.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String, nullable=False, unique=True, index=True)
+    request_hash = Column(String, nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response = Column(JSON, nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __str__(self):
+        return f"IdempotencyKey(key={self.key}, status_code={self.status_code})"
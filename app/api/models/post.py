@@ -3,6 +3,8 @@
 from sqlalchemy import Column, String, ForeignKey
 from sqlalchemy.orm import relationship
 from app.core.base.model import BaseTableModel
+from app.api.models.tag import Tag, post_tags
+from app.db.types import GUID
 
 class Post(BaseTableModel):
     """Post data model."""
@@ -11,10 +13,15 @@ class Post(BaseTableModel):
 
     title = Column(String, nullable=False)
     content = Column(String, nullable=False)
-    author_id = Column(String, ForeignKey("users.id"), nullable=False)
+    author_id = Column(
+        GUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     
 
     author = relationship("User", back_populates="posts")
+    # Written through TagRepository, which keeps the tags' post counts; the
+    # database removes the rows of deleted posts (ON DELETE CASCADE)
+    tags = relationship(Tag, secondary=post_tags, order_by=Tag.name, viewonly=True)
 
     def __str__(self):
         return f"Post: {self.title} by {self.author.username}"
@@ -26,6 +33,7 @@ class Post(BaseTableModel):
             "title": self.title,
             "content": self.content,
             "author_id": self.author_id,
+            "tags": [tag.name for tag in self.tags],
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
         }
\ No newline at end of file
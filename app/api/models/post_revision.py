@@ -0,0 +1,35 @@
+""" Post revision data model """
+
+from sqlalchemy import JSON, Column, ForeignKey, Integer, String, UniqueConstraint
+from app.core.base.model import BaseTableModel
+from app.db.types import GUID
+
+
+class PostRevision(BaseTableModel):
+    """A version of a post's title and content.
+
+    Revisions are numbered from 1 per post. A snapshot revision stores the
+    content in full; the others store a delta (`app.utils.delta`) against
+    the previous revision, so a revision is rebuilt from the latest snapshot
+    at or before it.
+    """
+
+    __tablename__ = "post_revisions"
+    # Also the index revisions are listed and rebuilt through
+    __table_args__ = (
+        UniqueConstraint("post_id", "number", name="uq_post_revisions_post_id_number"),
+    )
+
+    post_id = Column(GUID, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False)
+    number = Column(Integer, nullable=False)
+    title = Column(String, nullable=False)
+    # Exactly one of them is set
+    content = Column(String, nullable=True)
+    delta = Column(JSON, nullable=True)
+
+    @property
+    def is_snapshot(self) -> bool:
+        return self.content is not None
+
+    def __str__(self):
+        return f"PostRevision(post_id={self.post_id}, number={self.number})"
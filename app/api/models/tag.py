@@ -0,0 +1,33 @@
+""" Tag data model """
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Table
+from app.core.base.model import BaseTableModel
+from app.db.database import Base
+from app.db.types import GUID
+
+
+class Tag(BaseTableModel):
+    """A post tag. `post_count` is adjusted in the same commit as every
+    change to the tag's postings, so it is never counted on read."""
+
+    __tablename__ = "tags"
+
+    name = Column(String, nullable=False, unique=True, index=True)
+    post_count = Column(Integer, nullable=False, default=0)
+
+    def __str__(self):
+        return f"Tag(name={self.name}, post_count={self.post_count})"
+
+    def to_dict(self):
+        return {"name": self.name, "post_count": self.post_count}
+
+
+# The primary key (tag_id, post_id) is each tag's posting list, in post id
+# (creation) order; the (post_id, tag_id) index gives a post's tags
+post_tags = Table(
+    "post_tags",
+    Base.metadata,
+    Column("tag_id", GUID, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Column("post_id", GUID, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_post_tags_post_id_tag_id", "post_id", "tag_id"),
+)
@@ -5,14 +5,22 @@
     # amount (float)
     # type (string)
 
-from sqlalchemy import Column, String, Float
+from sqlalchemy import Column, String, Float, DateTime, Index, func
 from app.core.base.model import BaseTableModel
 
 class Transaction(BaseTableModel):
 
     __tablename__ = "transactions"
+    # The table is range partitioned by month on created_at (see migration
+    # b81d2f6c9a0e), so created_at is part of the primary key in the database
+    # and must never be null.
+    __table_args__ = (
+        Index("ix_transactions_email_created_at", "email", "created_at"),
+        Index("ix_transactions_created_at_brin", "created_at", postgresql_using="brin"),
+    )
 
-    email = Column(String, nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    email = Column(String, nullable=False)
     amount = Column(Float, nullable=False)
     type = Column(String, nullable=False)
 
@@ -1,6 +1,6 @@
 """User data model"""
 
-from sqlalchemy import Column, String
+from sqlalchemy import Column, DateTime, String
 from sqlalchemy.orm import relationship
 from app.core.base.model import BaseTableModel
 
@@ -11,8 +11,15 @@ class User(BaseTableModel):
     username = Column(String, unique=True, nullable=False)
     email = Column(String, unique=True, nullable=False)
     password = Column(String, nullable=True)
+    # Set while a deleted account's posts are purged in the background; the
+    # account can no longer be used from then on
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
 
-    posts = relationship("Post", back_populates="author", cascade="all, delete-orphan")
+    # The database deletes the posts (ON DELETE CASCADE), so deleting a user
+    # does not load them
+    posts = relationship(
+        "Post", back_populates="author", cascade="all, delete-orphan", passive_deletes=True
+    )
 
     def __str__(self):
         return "User: {}".format(self.username)
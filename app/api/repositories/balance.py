@@ -0,0 +1,159 @@
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.base.repository import BaseRepository
+from app.api.models.balance import AccountBalance
+from app.api.models.transaction import Transaction
+
+# Deposits add to the balance, withdrawals subtract from it
+signed_amount = case(
+    (Transaction.type == "withdrawal", -Transaction.amount),
+    else_=Transaction.amount,
+)
+
+
+class BalanceRepository(BaseRepository[AccountBalance]):
+    """
+    Balance repository class for operations on the AccountBalance model.
+    Balances are never recomputed on read; they are adjusted in place with a
+    row-level upsert inside the same database transaction as the insert that
+    caused the change.
+    Attributes:
+        db (Session): The SQLAlchemy session.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initializes the BalanceRepository with a database session.
+        Args:
+            db (Session): The SQLAlchemy session to use for database operations.
+        """
+        super().__init__(AccountBalance, db)
+
+    def _insert(self):
+        """Returns the dialect specific INSERT construct supporting ON CONFLICT."""
+        if self.db.get_bind().dialect.name == "sqlite":
+            return sqlite.insert(AccountBalance)
+        return postgresql.insert(AccountBalance)
+
+    def get_by_email(self, email: str) -> Optional[AccountBalance]:
+        """
+        Retrieves the balance row for an email.
+        Args:
+            email (str): The account email.
+        Returns:
+            AccountBalance: The balance row, or None if the email has no transactions.
+        """
+        return self.db.query(AccountBalance).filter(AccountBalance.email == email).first()
+
+    def apply_delta(self, email: str, delta: float) -> None:
+        """
+        Adds `delta` to the balance of `email`, creating the row if needed.
+        Does not commit; the caller owns the surrounding transaction.
+        Args:
+            email (str): The account email.
+            delta (float): The signed amount to add.
+        """
+        stmt = self._insert().values(email=email, balance=delta)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AccountBalance.email],
+            set_={
+                "balance": AccountBalance.balance + stmt.excluded.balance,
+                "updated_at": func.now(),
+            },
+        )
+        self.db.execute(stmt)
+
+    def apply_deltas(self, deltas: Dict[str, float]) -> None:
+        """
+        Adds each delta to its email's balance with a single multi-row upsert.
+        Does not commit.
+        Args:
+            deltas (Dict[str, float]): Signed amount to add per email.
+        """
+        if not deltas:
+            return
+        stmt = self._insert().values(
+            [{"email": email, "balance": delta} for email, delta in deltas.items()]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AccountBalance.email],
+            set_={
+                "balance": AccountBalance.balance + stmt.excluded.balance,
+                "updated_at": func.now(),
+            },
+        )
+        self.db.execute(stmt)
+
+    def set_balances(self, balances: List[Tuple[str, float]]) -> None:
+        """
+        Overwrites the balances of the given emails, creating missing rows.
+        Does not commit.
+        Args:
+            balances (List[Tuple[str, float]]): (email, balance) pairs.
+        """
+        if not balances:
+            return
+        stmt = self._insert().values(
+            [{"email": email, "balance": balance} for email, balance in balances]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AccountBalance.email],
+            set_={"balance": stmt.excluded.balance, "updated_at": func.now()},
+        )
+        self.db.execute(stmt)
+
+    def lock_balances(self, emails: List[str]) -> dict:
+        """
+        Locks the existing balance rows of `emails` for the rest of the transaction.
+        Args:
+            emails (List[str]): The account emails.
+        Returns:
+            dict: Mapping of email to its currently stored balance.
+        """
+        rows = self.db.execute(
+            select(AccountBalance.email, AccountBalance.balance)
+            .where(AccountBalance.email.in_(emails))
+            .with_for_update()
+        )
+        return {email: balance for email, balance in rows}
+
+    def next_emails(self, after_email: Optional[str], limit: int) -> List[str]:
+        """
+        Returns the next batch of distinct emails present in the transaction history.
+        Args:
+            after_email (Optional[str]): Keyset cursor; only emails sorting after it are returned.
+            limit (int): Maximum number of emails in the batch.
+        Returns:
+            List[str]: Emails in ascending order.
+        """
+        query = select(Transaction.email).distinct()
+        if after_email is not None:
+            query = query.where(Transaction.email > after_email)
+        query = query.order_by(Transaction.email).limit(limit)
+        return list(self.db.scalars(query))
+
+    def compute_balances(self, emails: List[str]) -> List[Tuple[str, float]]:
+        """
+        Recomputes balances of `emails` from their full transaction history:
+        the opening balance, carried over from detached partitions, plus the
+        transactions still in the table.
+        Args:
+            emails (List[str]): The account emails.
+        Returns:
+            List[Tuple[str, float]]: (email, balance) pairs.
+        """
+        totals = (
+            select(Transaction.email, func.sum(signed_amount).label("total"))
+            .where(Transaction.email.in_(emails))
+            .group_by(Transaction.email)
+            .subquery()
+        )
+        query = select(
+            totals.c.email,
+            totals.c.total + func.coalesce(AccountBalance.opening_balance, 0.0),
+        ).outerjoin(AccountBalance, AccountBalance.email == totals.c.email)
+        return [(email, total) for email, total in self.db.execute(query)]
@@ -0,0 +1,98 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.base.repository import BaseRepository
+from app.api.models.idempotency_key import IdempotencyKey
+
+
+class IdempotencyKeyRepository(BaseRepository[IdempotencyKey]):
+    """
+    Idempotency key repository class for operations on the IdempotencyKey model.
+    Attributes:
+        db (Session): The SQLAlchemy session.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initializes the IdempotencyKeyRepository with a database session.
+        Args:
+            db (Session): The SQLAlchemy session to use for database operations.
+        """
+        super().__init__(IdempotencyKey, db)
+
+    def get_by_key(self, key: str) -> Optional[IdempotencyKey]:
+        """
+        Retrieves a stored idempotency key.
+        Args:
+            key (str): The client supplied key.
+        Returns:
+            IdempotencyKey: The stored key, or None if it was never used.
+        """
+        return self.db.query(IdempotencyKey).filter(IdempotencyKey.key == key).first()
+
+    def claim(self, record: IdempotencyKey) -> bool:
+        """
+        Inserts an in-progress key, relying on the unique constraint to pick one winner
+        among concurrent requests.
+        Args:
+            record (IdempotencyKey): The key to insert.
+        Returns:
+            bool: True if this call inserted the key, False if it already existed.
+        """
+        try:
+            self.create(record)
+            return True
+        except IntegrityError:
+            self.db.rollback()
+            return False
+
+    def release_stale(self, key: str, now: datetime, locked_before: datetime) -> bool:
+        """
+        Deletes a key that is expired, or still in progress but locked before
+        `locked_before`, meaning its request died without committing.
+        Args:
+            key (str): The client supplied key.
+            now (datetime): The current time.
+            locked_before (datetime): Locks older than this are considered abandoned.
+        Returns:
+            bool: True if a key was deleted.
+        """
+        result = self.db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.key == key,
+                (IdempotencyKey.expires_at <= now)
+                | (IdempotencyKey.response.is_(None) & (IdempotencyKey.locked_at < locked_before)),
+            )
+        )
+        self.db.commit()
+        return result.rowcount > 0
+
+    def release(self, record: IdempotencyKey) -> None:
+        """
+        Deletes an in-progress key so the client can retry after a failure.
+        Args:
+            record (IdempotencyKey): The claimed key.
+        """
+        self.db.rollback()
+        self.db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.id == record.id, IdempotencyKey.response.is_(None)
+            )
+        )
+        self.db.commit()
+
+    def purge_expired(self, now: datetime) -> int:
+        """
+        Deletes every expired key.
+        Args:
+            now (datetime): The current time.
+        Returns:
+            int: Number of deleted keys.
+        """
+        result = self.db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now))
+        self.db.commit()
+        return result.rowcount
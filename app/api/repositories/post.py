@@ -1,6 +1,11 @@
+from typing import List, Optional
+
+from sqlalchemy import delete, exists, func, select
 from sqlalchemy.orm import Session
 from app.core.base.repository import BaseRepository
 from app.api.models.post import Post
+from app.api.models.tag import Tag, post_tags
+from app.api.repositories.tag import TagRepository
 
 class PostRepository(BaseRepository[Post]):
     """
@@ -19,6 +24,78 @@ class PostRepository(BaseRepository[Post]):
         """
         super().__init__(Post, db)
 
+    def create_with_tags(self, post: Post, tag_names: List[str]) -> Post:
+        """
+        Inserts a post and tags it in one commit, creating missing tags.
+        Args:
+            post (Post): The post to insert.
+            tag_names (List[str]): Names of the post's tags.
+        Returns:
+            Post: The created post.
+        """
+        tags = TagRepository(self.db)
+        try:
+            self.db.add(post)
+            self.db.flush()
+            tags.add_postings(post.id, tags.get_or_create_ids(tag_names))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self.db.refresh(post)
+        return post
+
+    def update_with_tags(self, post: Post, tag_names: Optional[List[str]] = None) -> Post:
+        """
+        Commits the changes made to a post and, when `tag_names` is given,
+        replaces its tags, only touching the postings that differ.
+        Args:
+            post (Post): The modified post.
+            tag_names (Optional[List[str]]): Names of the post's new tags.
+        Returns:
+            Post: The updated post.
+        """
+        tags = TagRepository(self.db)
+        try:
+            if tag_names is not None:
+                current = set(
+                    self.db.execute(
+                        select(post_tags.c.tag_id).where(post_tags.c.post_id == post.id)
+                    ).scalars()
+                )
+                wanted = set(tags.get_or_create_ids(tag_names))
+                if wanted != current:
+                    tags.remove_postings(post.id, sorted(current - wanted))
+                    tags.add_postings(post.id, sorted(wanted - current))
+                    # A new updated_at invalidates the post's cached encodings
+                    post.updated_at = func.now()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self.db.refresh(post)
+        return post
+
+    def delete(self, id: str) -> bool:
+        """
+        Deletes a post, uncounting it from its tags in the same commit.
+        Args:
+            id (str): The ID of the post.
+        Returns:
+            bool: True if the post was deleted, False if it was not found.
+        """
+        post = self.get(id)
+        if not post:
+            return False
+        try:
+            TagRepository(self.db).release_posts([id])
+            self.db.delete(post)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return True
+
     def get_posts_by_author(self, author_id: str):
         """
         Retrieves all posts by a specific author.
@@ -39,13 +116,123 @@ class PostRepository(BaseRepository[Post]):
         """
         return self.db.query(Post).filter(Post.id == post_id).first()
     
-    def get_author_post_by_id(self, author_id: str, post_id: str):
+    def get_author_post_by_id(self, author_id: str, post_id: str, for_update: bool = False):
         """
         Retrieves a post by its ID for a specific author.
         Args:
             author_id (str): The ID of the author.
             post_id (str): The ID of the post to retrieve.
+            for_update (bool): Locks the post's row until the transaction ends
+                and reloads it, so concurrent edits apply one after the other.
         Returns:
             Post: The Post object if found, or None if not found or does not belong to the author.
         """
-        return self.db.query(Post).filter(Post.author_id == author_id, Post.id == post_id).first()
\ No newline at end of file
+        query = self.db.query(Post).filter(Post.author_id == author_id, Post.id == post_id)
+        if for_update:
+            query = query.with_for_update().populate_existing()
+        return query.first()
+
+    def get_post_rows(
+        self,
+        author_id: Optional[str] = None,
+        tags: Optional[List[Tag]] = None,
+        ids: Optional[List[str]] = None,
+    ) -> List[dict]:
+        """
+        Retrieves posts as plain dictionaries in the `Post.to_dict()` shape.
+        Uses a Core select, so no Post instances are built and nothing is added to
+        the session's identity map; meant for read-only list endpoints. The
+        posts' tag names are aggregated in the same statement.
+
+        With `tags`, only posts having all of them are returned. The query is
+        driven by the posting list of the rarest tag, by post_count, and each
+        of its posts is probed for the other tags through the primary key of
+        post_tags, so the cost follows the rarest tag rather than the largest.
+        Args:
+            author_id (Optional[str]): Only return posts by this author.
+            tags (Optional[List[Tag]]): Only return posts with all these tags.
+            ids (Optional[List[str]]): Only return posts with these IDs, in any order.
+        Returns:
+            List[dict]: The posts.
+        """
+        names_table = post_tags.alias("names")
+        tag_names = (
+            select(func.aggregate_strings(Tag.name, ","))
+            .select_from(names_table.join(Tag, Tag.id == names_table.c.tag_id))
+            .where(names_table.c.post_id == Post.id)
+            .scalar_subquery()
+        )
+        query = select(
+            Post.id,
+            Post.title,
+            Post.content,
+            Post.author_id,
+            tag_names,
+            Post.created_at,
+            Post.updated_at,
+        )
+        if tags:
+            rarest, *others = sorted(tags, key=lambda tag: tag.post_count)
+            postings = post_tags.alias("postings")
+            query = query.select_from(
+                postings.join(Post, Post.id == postings.c.post_id)
+            ).where(postings.c.tag_id == rarest.id)
+            for i, tag in enumerate(others):
+                probe = post_tags.alias(f"probe_{i}")
+                query = query.where(
+                    exists().where(probe.c.post_id == Post.id, probe.c.tag_id == tag.id)
+                )
+        if author_id is not None:
+            query = query.where(Post.author_id == author_id)
+        if ids is not None:
+            query = query.where(Post.id.in_(ids))
+        return [
+            {
+                "id": id,
+                "title": title,
+                "content": content,
+                "author_id": author_id,
+                # Sorted like Post.tags; tag names cannot contain commas
+                "tags": sorted(names.split(",")) if names else [],
+                "created_at": created_at.isoformat(),
+                "updated_at": updated_at.isoformat(),
+            }
+            for id, title, content, author_id, names, created_at, updated_at in self.db.execute(query)
+        ]
+
+    def count_author_posts(self, author_id: str, limit: int) -> int:
+        """
+        Counts an author's posts, stopping at `limit`.
+        Args:
+            author_id (str): The ID of the author.
+            limit (int): Largest count of interest.
+        Returns:
+            int: The number of posts, at most `limit`.
+        """
+        posts = select(Post.id).where(Post.author_id == author_id).limit(limit).subquery()
+        return self.db.execute(select(func.count()).select_from(posts)).scalar_one()
+
+    def delete_author_posts(self, author_id: str, limit: int) -> int:
+        """
+        Deletes up to `limit` posts of an author and commits, loading only their IDs.
+        Args:
+            author_id (str): The ID of the author.
+            limit (int): Most posts deleted.
+        Returns:
+            int: Number of deleted posts.
+        """
+        chunk = self.db.execute(
+            select(Post.id).where(Post.author_id == author_id).limit(limit)
+        ).scalars().all()
+        if not chunk:
+            return 0
+        try:
+            TagRepository(self.db).release_posts(chunk)
+            result = self.db.execute(
+                delete(Post).where(Post.id.in_(chunk)).execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return result.rowcount
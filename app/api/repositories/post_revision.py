@@ -0,0 +1,109 @@
+from typing import List, Tuple
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.core.base.repository import BaseRepository
+from app.api.models.post_revision import PostRevision
+
+
+class PostRevisionRepository(BaseRepository[PostRevision]):
+    """
+    Post revision repository class for operations on the PostRevision model.
+    Every query goes through the (post_id, number) unique index.
+    Attributes:
+        db (Session): The SQLAlchemy session.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initializes the PostRevisionRepository with a database session.
+        Args:
+            db (Session): The SQLAlchemy session to use for database operations.
+        """
+        super().__init__(PostRevision, db)
+
+    def add(self, revision: PostRevision) -> None:
+        """
+        Adds a revision to the session without committing; it is written
+        with the update of the post it records.
+        Args:
+            revision (PostRevision): The revision to add.
+        """
+        self.db.add(revision)
+
+    def get_head(self, post_id: str) -> Tuple[int, int]:
+        """
+        Retrieves the numbers of a post's latest revision and latest snapshot.
+        Args:
+            post_id (str): The ID of the post.
+        Returns:
+            Tuple[int, int]: Both numbers, 0 if the post has no revisions.
+        """
+        last, last_snapshot = self.db.execute(
+            select(
+                func.max(PostRevision.number),
+                func.max(case((PostRevision.content.is_not(None), PostRevision.number))),
+            ).where(PostRevision.post_id == post_id)
+        ).one()
+        return last or 0, last_snapshot or 0
+
+    def get_revision_rows(self, post_id: str) -> List[dict]:
+        """
+        Retrieves a post's revisions, without their content, oldest first.
+        Args:
+            post_id (str): The ID of the post.
+        Returns:
+            List[dict]: number, title, snapshot and created_at of each revision.
+        """
+        query = (
+            select(
+                PostRevision.number,
+                PostRevision.title,
+                PostRevision.content.is_not(None),
+                PostRevision.created_at,
+            )
+            .where(PostRevision.post_id == post_id)
+            .order_by(PostRevision.number)
+        )
+        return [
+            {
+                "number": number,
+                "title": title,
+                "snapshot": snapshot,
+                "created_at": created_at.isoformat(),
+            }
+            for number, title, snapshot, created_at in self.db.execute(query)
+        ]
+
+    def get_chain(self, post_id: str, number: int) -> List[PostRevision]:
+        """
+        Retrieves what revision `number` is rebuilt from: the latest snapshot
+        at or before it and the revisions after that snapshot up to it.
+        Args:
+            post_id (str): The ID of the post.
+            number (int): The revision number.
+        Returns:
+            List[PostRevision]: The revisions, oldest (the snapshot) first, or
+                an empty list if the revision does not exist.
+        """
+        snapshot = (
+            select(func.max(PostRevision.number))
+            .where(
+                PostRevision.post_id == post_id,
+                PostRevision.number <= number,
+                PostRevision.content.is_not(None),
+            )
+            .scalar_subquery()
+        )
+        chain = (
+            self.db.query(PostRevision)
+            .filter(
+                PostRevision.post_id == post_id,
+                PostRevision.number >= snapshot,
+                PostRevision.number <= number,
+            )
+            .order_by(PostRevision.number)
+            .all()
+        )
+        return chain if chain and chain[-1].number == number else []
@@ -0,0 +1,135 @@
+from typing import Iterable, List, Union
+
+from sqlalchemy import Select, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.base.repository import BaseRepository
+from app.api.models.tag import Tag, post_tags
+
+
+class TagRepository(BaseRepository[Tag]):
+    """
+    Tag repository class for operations on the Tag model and post_tags.
+    Postings are only added and removed here, together with the matching
+    adjustment of the tags' `post_count`. None of the methods commit; the
+    caller owns the surrounding transaction.
+    Attributes:
+        db (Session): The SQLAlchemy session.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initializes the TagRepository with a database session.
+        Args:
+            db (Session): The SQLAlchemy session to use for database operations.
+        """
+        super().__init__(Tag, db)
+
+    def _insert(self):
+        """Returns the dialect specific INSERT construct supporting ON CONFLICT."""
+        if self.db.get_bind().dialect.name == "sqlite":
+            return sqlite.insert(Tag)
+        return postgresql.insert(Tag)
+
+    def get_by_names(self, names: Iterable[str]) -> List[Tag]:
+        """
+        Retrieves the tags with the given names.
+        Args:
+            names (Iterable[str]): The tag names.
+        Returns:
+            List[Tag]: The existing tags; unknown names are left out.
+        """
+        return self.db.query(Tag).filter(Tag.name.in_(list(names))).all()
+
+    def get_popular(self, limit: int) -> List[Tag]:
+        """
+        Retrieves the tags with the most posts.
+        Args:
+            limit (int): Most tags returned.
+        Returns:
+            List[Tag]: The tags, most used first.
+        """
+        return self.db.query(Tag).order_by(Tag.post_count.desc(), Tag.name).limit(limit).all()
+
+    def get_or_create_ids(self, names: Iterable[str]) -> List[str]:
+        """
+        Retrieves the ids of the named tags, creating the missing ones.
+        Concurrent creations of the same tag are resolved by the unique name.
+        Args:
+            names (Iterable[str]): The tag names.
+        Returns:
+            List[str]: The tag ids.
+        """
+        # Sorted, so concurrent inserts of overlapping tags lock them in the
+        # same order
+        names = sorted(set(names))
+        if not names:
+            return []
+        # Existing tags are skipped by the insert, so the ids are selected after
+        self.db.execute(
+            self._insert()
+            .values([{"name": name} for name in names])
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        return self.db.execute(select(Tag.id).where(Tag.name.in_(names))).scalars().all()
+
+    def add_postings(self, post_id: str, tag_ids: List[str]) -> None:
+        """
+        Tags a post and counts it in each tag.
+        Args:
+            post_id (str): The ID of the post.
+            tag_ids (List[str]): Tags the post does not have yet.
+        """
+        if not tag_ids:
+            return
+        self.db.execute(
+            insert(post_tags), [{"tag_id": tag_id, "post_id": post_id} for tag_id in tag_ids]
+        )
+        self.db.execute(
+            update(Tag)
+            .where(Tag.id.in_(tag_ids))
+            .values(post_count=Tag.post_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    def remove_postings(self, post_id: str, tag_ids: List[str]) -> None:
+        """
+        Untags a post and uncounts it from each tag.
+        Args:
+            post_id (str): The ID of the post.
+            tag_ids (List[str]): Tags the post has.
+        """
+        if not tag_ids:
+            return
+        self.db.execute(
+            delete(post_tags).where(
+                post_tags.c.post_id == post_id, post_tags.c.tag_id.in_(tag_ids)
+            )
+        )
+        self.db.execute(
+            update(Tag)
+            .where(Tag.id.in_(tag_ids))
+            .values(post_count=Tag.post_count - 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    def release_posts(self, post_ids: Union[List[str], Select]) -> None:
+        """
+        Uncounts posts about to be deleted from their tags, with one UPDATE.
+        Their postings themselves go with the posts (ON DELETE CASCADE).
+        Args:
+            post_ids (Union[List[str], Select]): The posts' IDs, or a select of them.
+        """
+        released = (
+            select(post_tags.c.tag_id, func.count().label("posts"))
+            .where(post_tags.c.post_id.in_(post_ids))
+            .group_by(post_tags.c.tag_id)
+            .subquery()
+        )
+        self.db.execute(
+            update(Tag)
+            .where(Tag.id == released.c.tag_id)
+            .values(post_count=Tag.post_count - released.c.posts)
+            .execution_options(synchronize_session=False)
+        )
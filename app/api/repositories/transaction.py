@@ -1,6 +1,12 @@
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import ARRAY, Float, Integer, and_, cast, func, insert, or_, select
 from sqlalchemy.orm import Session
 from app.core.base.repository import BaseRepository
+from app.api.models.idempotency_key import IdempotencyKey
 from app.api.models.transaction import Transaction
+from app.api.repositories.balance import BalanceRepository
 
 class TransactionRepository(BaseRepository[Transaction]):
     """
@@ -17,4 +23,254 @@ class TransactionRepository(BaseRepository[Transaction]):
         Args:
             db (Session): The SQLAlchemy session to use for database operations.
         """
-        super().__init__(Transaction, db)
\ No newline at end of file
+        super().__init__(Transaction, db)
+
+    def create_with_balance(
+        self, transaction: Transaction, idempotency_key: Optional[IdempotencyKey] = None
+    ) -> Transaction:
+        """
+        Inserts a transaction and applies it to the account balance in one commit.
+        Args:
+            transaction (Transaction): The transaction to insert.
+            idempotency_key (Optional[IdempotencyKey]): Claimed key to complete with
+                the created transaction in the same commit.
+        Returns:
+            Transaction: The created transaction.
+        """
+        delta = -transaction.amount if transaction.type == "withdrawal" else transaction.amount
+        try:
+            self.db.add(transaction)
+            self.db.flush()
+            BalanceRepository(self.db).apply_delta(transaction.email, delta)
+            if idempotency_key is not None:
+                self.db.refresh(transaction)
+                idempotency_key.status_code = 201
+                idempotency_key.response = transaction.to_dict()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self.db.refresh(transaction)
+        return transaction
+
+    def create_many_with_balance(self, values: List[dict]) -> List[Transaction]:
+        """
+        Inserts several transactions with one multi-row INSERT ... RETURNING and
+        applies them to the account balances, all in one commit.
+        Args:
+            values (List[dict]): email, amount and type of each transaction.
+        Returns:
+            List[Transaction]: Detached transactions in the same order as `values`.
+        """
+        deltas = {}
+        for value in values:
+            amount = -value["amount"] if value["type"] == "withdrawal" else value["amount"]
+            deltas[value["email"]] = deltas.get(value["email"], 0.0) + amount
+        stmt = insert(Transaction).returning(
+            *Transaction.__table__.columns, sort_by_parameter_order=True
+        )
+        try:
+            rows = self.db.execute(stmt, values).all()
+            BalanceRepository(self.db).apply_deltas(deltas)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return [Transaction(**row._mapping) for row in rows]
+
+    def get_row(self, id: str) -> Optional[dict]:
+        """
+        Retrieves a transaction as a plain dictionary in the `Transaction.to_dict()`
+        shape, without building a Transaction instance.
+        Args:
+            id (str): The ID of the transaction.
+        Returns:
+            Optional[dict]: The transaction, or None if not found.
+        """
+        row = self.db.execute(
+            select(
+                Transaction.id,
+                Transaction.email,
+                Transaction.amount,
+                Transaction.type,
+                Transaction.created_at,
+                Transaction.updated_at,
+            ).where(Transaction.id == id)
+        ).first()
+        if row is None:
+            return None
+        return {
+            "id": row.id,
+            "email": row.email,
+            "amount": row.amount,
+            "type": row.type,
+            "created_at": row.created_at.isoformat(),
+            "updated_at": row.updated_at.isoformat(),
+        }
+
+    def get_history(
+        self,
+        email: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        limit: int = 50,
+    ) -> List[Transaction]:
+        """
+        Retrieves the transactions of an email, newest first, using keyset pagination.
+        The created_at bounds let Postgres prune the monthly partitions that cannot match.
+        Args:
+            email (str): The account email.
+            start (Optional[datetime]): Inclusive lower bound on created_at.
+            end (Optional[datetime]): Exclusive upper bound on created_at.
+            after (Optional[Tuple[datetime, str]]): (created_at, id) of the last row of the previous page.
+            limit (int): Maximum number of transactions to return.
+        Returns:
+            List[Transaction]: The matching transactions.
+        """
+        query = self.db.query(Transaction).filter(*self._range_filters(email, start, end))
+        if after is not None:
+            created_at, id = after
+            query = query.filter(
+                or_(
+                    Transaction.created_at < created_at,
+                    and_(Transaction.created_at == created_at, Transaction.id < id),
+                )
+            )
+        return (
+            query.order_by(Transaction.created_at.desc(), Transaction.id.desc())
+            .limit(limit)
+            .all()
+        )
+
+    def _range_filters(
+        self, email: Optional[str], start: Optional[datetime], end: Optional[datetime]
+    ) -> list:
+        filters = []
+        if email is not None:
+            filters.append(Transaction.email == email)
+        if start is not None:
+            filters.append(Transaction.created_at >= start)
+        if end is not None:
+            filters.append(Transaction.created_at < end)
+        return filters
+
+    def count(
+        self,
+        email: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> int:
+        """
+        Counts the transactions matching the filters.
+        Args:
+            email (Optional[str]): Restrict to one account.
+            start (Optional[datetime]): Inclusive lower bound on created_at.
+            end (Optional[datetime]): Exclusive upper bound on created_at.
+            limit (Optional[int]): Stop counting, and scanning, at this many rows.
+        Returns:
+            int: The number of matching transactions, at most `limit`.
+        """
+        matching = select(Transaction.id).where(*self._range_filters(email, start, end))
+        if limit is None:
+            return self.db.scalar(select(func.count()).select_from(matching.subquery()))
+        return self.db.scalar(select(func.count()).select_from(matching.limit(limit).subquery()))
+
+    def iter_stat_columns(
+        self,
+        email: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        chunk_size: int = 50_000,
+    ) -> Iterator[list]:
+        """
+        Streams (amount, is_withdrawal, created_at epoch seconds) rows as plain float
+        tuples, `chunk_size` rows at a time, without building ORM objects.
+        Args:
+            email (Optional[str]): Restrict to one account.
+            start (Optional[datetime]): Inclusive lower bound on created_at.
+            end (Optional[datetime]): Exclusive upper bound on created_at.
+            chunk_size (int): Rows fetched from the server cursor per chunk.
+        Yields:
+            list: A chunk of row tuples.
+        """
+        query = select(
+            Transaction.amount,
+            cast(Transaction.type == "withdrawal", Integer),
+            cast(func.extract("epoch", Transaction.created_at), Float),
+        ).where(*self._range_filters(email, start, end))
+        result = self.db.execute(
+            query, execution_options={"stream_results": True, "yield_per": chunk_size}
+        )
+        for partition in result.partitions():
+            yield partition
+
+    def get_grouped_stats(
+        self,
+        period: str,
+        email: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> list:
+        """
+        Computes per period and type counts, totals and percentiles in the database.
+        Args:
+            period (str): "day" or "week".
+            email (Optional[str]): Restrict to one account.
+            start (Optional[datetime]): Inclusive lower bound on created_at.
+            end (Optional[datetime]): Exclusive upper bound on created_at.
+        Returns:
+            list: Rows of (period_start, type, count, total, [p50, p90, p99]).
+        """
+        bucket = func.date_trunc(period, func.timezone("UTC", Transaction.created_at))
+        percentiles = func.percentile_cont(
+            cast([0.5, 0.9, 0.99], ARRAY(Float))
+        ).within_group(Transaction.amount)
+        query = (
+            select(
+                bucket.label("period_start"),
+                Transaction.type,
+                func.count(),
+                func.sum(Transaction.amount),
+                percentiles,
+            )
+            .where(*self._range_filters(email, start, end))
+            .group_by(bucket, Transaction.type)
+            .order_by(bucket, Transaction.type)
+        )
+        return list(self.db.execute(query))
+
+    def iter_export_rows(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        chunk_size: int = 50_000,
+    ) -> Iterator[list]:
+        """
+        Streams every transaction column as plain row tuples, ordered by created_at,
+        `chunk_size` rows at a time.
+        Args:
+            start (Optional[datetime]): Inclusive lower bound on created_at.
+            end (Optional[datetime]): Exclusive upper bound on created_at.
+            chunk_size (int): Rows fetched from the server cursor per chunk.
+        Yields:
+            list: A chunk of (id, email, amount, type, created_at, updated_at) tuples.
+        """
+        query = (
+            select(
+                Transaction.id,
+                Transaction.email,
+                Transaction.amount,
+                Transaction.type,
+                Transaction.created_at,
+                Transaction.updated_at,
+            )
+            .where(*self._range_filters(None, start, end))
+            .order_by(Transaction.created_at)
+        )
+        result = self.db.execute(
+            query, execution_options={"stream_results": True, "yield_per": chunk_size}
+        )
+        for partition in result.partitions():
+            yield partition
@@ -1,6 +1,12 @@
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from app.core.base.repository import BaseRepository
+from app.api.models.post import Post
 from app.api.models.user import User
+from app.api.repositories.tag import TagRepository
 
 
 class UserRepository(BaseRepository[User]):
@@ -25,3 +31,43 @@ class UserRepository(BaseRepository[User]):
             User: The user object if found, None otherwise.
         """
         return self.db.query(self.model).filter(self.model.email == email).first()
+
+    def delete_with_posts(self, user: User) -> None:
+        """Deletes a loaded user, the database cascading to their posts, and
+        uncounts the posts from their tags in the same commit.
+
+        Args:
+            user (User): The user to delete.
+        """
+        try:
+            TagRepository(self.db).release_posts(select(Post.id).where(Post.author_id == user.id))
+            self.db.delete(user)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def mark_deleted(self, id: str, now: datetime) -> None:
+        """Marks a user as deleted, pending the purge of their posts.
+
+        Args:
+            id (str): The id of the user.
+            now (datetime): The current time.
+        """
+        self.db.execute(
+            update(self.model)
+            .where(self.model.id == id)
+            .values(deleted_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+
+    def get_deleted_ids(self) -> List[str]:
+        """Get the ids of users marked deleted and not purged yet.
+
+        Returns:
+            List[str]: The user ids.
+        """
+        return self.db.execute(
+            select(self.model.id).where(self.model.deleted_at.is_not(None))
+        ).scalars().all()
@@ -0,0 +1,121 @@
+import queue
+import threading
+from typing import Optional
+
+from app.api.repositories.post import PostRepository
+from app.api.repositories.user import UserRepository
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.utils.logger import logger
+
+
+def purge_account(
+    user_id: str,
+    chunk_size: int,
+    pause: float = 0.0,
+    stop: Optional[threading.Event] = None,
+) -> int:
+    """
+    Deletes a user's posts one chunk per transaction, then the user, with
+    any posts left to the database cascade and uncounted from their tags.
+
+    Each chunk only locks its own rows and holds them briefly, and no posts
+    are loaded into memory, however many the user has.
+
+    Args:
+        user_id (str): The ID of the user.
+        chunk_size (int): Posts deleted per transaction.
+        pause (float): Seconds to wait between chunks.
+        stop (Optional[threading.Event]): Stops the purge between chunks when
+            set, leaving the user marked deleted.
+
+    Returns:
+        int: Number of deleted posts.
+    """
+    stop = stop or threading.Event()
+    db = SessionLocal()
+    try:
+        posts = PostRepository(db)
+        deleted = 0
+        while True:
+            count = posts.delete_author_posts(author_id=user_id, limit=chunk_size)
+            deleted += count
+            if count < chunk_size:
+                break
+            if stop.wait(pause):
+                logger.info("Purge of account %s stopped after %s posts.", user_id, deleted)
+                return deleted
+        users = UserRepository(db)
+        user = users.get(user_id)
+        if user is not None:
+            users.delete_with_posts(user)
+    finally:
+        db.close()
+    logger.info("Purged account %s with %s posts.", user_id, deleted)
+    return deleted
+
+
+class AccountPurger:
+    """
+    Background purge of deleted accounts too large to delete in a request.
+    Accounts are purged one at a time on a background thread. Accounts left
+    marked deleted when a worker stops are finished by
+    `python -m app.scripts.purge_deleted_accounts`.
+    Attributes:
+        chunk_size (int): Posts deleted per transaction.
+        pause (float): Seconds to wait between chunks.
+    """
+
+    def __init__(self, chunk_size: int, pause: float):
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def submit(self, user_id: str) -> None:
+        """Queues the purge of a user already marked deleted."""
+        self._ensure_started()
+        self._queue.put(user_id)
+
+    def stop(self) -> None:
+        """Stops the background thread after the chunk in progress. Purges not
+        finished stay marked deleted for the script to resume."""
+
+        with self._lock:
+            if self._thread is None:
+                return
+            self._stop.set()
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            self._stop.clear()
+
+    def _ensure_started(self) -> None:
+        # Started lazily so each forked worker gets its own thread
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="account-purger", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while (user_id := self._queue.get()) is not None:
+            if self._stop.is_set():
+                continue
+            try:
+                purge_account(
+                    user_id, chunk_size=self.chunk_size, pause=self.pause, stop=self._stop
+                )
+            except Exception as e:
+                logger.error("Purge of account %s failed: %s", user_id, e)
+
+
+account_purger = AccountPurger(
+    chunk_size=settings.ACCOUNT_PURGE_CHUNK_SIZE,
+    pause=settings.ACCOUNT_PURGE_PAUSE,
+)
@@ -0,0 +1,142 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from typing import Callable, Dict, Tuple
+
+from app.api.models.idempotency_key import IdempotencyKey
+from app.api.repositories.idempotency_key import IdempotencyKeyRepository
+from app.core.config import settings
+from app.core.metrics import register_cache
+from app.utils.cache import TTLCache
+from app.utils.logger import logger
+
+# Completed responses by key, shared by all requests in this process. The
+# database row stays the source of truth across workers.
+response_cache = TTLCache(
+    maxsize=settings.IDEMPOTENCY_CACHE_SIZE, ttl=settings.IDEMPOTENCY_KEY_TTL
+)
+register_cache("idempotency_responses", response_cache)
+
+# Keys currently being processed in this process; duplicates wait on the event
+_inflight: Dict[str, threading.Event] = {}
+_inflight_lock = threading.Lock()
+
+# How often a duplicate re-reads a key claimed by another worker
+POLL_INTERVAL = 0.05
+
+
+class IdempotencyService:
+    """
+    Idempotency service class for making non-idempotent requests safe to retry.
+    The first request with a key runs the operation; duplicates, whether
+    concurrent or later retries, get the stored result instead of running it
+    again.
+    Attributes:
+        db (Session): The SQLAlchemy session used for database operations.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initializes the IdempotencyService with a database session.
+
+        Args:
+            db (Session): The SQLAlchemy session to use for database operations.
+        """
+        self.repository = IdempotencyKeyRepository(db)
+
+    def execute(
+        self, key: str, request_hash: str, operation: Callable[[IdempotencyKey], dict]
+    ) -> Tuple[dict, bool]:
+        """
+        Runs `operation` at most once per key.
+
+        Args:
+            key (str): The client supplied Idempotency-Key.
+            request_hash (str): Fingerprint of the request body; reusing a key for a
+                different body is rejected.
+            operation (Callable[[IdempotencyKey], dict]): Performs the request. It must
+                set `status_code` and `response` on the given key in the same commit as
+                its own writes, and return the response.
+
+        Returns:
+            Tuple[dict, bool]: The response and whether it was replayed.
+        """
+        cached = response_cache.get(key)
+        if cached:
+            return self._replay(key, cached, request_hash)
+
+        with _inflight_lock:
+            event = _inflight.get(key)
+            leader = event is None
+            if leader:
+                event = _inflight[key] = threading.Event()
+
+        if not leader:
+            event.wait(timeout=settings.IDEMPOTENCY_WAIT_TIMEOUT)
+            cached = response_cache.get(key)
+            if cached:
+                return self._replay(key, cached, request_hash)
+
+        try:
+            return self._execute(key, request_hash, operation)
+        finally:
+            if leader:
+                with _inflight_lock:
+                    _inflight.pop(key, None)
+                event.set()
+
+    def _execute(
+        self, key: str, request_hash: str, operation: Callable[[IdempotencyKey], dict]
+    ) -> Tuple[dict, bool]:
+        now = datetime.now(timezone.utc)
+        self.repository.release_stale(
+            key,
+            now=now,
+            locked_before=now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT),
+        )
+
+        record = IdempotencyKey(
+            key=key,
+            request_hash=request_hash,
+            locked_at=now,
+            expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+        )
+        if self.repository.claim(record):
+            try:
+                response = operation(record)
+            except Exception:
+                self.repository.release(record)
+                raise
+            response_cache.set(key, (record.request_hash, record.status_code, response))
+            return response, False
+
+        # Another worker owns the key; wait for it to complete
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+        while True:
+            existing = self.repository.get_by_key(key)
+            if existing is None:
+                # The owner failed and released the key
+                return self._execute(key, request_hash, operation)
+            if existing.response is not None:
+                cached = (existing.request_hash, existing.status_code, existing.response)
+                response_cache.set(key, cached)
+                return self._replay(key, cached, request_hash)
+            if time.monotonic() >= deadline:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A request with this Idempotency-Key is still being processed.",
+                )
+            self.repository.db.expire_all()
+            time.sleep(POLL_INTERVAL)
+
+    def _replay(self, key: str, cached: tuple, request_hash: str) -> Tuple[dict, bool]:
+        stored_hash, _, response = cached
+        if stored_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request.",
+            )
+        logger.info("Replaying stored response for Idempotency-Key %s", key)
+        return response, True
@@ -1,13 +1,34 @@
+import orjson
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.api.models.post import Post
+from app.api.models.post_revision import PostRevision
+from app.api.models.tag import Tag
 from app.api.models.user import User
 from app.api.v1.post import schemas
 from app.api.repositories.post import PostRepository
+from app.api.repositories.post_revision import PostRevisionRepository
+from app.api.repositories.tag import TagRepository
+from app.core.config import settings
+from app.core.metrics import DB_LOOKUPS_AVOIDED, register_cache
+from app.utils.cache import ByteSizeLRUCache, TTLCache
+from app.utils.delta import apply_delta, make_delta
+from app.utils.ids import is_uuid7
 from app.utils.logger import logger
 
+# JSON encoding of each post as it appears in list responses. A post's bytes
+# only change when it is updated, so (id, updated_at) identifies them exactly.
+post_fragment_cache = ByteSizeLRUCache(max_bytes=settings.POST_FRAGMENT_CACHE_MAX_BYTES)
+register_cache("post_fragments", post_fragment_cache)
+
+# (author_id, post_id) pairs recently looked up and not found
+missing_post_cache = TTLCache(
+    maxsize=settings.NEGATIVE_CACHE_SIZE, ttl=settings.NEGATIVE_CACHE_TTL
+)
+register_cache("missing_posts", missing_post_cache)
+
 class PostService:
     """
     Post service class for handling post-related operations.
@@ -25,6 +46,8 @@ class PostService:
             db (Session): The SQLAlchemy session to use for database operations.
         """
         self.repository = PostRepository(db)
+        self.tag_repository = TagRepository(db)
+        self.revision_repository = PostRevisionRepository(db)
 
     def create_post(self, post_data: schemas.CreatePostRequest, current_user: User) -> Post:
         """
@@ -44,11 +67,11 @@ class PostService:
                 content=post_data.content,
                 author_id=current_user.id
             )
-            created_post = self.repository.create(post)
-            logger.info(f"Post created successfully: {created_post.id}")
+            created_post = self.repository.create_with_tags(post, tag_names=post_data.tags)
+            logger.info("Post created successfully: %s", created_post.id)
             return created_post
         except Exception as e:
-            logger.error(f"Error creating post: {e}")
+            logger.error("Error creating post: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="An error occurred while creating the post."
@@ -67,27 +90,68 @@ class PostService:
             Post: The updated Post object.
         """
         
-        post = self.repository.get_author_post_by_id(author_id=current_user.id, post_id=post_id)
+        # Locked, so concurrent edits of the post number their revisions and
+        # build their deltas one after the other, each from the latest content
+        post = (
+            self.repository.get_author_post_by_id(
+                author_id=current_user.id, post_id=post_id, for_update=True
+            )
+            if is_uuid7(post_id)
+            else None
+        )
         if not post:
-            logger.warning(f"Post with ID {post_id} not found for author {current_user.id}.")
+            logger.warning("Post with ID %s not found for author %s.", post_id, current_user.id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Post not found."
             )
         try:
             update_data = post_data.model_dump(exclude_unset=True)
+            tag_names = update_data.pop("tags", None)
+            previous = PostRevision(
+                post_id=post.id, title=post.title, content=post.content, created_at=post.updated_at
+            )
             for key, value in update_data.items():
                 setattr(post, key, value)
-            updated_post = self.repository.update(post)
-            logger.info(f"Post updated successfully: {updated_post.id}")
+            if (post.title, post.content) != (previous.title, previous.content):
+                self._add_revision(post, previous)
+            updated_post = self.repository.update_with_tags(post, tag_names=tag_names)
+            logger.info("Post updated successfully: %s", updated_post.id)
             return updated_post
         except Exception as e:
-            logger.error(f"Error updating post: {e}")
+            logger.error("Error updating post: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="An error occurred while updating the post."
             )
         
+    def _add_revision(self, post: Post, previous: PostRevision) -> None:
+        """
+        Records the new version of an edited post, as a delta against the
+        version it replaces unless a snapshot is due or the delta is no
+        smaller than the content. A post's history starts at its first edit,
+        which also records the replaced version, as revision 1.
+
+        Args:
+            post (Post): The edited post, not yet committed.
+            previous (PostRevision): Unsaved snapshot of the replaced version.
+        """
+        last, last_snapshot = self.revision_repository.get_head(post.id)
+        if last == 0:
+            previous.number = last = last_snapshot = 1
+            self.revision_repository.add(previous)
+
+        revision = PostRevision(post_id=post.id, number=last + 1, title=post.title)
+        delta = make_delta(previous.content, post.content)
+        if (
+            revision.number - last_snapshot >= settings.POST_REVISION_SNAPSHOT_INTERVAL
+            or len(orjson.dumps(delta)) >= len(post.content.encode())
+        ):
+            revision.content = post.content
+        else:
+            revision.delta = delta
+        self.revision_repository.add(revision)
+
     def delete_post(self, post_id: str, current_user: User) -> bool:
         """
         Deletes a post.
@@ -100,19 +164,23 @@ class PostService:
             bool: True if the post was deleted successfully, False otherwise.
         """
         
-        post = self.repository.get_author_post_by_id(author_id=current_user.id, post_id=post_id)
+        post = (
+            self.repository.get_author_post_by_id(author_id=current_user.id, post_id=post_id)
+            if is_uuid7(post_id)
+            else None
+        )
         if not post:
-            logger.warning(f"Post with ID {post_id} not found for author {current_user.id}.")
+            logger.warning("Post with ID %s not found for author %s.", post_id, current_user.id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Post not found."
             )
         try:
             self.repository.delete(post.id)
-            logger.info(f"Post deleted successfully: {post.id}")
+            logger.info("Post deleted successfully: %s", post.id)
             return True
         except Exception as e:
-            logger.error(f"Error deleting post: {e}")
+            logger.error("Error deleting post: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="An error occurred while deleting the post."
@@ -130,52 +198,208 @@ class PostService:
             Post: The Post object if found, raises HTTPException if not found.
         """
         
-        post = self.repository.get_author_post_by_id(author_id=current_user.id, post_id=post_id)
+        key = (current_user.id, post_id)
+        if not is_uuid7(post_id):
+            DB_LOOKUPS_AVOIDED.labels("post", "malformed").inc()
+            post = None
+        elif missing_post_cache.get(key):
+            DB_LOOKUPS_AVOIDED.labels("post", "cached").inc()
+            post = None
+        else:
+            post = self.repository.get_author_post_by_id(author_id=current_user.id, post_id=post_id)
+            if not post:
+                missing_post_cache.set(key, True)
         if not post:
-            logger.warning(f"Post with ID {post_id} not found for author {current_user.id}.")
+            logger.warning("Post with ID %s not found for author %s.", post_id, current_user.id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Post not found."
             )
         return post
     
-    def get_posts_by_author(self, author_id: str) -> List[Post]:
+    def get_posts_by_ids(self, post_ids: List[str], current_user: User) -> List[dict]:
+        """
+        Retrieves several posts of the current user with one query.
+
+        IDs that are malformed or recently not found are answered without
+        the database, like in `get_post_by_id`, and posts of other authors
+        are reported as not found.
+
+        Args:
+            post_ids (List[str]): The IDs of the posts, possibly repeated.
+            current_user (User): The user requesting the posts.
+
+        Returns:
+            List[dict]: id, found and post (or None) for each requested ID,
+                in request order.
+        """
+        if len(post_ids) > settings.POST_BATCH_MAX_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {settings.POST_BATCH_MAX_IDS} posts can be fetched at once."
+            )
+
+        lookup = []
+        for post_id in dict.fromkeys(post_ids):
+            if not is_uuid7(post_id):
+                DB_LOOKUPS_AVOIDED.labels("post", "malformed").inc()
+            elif missing_post_cache.get((current_user.id, post_id)):
+                DB_LOOKUPS_AVOIDED.labels("post", "cached").inc()
+            else:
+                lookup.append(post_id)
+
+        posts = {}
+        if lookup:
+            try:
+                rows = self.repository.get_post_rows(author_id=current_user.id, ids=lookup)
+            except Exception as e:
+                logger.error("Error retrieving posts %s: %s", lookup, e)
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="An error occurred while retrieving posts."
+                )
+            posts = {row["id"]: row for row in rows}
+            for post_id in lookup:
+                if post_id not in posts:
+                    missing_post_cache.set((current_user.id, post_id), True)
+        logger.info("Retrieved %s of %s requested posts.", len(posts), len(post_ids))
+        return [
+            {"id": post_id, "found": post_id in posts, "post": posts.get(post_id)}
+            for post_id in post_ids
+        ]
+
+    def get_revisions(self, post_id: str, current_user: User) -> List[dict]:
+        """
+        Retrieves the revisions of a post, without their content.
+
+        Args:
+            post_id (str): The ID of the post.
+            current_user (User): The user requesting the revisions.
+
+        Returns:
+            List[dict]: The revisions, oldest first, in response shape.
+        """
+        post = self.get_post_by_id(post_id=post_id, current_user=current_user)
+        return self.revision_repository.get_revision_rows(post.id)
+
+    def get_revision(self, post_id: str, number: int, current_user: User) -> dict:
+        """
+        Rebuilds a revision of a post from the latest snapshot at or before it.
+
+        Args:
+            post_id (str): The ID of the post.
+            number (int): The revision number.
+            current_user (User): The user requesting the revision.
+
+        Returns:
+            dict: The revision, in response shape.
+        """
+        post = self.get_post_by_id(post_id=post_id, current_user=current_user)
+        chain = self.revision_repository.get_chain(post.id, number)
+        if not chain:
+            logger.warning("Revision %s of post %s not found.", number, post.id)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Revision not found."
+            )
+        content = chain[0].content
+        for revision in chain[1:]:
+            content = apply_delta(content, revision.delta)
+        return {
+            "number": number,
+            "title": chain[-1].title,
+            "content": content,
+            "created_at": chain[-1].created_at.isoformat(),
+        }
+
+    def _get_tags(self, names: List[str]) -> Optional[List[Tag]]:
+        """Returns the named tags, or None if any of them does not exist, in
+        which case no post has them all."""
+        tags = self.tag_repository.get_by_names(set(names))
+        return tags if len(tags) == len(set(names)) else None
+
+    def get_posts_by_author(self, author_id: str, tags: Optional[List[str]] = None) -> List[dict]:
         """
         Retrieves all posts by a specific author.
 
         Args:
             author_id (str): The ID of the author whose posts are to be retrieved.
+            tags (Optional[List[str]]): Only retrieve posts with all these tags.
 
         Returns:
-            List[Post]: A list of Post objects authored by the specified author.
+            List[dict]: The posts authored by the specified author, in response shape.
         """
         
+        if not is_uuid7(author_id):
+            return []
         try:
-            posts = self.repository.get_posts_by_author(author_id=author_id)
-            logger.info(f"Retrieved {len(posts)} posts for author {author_id}.")
+            filter_tags = self._get_tags(tags) if tags else None
+            if tags and filter_tags is None:
+                return []
+            posts = self.repository.get_post_rows(author_id=author_id, tags=filter_tags)
+            logger.info("Retrieved %s posts for author %s.", len(posts), author_id)
             return posts
         except Exception as e:
-            logger.error(f"Error retrieving posts for author {author_id}: {e}")
+            logger.error("Error retrieving posts for author %s: %s", author_id, e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="An error occurred while retrieving posts."
             )
         
-    def get_all_posts(self) -> List[Post]:
+    def get_all_posts(self, tags: Optional[List[str]] = None) -> List[dict]:
         """
         Retrieves all posts.
 
+        Args:
+            tags (Optional[List[str]]): Only retrieve posts with all these tags.
+
         Returns:
-            List[Post]: A list of all Post objects.
+            List[dict]: All posts, in response shape.
         """
         
         try:
-            posts = self.repository.get_all()
-            logger.info(f"Retrieved {len(posts)} posts from the database.")
+            filter_tags = self._get_tags(tags) if tags else None
+            if tags and filter_tags is None:
+                return []
+            posts = self.repository.get_post_rows(tags=filter_tags)
+            logger.info("Retrieved %s posts from the database.", len(posts))
             return posts
         except Exception as e:
-            logger.error(f"Error retrieving all posts: {e}")
+            logger.error("Error retrieving all posts: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="An error occurred while retrieving posts."
-            )
\ No newline at end of file
+            )
+
+    def get_popular_tags(self, limit: int) -> List[Tag]:
+        """
+        Retrieves the tags with the most posts.
+
+        Args:
+            limit (int): Most tags returned.
+
+        Returns:
+            List[Tag]: The tags, most used first.
+        """
+        return self.tag_repository.get_popular(limit)
+
+    @staticmethod
+    def encode_posts(posts: List[dict]) -> List[bytes]:
+        """
+        JSON encodes posts for a list response, reusing cached encodings.
+
+        Args:
+            posts (List[dict]): Posts in response shape.
+
+        Returns:
+            List[bytes]: The encoded posts, in the same order.
+        """
+        fragments = []
+        for post in posts:
+            key = (post["id"], post["updated_at"])
+            fragment = post_fragment_cache.get(key)
+            if fragment is None:
+                fragment = orjson.dumps(post)
+                post_fragment_cache.set(key, fragment)
+            fragments.append(fragment)
+        return fragments
@@ -1,10 +1,27 @@
+from datetime import datetime
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
 
+from app.api.models.balance import AccountBalance
+from app.api.models.idempotency_key import IdempotencyKey
 from app.api.models.transaction import Transaction
+from app.api.repositories.balance import BalanceRepository
 from app.api.repositories.transaction import TransactionRepository
+from app.api.services.transaction_writer import transaction_writer
 from app.api.v1.transaction.schemas import CreateTransactionRequest
+from app.core.config import settings
+from app.core.metrics import DB_LOOKUPS_AVOIDED, register_cache
+from app.utils.cache import TTLCache
+from app.utils.ids import is_uuid7
 from app.utils.logger import logger
+from app.utils.pagination import decode_cursor, encode_cursor
+
+# Transaction IDs recently looked up and not found
+missing_transaction_cache = TTLCache(
+    maxsize=settings.NEGATIVE_CACHE_SIZE, ttl=settings.NEGATIVE_CACHE_TTL
+)
+register_cache("missing_transactions", missing_transaction_cache)
 
 
 class TransactionService:
@@ -24,34 +41,61 @@ class TransactionService:
             db (Session): The SQLAlchemy session to use for database operations.
         """
         self.repository = TransactionRepository(db)
+        self.balance_repository = BalanceRepository(db)
 
-    def create_transaction(self, transaction_data: CreateTransactionRequest) -> Transaction:
+    def create_transaction(
+        self,
+        transaction_data: CreateTransactionRequest,
+        idempotency_key: Optional[IdempotencyKey] = None,
+    ) -> Transaction:
         """
         Creates a new transaction.
 
         Args:
             transaction_data (CreateTransactionRequest): The data for the new transaction.
+            idempotency_key (Optional[IdempotencyKey]): Claimed idempotency key to complete
+                in the same commit as the insert.
 
         Returns:
             Transaction: The created Transaction object.
         """
         try:
-            transaction = Transaction(
-                email=transaction_data.email,
-                amount=transaction_data.amount,
-                type=transaction_data.type
-            )
-            created_transaction = self.repository.create(transaction)
-            logger.info(f"Transaction created successfully: {created_transaction.id}")
+            if settings.TRANSACTION_WRITE_COALESCING and idempotency_key is None:
+                # Group commit with other concurrent requests in this worker
+                created_transaction = transaction_writer.submit(
+                    {
+                        "email": transaction_data.email,
+                        "amount": transaction_data.amount,
+                        "type": transaction_data.type.value,
+                    },
+                    timeout=settings.TRANSACTION_WRITE_TIMEOUT,
+                )
+            else:
+                transaction = Transaction(
+                    email=transaction_data.email,
+                    amount=transaction_data.amount,
+                    type=transaction_data.type
+                )
+                created_transaction = self.repository.create_with_balance(
+                    transaction, idempotency_key=idempotency_key
+                )
+            logger.info("Transaction created successfully: %s", created_transaction.id)
             return created_transaction
+        except TimeoutError:
+            # Cancelled before it was written, so retrying cannot duplicate it
+            logger.warning("Transaction write timed out before it started.")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="The transaction was not created, please retry."
+            )
         except Exception as e:
-            logger.error(f"Error creating transaction: {e}")
+            logger.error("Error creating transaction: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="An error occurred while creating the transaction."
             )
         
-    def get_transaction(self, id: str) -> Transaction:
+    def get_transaction(self, id: str) -> dict:
         """
         Retrieves a transaction by its ID.
 
@@ -59,16 +103,80 @@ class TransactionService:
             transaction_id (str): The ID of the transaction to retrieve.
 
         Returns:
-            Transaction: The retrieved Transaction object.
+            dict: The retrieved transaction, in response shape.
 
         Raises:
             HTTPException: If the transaction is not found.
         """
-        transaction = self.repository.get(id)
+        if not is_uuid7(id):
+            DB_LOOKUPS_AVOIDED.labels("transaction", "malformed").inc()
+            transaction = None
+        elif missing_transaction_cache.get(id):
+            DB_LOOKUPS_AVOIDED.labels("transaction", "cached").inc()
+            transaction = None
+        else:
+            transaction = self.repository.get_row(id)
+            if not transaction:
+                missing_transaction_cache.set(id, True)
         if not transaction:
-            logger.warning(f"Transaction with id {id} not found.")
+            logger.warning("Transaction with id %s not found.", id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Transaction not found."
             )
         return transaction
+
+    def get_balance(self, email: str) -> AccountBalance:
+        """
+        Retrieves the current balance of an account.
+
+        Args:
+            email (str): The account email.
+
+        Returns:
+            AccountBalance: The stored balance row.
+
+        Raises:
+            HTTPException: If the email has no transactions.
+        """
+        balance = self.balance_repository.get_by_email(email)
+        if not balance:
+            logger.warning("Balance for %s not found.", email)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No transactions found for this email."
+            )
+        return balance
+
+    def get_transaction_history(
+        self,
+        email: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[Transaction], Optional[str]]:
+        """
+        Retrieves one page of an account's transactions, newest first.
+
+        Args:
+            email (str): The account email.
+            start (Optional[datetime]): Inclusive lower bound on created_at.
+            end (Optional[datetime]): Exclusive upper bound on created_at.
+            cursor (Optional[str]): Cursor returned with the previous page.
+            limit (int): Page size.
+
+        Returns:
+            Tuple[List[Transaction], Optional[str]]: The page and the cursor of the next page, if any.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        transactions = self.repository.get_history(
+            email=email, start=start, end=end, after=after, limit=limit + 1
+        )
+        next_cursor = None
+        if len(transactions) > limit:
+            transactions = transactions[:limit]
+            last = transactions[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+        logger.info("Retrieved %s transactions for %s.", len(transactions), email)
+        return transactions, next_cursor
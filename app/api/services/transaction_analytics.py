@@ -0,0 +1,184 @@
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.api.repositories.transaction import TransactionRepository
+from app.core.config import settings
+from app.utils.logger import logger
+
+DAY = 86_400
+WEEK = 7 * DAY
+# The Unix epoch is a Thursday; shifting by four days aligns weeks to Monday
+# like Postgres' date_trunc('week', ...)
+WEEK_OFFSET = 4 * DAY
+PERCENTILES = (0.5, 0.9, 0.99)
+TYPES = ("deposit", "withdrawal")
+
+
+def load_columns(chunks: Iterable[list]) -> np.ndarray:
+    """Converts streamed (amount, is_withdrawal, epoch) chunks into one float64 array
+    of shape (n, 3), converting each chunk as soon as it is fetched."""
+
+    arrays = [np.asarray(chunk, dtype=np.float64).reshape(-1, 3) for chunk in chunks]
+    if not arrays:
+        return np.empty((0, 3), dtype=np.float64)
+    return np.concatenate(arrays)
+
+
+def grouped_stats(columns: np.ndarray, period: str) -> List[dict]:
+    """Computes count, total and percentiles per (period, type) group.
+
+    Rows are sorted once by (group, amount); every aggregate is then a
+    vectorized reduction over contiguous group slices, with percentiles
+    linearly interpolated like Postgres' percentile_cont.
+
+    Args:
+        columns (np.ndarray): (amount, is_withdrawal, epoch seconds) rows.
+        period (str): "day" or "week".
+
+    Returns:
+        List[dict]: One entry per group, ordered by period start then type.
+    """
+
+    if len(columns) == 0:
+        return []
+    amounts = columns[:, 0]
+    is_withdrawal = columns[:, 1].astype(np.int64)
+    epochs = columns[:, 2]
+
+    if period == "week":
+        buckets = np.floor_divide(epochs - WEEK_OFFSET, WEEK).astype(np.int64)
+        bucket_starts = buckets * WEEK + WEEK_OFFSET
+    else:
+        bucket_starts = np.floor_divide(epochs, DAY).astype(np.int64) * DAY
+
+    keys = bucket_starts * 2 + is_withdrawal
+    order = np.lexsort((amounts, keys))
+    keys = keys[order]
+    amounts = amounts[order]
+
+    group_keys, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+    totals = np.add.reduceat(amounts, starts)
+
+    percentiles = []
+    for p in PERCENTILES:
+        position = starts + (counts - 1) * p
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        fraction = position - lower
+        percentiles.append(amounts[lower] + (amounts[upper] - amounts[lower]) * fraction)
+
+    return [
+        {
+            "period_start": datetime.fromtimestamp(int(key) // 2, tz=timezone.utc).isoformat(),
+            "type": TYPES[int(key) % 2],
+            "count": int(count),
+            "total": float(total),
+            "p50": float(p50),
+            "p90": float(p90),
+            "p99": float(p99),
+        }
+        for key, count, total, p50, p90, p99 in zip(group_keys, counts, totals, *percentiles)
+    ]
+
+
+class TransactionAnalyticsService:
+    """
+    Transaction analytics service class for aggregate statistics over transactions.
+    Small result sets are aggregated in the application from columnar arrays;
+    large ones are pushed down to a SQL GROUP BY so the rows never leave the
+    database. The crossover is TRANSACTION_STATS_VECTORIZED_MAX_ROWS, measured
+    with benchmarks/transaction_stats.py.
+    Attributes:
+        db (Session): The SQLAlchemy session used for database operations.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initializes the TransactionAnalyticsService with a database session.
+
+        Args:
+            db (Session): The SQLAlchemy session to use for database operations.
+        """
+        self.repository = TransactionRepository(db)
+
+    def get_stats(
+        self,
+        period: str = "day",
+        email: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        method: str = "auto",
+    ) -> tuple:
+        """
+        Computes deposit and withdrawal statistics per period.
+
+        Args:
+            period (str): "day" or "week".
+            email (Optional[str]): Restrict to one account; global stats when omitted.
+            start (Optional[datetime]): Inclusive lower bound on created_at.
+            end (Optional[datetime]): Exclusive upper bound on created_at.
+            method (str): "vectorized", "sql" or "auto" to choose by row count.
+                Above TRANSACTION_STATS_VECTORIZED_MAX_ROWS rows "vectorized" also
+                falls back to "sql", so no request loads more rows than that.
+
+        Returns:
+            tuple: The stats entries and the method used.
+        """
+        if method != "sql":
+            # Counts no further than one row past the cap, so a wide range
+            # costs a bounded scan rather than a full count
+            cap = settings.TRANSACTION_STATS_VECTORIZED_MAX_ROWS
+            rows = self.repository.count(email=email, start=start, end=end, limit=cap + 1)
+            if rows > cap:
+                if method == "vectorized":
+                    logger.info("Vectorized stats over more than %s rows refused; using sql.", cap)
+                method = "sql"
+            else:
+                method = "vectorized"
+
+        if method == "sql":
+            stats = self.sql_stats(period, email, start, end)
+        else:
+            stats = self.vectorized_stats(period, email, start, end)
+        logger.info("Computed %s transaction stats groups using %s.", len(stats), method)
+        return stats, method
+
+    def vectorized_stats(
+        self,
+        period: str,
+        email: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[dict]:
+        """Aggregates in the application from streamed columnar chunks."""
+
+        chunks = self.repository.iter_stat_columns(
+            email=email, start=start, end=end, chunk_size=settings.TRANSACTION_STATS_CHUNK_SIZE
+        )
+        return grouped_stats(load_columns(chunks), period)
+
+    def sql_stats(
+        self,
+        period: str,
+        email: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[dict]:
+        """Aggregates in the database with GROUP BY and percentile_cont."""
+
+        rows = self.repository.get_grouped_stats(period=period, email=email, start=start, end=end)
+        return [
+            {
+                "period_start": period_start.replace(tzinfo=timezone.utc).isoformat(),
+                "type": type,
+                "count": count,
+                "total": total,
+                "p50": percentiles[0],
+                "p90": percentiles[1],
+                "p99": percentiles[2],
+            }
+            for period_start, type, count, total, percentiles in rows
+        ]
@@ -0,0 +1,154 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+from app.api.models.transaction import Transaction
+from app.api.repositories.transaction import TransactionRepository
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.utils.logger import logger
+
+
+class TransactionBatchWriter:
+    """
+    Group commit writer for transaction inserts.
+    Callers submit a row and block on a future while a background thread
+    collects concurrent submissions for up to `window` seconds (or `max_rows`
+    rows) and writes them with one multi-row INSERT and one commit. If a batch
+    fails, its rows are retried one by one so each caller gets its own row or
+    its own error.
+    Attributes:
+        window (float): Seconds to wait for more rows after the first one arrives.
+        max_rows (int): Largest batch written in one commit.
+        write_timeout (float): Seconds a caller waits for a write in progress.
+    """
+
+    def __init__(self, window: float, max_rows: int, write_timeout: float):
+        self.window = window
+        self.max_rows = max_rows
+        self.write_timeout = write_timeout
+        self._queue: "queue.Queue[Optional[Tuple[dict, Future]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, values: dict, timeout: Optional[float] = None) -> Transaction:
+        """
+        Queues a transaction and waits until it is committed.
+
+        If the timeout expires before the transaction is taken into a write,
+        it is cancelled and never written, so the caller can safely retry;
+        once taken, this waits up to `write_timeout` for the write's outcome.
+
+        Args:
+            values (dict): email, amount and type of the transaction.
+            timeout (Optional[float]): Seconds to wait for the write to start.
+
+        Returns:
+            Transaction: The created transaction, detached from any session.
+
+        Raises:
+            TimeoutError: If the transaction was cancelled before being written.
+            RuntimeError: If its write did not finish within `write_timeout`,
+                so whether it was committed is unknown.
+        """
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((values, future))
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            if future.cancel():
+                raise
+        try:
+            return future.result(timeout=self.write_timeout)
+        except TimeoutError:
+            raise RuntimeError("The transaction write did not finish in time.") from None
+
+    def stop(self) -> None:
+        """Writes everything already queued, then stops the background thread."""
+
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _ensure_started(self) -> None:
+        # Started lazily so each forked worker gets its own thread
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                if self._thread is not None:
+                    logger.error("Transaction writer thread died, restarting it.")
+                self._thread = threading.Thread(
+                    target=self._run, name="transaction-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            # Skips the rows whose callers timed out and cancelled them; the
+            # others can no longer be cancelled
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                self._write(batch)
+            except Exception as e:
+                # Fails the rows still waiting instead of leaving them waiting
+                logger.error("Batch of %s transactions failed: %s", len(batch), e)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _write(self, batch: List[Tuple[dict, Future]]) -> None:
+        db = SessionLocal()
+        try:
+            repository = TransactionRepository(db)
+            try:
+                created = repository.create_many_with_balance([values for values, _ in batch])
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                    return
+                logger.warning(
+                    "Batch of %s transactions failed, retrying individually: %s",
+                    len(batch),
+                    e,
+                )
+                for item in batch:
+                    self._write([item])
+                return
+            for (_, future), transaction in zip(batch, created):
+                future.set_result(transaction)
+        finally:
+            db.close()
+
+
+transaction_writer = TransactionBatchWriter(
+    window=settings.TRANSACTION_WRITE_BATCH_WINDOW_MS / 1000,
+    max_rows=settings.TRANSACTION_WRITE_BATCH_MAX_ROWS,
+    write_timeout=settings.TRANSACTION_WRITE_MAX_DURATION,
+)
@@ -1,21 +1,28 @@
+from datetime import datetime, timezone
+
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.utils import password_utils
 from app.api.v1.auth import schemas
 from app.api.models.user import User
+from app.api.repositories.post import PostRepository
 from app.api.repositories.user import UserRepository
+from app.api.services.account_purge import account_purger
+from app.core.config import settings
 from app.utils.logger import logger
 
 
 class UserService:
     """
     User service class for handling user-related operations.
-    This class provides methods for user registration and authentication.
+    This class provides methods for user registration, authentication and
+    account deletion.
     """
 
     def __init__(self, db: Session):
         self.repository = UserRepository(db)
+        self.post_repository = PostRepository(db)
 
     def register(self, schema: schemas.RegisterRequest) -> User:
         """Creates a new user
@@ -36,7 +43,7 @@ class UserService:
 
         user = User(**schema.model_dump())
 
-        logger.info(f"Creating user with email: {user.email}")
+        logger.info("Creating user with email: %s", user.email)
         return self.repository.create(user)
 
     def authenticate(self, schema: schemas.LoginRequest) -> User:
@@ -49,7 +56,7 @@ class UserService:
         # check if user with the email exists
         user = self.repository.get_by_email(schema.email)
 
-        if not user:
+        if not user or user.deleted_at is not None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid email",
@@ -61,5 +68,28 @@ class UserService:
                 detail="Invalid password",
             )
 
-        logger.info(f"User authenticated with email: {user.email}")
+        logger.info("User authenticated with email: %s", user.email)
         return user
+
+    def delete_account(self, user: User) -> bool:
+        """Deletes a user and their posts
+        Accounts with at most one chunk of posts are deleted with a single
+        statement, the database cascading to the posts. Larger ones are
+        marked deleted, which disables them at once, and purged in the
+        background one chunk per transaction.
+        Args:
+            user (User): The user to delete
+        Returns:
+            bool: True if the account was deleted, False if its purge was scheduled
+        """
+        chunk_size = settings.ACCOUNT_PURGE_CHUNK_SIZE
+        posts = self.post_repository.count_author_posts(author_id=user.id, limit=chunk_size + 1)
+        if posts <= chunk_size:
+            self.repository.delete_with_posts(user)
+            logger.info("Deleted account %s with %s posts.", user.id, posts)
+            return True
+
+        self.repository.mark_deleted(user.id, now=datetime.now(timezone.utc))
+        account_purger.submit(user.id)
+        logger.info("Scheduled purge of account %s.", user.id)
+        return False
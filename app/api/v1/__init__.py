@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from app.api.v1.admin.routes import admin
 from app.api.v1.auth.routes import auth
 from app.api.v1.post.routes import post
 from app.api.v1.transaction.routes import transaction
@@ -8,4 +9,5 @@ main_router = APIRouter(prefix="/api/v1")
 
 main_router.include_router(router=auth)
 main_router.include_router(router=post)
-main_router.include_router(router=transaction)
\ No newline at end of file
+main_router.include_router(router=transaction)
+main_router.include_router(router=admin)
\ No newline at end of file
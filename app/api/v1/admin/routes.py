@@ -0,0 +1,258 @@
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from typing import Annotated
+
+from app.core.config import settings
+from app.core.dependencies.security import get_admin_user
+from app.core.metrics import cache_sizes
+from app.core.responses import api_response
+from app.db.database import Base
+from app.api.v1.admin import schemas
+from app.utils.memory import count_objects, memory_tracer
+from app.utils.profiler import slow_request_profiler, to_collapsed, to_speedscope
+
+admin = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(get_admin_user)])
+
+
+@admin.get(
+    path="/profiles",
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.ProfileListResponse,
+    summary="List slow request profiles",
+    description="This endpoint lists the sampled stack profiles of the slowest requests that exceeded the profiler's latency threshold, slowest first.",
+    tags=["Admin"],
+)
+def get_profiles():
+    """
+    Endpoint to list the retained slow request profiles.
+
+    Returns:
+        schemas.ProfileListResponse: Summaries of the retained profiles.
+    """
+    return api_response(
+        status_code=status.HTTP_200_OK,
+        message="Profiles retrieved successfully",
+        data=[profile.summary() for profile in slow_request_profiler.profiles()],
+    )
+
+
+@admin.get(
+    path="/profiles/{profile_id}",
+    status_code=status.HTTP_200_OK,
+    response_class=Response,
+    summary="Download a slow request profile",
+    description="This endpoint downloads a slow request profile as a speedscope JSON file or as collapsed stacks for flamegraph tools.",
+    tags=["Admin"],
+)
+def download_profile(
+    profile_id: str,
+    format: schemas.ProfileFormat = schemas.ProfileFormat.SPEEDSCOPE,
+):
+    """
+    Endpoint to download a slow request profile.
+
+    Args:
+        profile_id (str): The ID of the profile.
+        format (schemas.ProfileFormat): speedscope JSON or collapsed stacks.
+
+    Returns:
+        Response: The profile file.
+    """
+    profile = slow_request_profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    if format == schemas.ProfileFormat.COLLAPSED:
+        content = to_collapsed(profile)
+        media_type, extension = "text/plain", "txt"
+    else:
+        content = orjson.dumps(
+            to_speedscope(profile, interval=settings.PROFILER_SAMPLE_INTERVAL_MS / 1000)
+        )
+        media_type, extension = "application/json", "speedscope.json"
+
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile.id}.{extension}"'},
+    )
+
+
+@admin.get(
+    path="/memory/tracemalloc",
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.TracemallocResponse,
+    summary="Get the tracemalloc state",
+    description="This endpoint returns whether tracemalloc is running in the worker serving the request, the memory it traces and the snapshots kept. All memory diagnostics are per worker process.",
+    tags=["Admin"],
+)
+def get_tracemalloc():
+    """
+    Endpoint to get the tracemalloc state of this worker.
+
+    Returns:
+        schemas.TracemallocResponse: The tracemalloc state.
+    """
+    return api_response(
+        status_code=status.HTTP_200_OK,
+        message="Tracemalloc state retrieved successfully",
+        data=memory_tracer.status(),
+    )
+
+
+@admin.post(
+    path="/memory/tracemalloc/start",
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.TracemallocResponse,
+    summary="Start tracemalloc",
+    description="This endpoint starts tracing allocations in the worker serving the request, keeping the given number of frames per allocation. Tracing slows the worker down noticeably.",
+    tags=["Admin"],
+)
+def start_tracemalloc(frames: Annotated[int, Query(ge=1, le=100)] = 10):
+    """
+    Endpoint to start tracemalloc.
+
+    Args:
+        frames (int): Number of frames stored per allocation traceback.
+
+    Returns:
+        schemas.TracemallocResponse: The tracemalloc state.
+    """
+    return api_response(
+        status_code=status.HTTP_200_OK,
+        message="Tracemalloc started",
+        data=memory_tracer.start(frames=frames),
+    )
+
+
+@admin.post(
+    path="/memory/tracemalloc/stop",
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.TracemallocResponse,
+    summary="Stop tracemalloc",
+    description="This endpoint stops tracing allocations. Snapshots already taken are kept.",
+    tags=["Admin"],
+)
+def stop_tracemalloc():
+    """
+    Endpoint to stop tracemalloc.
+
+    Returns:
+        schemas.TracemallocResponse: The tracemalloc state.
+    """
+    return api_response(
+        status_code=status.HTTP_200_OK,
+        message="Tracemalloc stopped",
+        data=memory_tracer.stop(),
+    )
+
+
+@admin.post(
+    path="/memory/snapshots",
+    status_code=status.HTTP_201_CREATED,
+    response_model=schemas.SnapshotResponse,
+    summary="Take a tracemalloc snapshot",
+    description="This endpoint takes a snapshot of the allocations traced so far. Only the most recent snapshots are kept.",
+    tags=["Admin"],
+)
+def take_snapshot():
+    """
+    Endpoint to take a tracemalloc snapshot.
+
+    Returns:
+        schemas.SnapshotResponse: The snapshot summary.
+    """
+    return api_response(
+        status_code=status.HTTP_201_CREATED,
+        message="Snapshot taken successfully",
+        data=memory_tracer.take_snapshot(),
+    )
+
+
+@admin.get(
+    path="/memory/snapshots/{snapshot_id}/top",
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.AllocationListResponse,
+    summary="Get the top allocation sites of a snapshot",
+    description="This endpoint returns the allocation sites holding the most memory in a snapshot.",
+    tags=["Admin"],
+)
+def get_top_allocations(
+    snapshot_id: int,
+    group_by: schemas.AllocationGroupBy = schemas.AllocationGroupBy.LINENO,
+    limit: Annotated[int, Query(ge=1, le=500)] = 25,
+):
+    """
+    Endpoint to get the top allocation sites of a snapshot.
+
+    Args:
+        snapshot_id (int): The ID of the snapshot.
+        group_by (schemas.AllocationGroupBy): Group by line, file or traceback.
+        limit (int): Number of allocation sites to return.
+
+    Returns:
+        schemas.AllocationListResponse: The allocation sites, largest first.
+    """
+    return api_response(
+        status_code=status.HTTP_200_OK,
+        message="Allocations retrieved successfully",
+        data=memory_tracer.top(snapshot_id, group_by=group_by.value, limit=limit),
+    )
+
+
+@admin.get(
+    path="/memory/snapshots/{snapshot_id}/diff/{base_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.AllocationListResponse,
+    summary="Compare two snapshots",
+    description="This endpoint returns the allocation sites whose memory changed the most between a base snapshot and a later one.",
+    tags=["Admin"],
+)
+def diff_snapshots(
+    snapshot_id: int,
+    base_id: int,
+    group_by: schemas.AllocationGroupBy = schemas.AllocationGroupBy.LINENO,
+    limit: Annotated[int, Query(ge=1, le=500)] = 25,
+):
+    """
+    Endpoint to compare two snapshots.
+
+    Args:
+        snapshot_id (int): The ID of the later snapshot.
+        base_id (int): The ID of the snapshot to compare against.
+        group_by (schemas.AllocationGroupBy): Group by line, file or traceback.
+        limit (int): Number of allocation sites to return.
+
+    Returns:
+        schemas.AllocationListResponse: The allocation sites, largest change first.
+    """
+    return api_response(
+        status_code=status.HTTP_200_OK,
+        message="Snapshot diff retrieved successfully",
+        data=memory_tracer.diff(snapshot_id, base_id, group_by=group_by.value, limit=limit),
+    )
+
+
+@admin.get(
+    path="/memory/objects",
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.ObjectCountsResponse,
+    summary="Count live objects",
+    description="This endpoint counts the live objects of the worker by type, the ORM instances by model and the entries of in-process caches. It walks the whole heap, so it briefly stalls the worker.",
+    tags=["Admin"],
+)
+def get_object_counts(limit: Annotated[int, Query(ge=1, le=500)] = 50):
+    """
+    Endpoint to count live objects.
+
+    Args:
+        limit (int): Number of most common types to return.
+
+    Returns:
+        schemas.ObjectCountsResponse: The object counts.
+    """
+    return api_response(
+        status_code=status.HTTP_200_OK,
+        message="Object counts retrieved successfully",
+        data={**count_objects(base=Base, limit=limit), "caches": cache_sizes()},
+    )
@@ -0,0 +1,78 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from enum import Enum
+from app.core.base.schema import BaseResponseModel
+
+# Download format of a request profile
+class ProfileFormat(str, Enum):
+    SPEEDSCOPE = "speedscope"
+    COLLAPSED = "collapsed"
+
+# Slow request profile summary
+class ProfileData(BaseModel):
+    id: str
+    method: str
+    path: str
+    request_id: Optional[str] = None
+    started_at: str
+    duration_ms: float
+    samples: int
+
+# Response model for the retained slow request profiles
+class ProfileListResponse(BaseResponseModel):
+    data: List[ProfileData]
+
+# Grouping of tracemalloc statistics
+class AllocationGroupBy(str, Enum):
+    LINENO = "lineno"
+    FILENAME = "filename"
+    TRACEBACK = "traceback"
+
+# tracemalloc snapshot summary
+class SnapshotData(BaseModel):
+    id: int
+    taken_at: str
+    traced_bytes: int
+
+# Response model for a tracemalloc snapshot
+class SnapshotResponse(BaseResponseModel):
+    data: SnapshotData
+
+# tracemalloc state of a worker
+class TracemallocData(BaseModel):
+    pid: int
+    tracing: bool
+    traceback_limit: int
+    traced_bytes: int
+    peak_traced_bytes: int
+    snapshots: List[SnapshotData]
+
+# Response model for the tracemalloc state
+class TracemallocResponse(BaseResponseModel):
+    data: TracemallocData
+
+# Allocation site, with growth when comparing snapshots
+class AllocationData(BaseModel):
+    file: str
+    line: int
+    traceback: List[str]
+    size_bytes: int
+    count: int
+    size_diff_bytes: Optional[int] = None
+    count_diff: Optional[int] = None
+
+# Response model for allocation sites
+class AllocationListResponse(BaseResponseModel):
+    data: List[AllocationData]
+
+# Live object counts of a worker
+class ObjectCountsData(BaseModel):
+    pid: int
+    gc_counts: List[int]
+    orm_instances: Dict[str, int]
+    types: Dict[str, int]
+    caches: Dict[str, int]
+
+# Response model for live object counts
+class ObjectCountsResponse(BaseResponseModel):
+    data: ObjectCountsData
@@ -6,11 +6,14 @@ from app.db.database import get_db
 from app.utils import jwt_helpers
 from app.core.dependencies.security import get_current_user
 
+from app.core.admission import AdmissionControlledRoute
+from app.core.base.schema import BaseResponseModel
+from app.core.responses import api_response
 from app.api.v1.auth import schemas
 from app.api.services.user import UserService
 from app.api.models.user import User
 
-auth = APIRouter(prefix="/auth", tags=["Authentication"])
+auth = APIRouter(prefix="/auth", tags=["Authentication"], route_class=AdmissionControlledRoute)
 
 
 @auth.post(
@@ -42,11 +45,9 @@ def register(
     access_token = jwt_helpers.create_jwt_token("access", user.id)
     refresh_token = jwt_helpers.create_jwt_token("refresh", user.id)
 
-    response_data = schemas.AuthResponseData(
-        id=user.id, username=user.username, email=user.email
-    )
+    response_data = {"id": user.id, "username": user.username, "email": user.email}
 
-    return schemas.AuthResponse(
+    return api_response(
         status_code=status.HTTP_201_CREATED,
         message="User registered successfully",
         access_token=access_token,
@@ -82,11 +83,9 @@ def login(
     access_token = jwt_helpers.create_jwt_token("access", user.id)
     refresh_token = jwt_helpers.create_jwt_token("refresh", user.id)
 
-    response_data = schemas.AuthResponseData(
-        id=user.id, username=user.username, email=user.email
-    )
+    response_data = {"id": user.id, "username": user.username, "email": user.email}
 
-    return schemas.AuthResponse(
+    return api_response(
         status_code=status.HTTP_201_CREATED,
         message="User logged in successfully",
         access_token=access_token,
@@ -114,7 +113,7 @@ def refresh_token(schema: schemas.TokenRefreshRequest):
     """
     token = jwt_helpers.refresh_access_token(refresh_token=schema.refresh_token)
 
-    return schemas.TokenRefreshResponse(
+    return api_response(
         status_code=status.HTTP_200_OK,
         message="Access token refreshed successfully",
         access_token=token,
@@ -130,12 +129,45 @@ def refresh_token(schema: schemas.TokenRefreshRequest):
     tags=["Authentication"],
 )
 def get_user(current_user: Annotated[User, Depends(get_current_user)]):
-    user_schema = schemas.AuthResponseData(
-        id=current_user.id, username=current_user.username, email=current_user.email
-    )
+    user_schema = {
+        "id": current_user.id,
+        "username": current_user.username,
+        "email": current_user.email,
+    }
 
-    return schemas.UserResponse(
+    return api_response(
         status_code=status.HTTP_200_OK,
         message="User Details Retrieved",
         data=user_schema,
     )
+
+
+@auth.delete(
+    path="/user",
+    response_model=BaseResponseModel,
+    status_code=status.HTTP_200_OK,
+    summary="Delete account",
+    description="This endpoint deletes the logged-in user's account and posts. Accounts with many posts are disabled at once and purged in the background; the response is then 202 Accepted.",
+    tags=["Authentication"],
+)
+def delete_user(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+):
+    """Endpoint to delete the logged-in user's account
+
+    Args:
+        db (Annotated[Session, Depends): Database session
+        current_user (Annotated[User, Depends): Logged in User object
+
+    Returns:
+        BaseResponseModel: Confirmation of the deletion
+    """
+    service = UserService(db=db)
+
+    if service.delete_account(user=current_user):
+        return api_response(status_code=status.HTTP_200_OK, message="Account deleted")
+
+    return api_response(
+        status_code=status.HTTP_202_ACCEPTED, message="Account deletion scheduled"
+    )
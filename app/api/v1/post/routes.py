@@ -1,15 +1,17 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Path, Query, status
 from sqlalchemy.orm import Session
-from typing import Annotated
+from typing import Annotated, List, Optional
 
 from app.db.database import get_db
 from app.core.dependencies.security import get_current_user
 
+from app.core.admission import AdmissionControlledRoute
+from app.core.responses import api_list_response, api_response
 from app.api.v1.post import schemas
 from app.api.models.user import User
 from app.api.services.post import PostService
 
-post = APIRouter(prefix="/posts", tags=["Blog Posts"])
+post = APIRouter(prefix="/posts", tags=["Blog Posts"], route_class=AdmissionControlledRoute)
 
 
 @post.post(
@@ -38,12 +40,111 @@ def create_post(
     """
     service = PostService(db=db)
     created_post = service.create_post(post_data=post_data, current_user=current_user)
-    return schemas.PostResponse(
+    return api_response(
         status_code=status.HTTP_201_CREATED,
         message="Post created successfully",
         data=created_post.to_dict(),
     )
 
+@post.get(
+    path="/batch",
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.BatchPostResponse,
+    summary="Get several blog posts by ID",
+    description="This endpoint allows users to retrieve several of their blog posts at once (`?ids=a,b,c`), in the order requested. Posts that do not exist or belong to another author have `found` false.",
+    tags=["Blog Posts"],
+)
+def get_posts_batch(
+    ids: Annotated[str, Query(description="Comma separated post IDs")],
+    db: Annotated[Session, Depends(get_db)],
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Endpoint to retrieve several blog posts by their IDs.
+
+    Args:
+        ids (str): Comma separated IDs of the posts.
+        db (Annotated[Session, Depends]): The database session.
+        current_user (User): The currently authenticated user.
+
+    Returns:
+        schemas.BatchPostResponse: The posts, in request order.
+    """
+    service = PostService(db=db)
+    posts = service.get_posts_by_ids(
+        post_ids=[post_id for post_id in ids.split(",") if post_id], current_user=current_user
+    )
+
+    return api_response(
+        status_code=status.HTTP_200_OK,
+        message="Posts retrieved successfully",
+        data=posts,
+    )
+
+@post.post(
+    path="/batch",
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.BatchPostResponse,
+    summary="Get several blog posts by ID",
+    description="Same as `GET /posts/batch`, with the IDs in the body for lists too long for a query string.",
+    tags=["Blog Posts"],
+)
+def post_posts_batch(
+    batch: schemas.BatchPostRequest,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Endpoint to retrieve several blog posts by their IDs.
+
+    Args:
+        batch (schemas.BatchPostRequest): The IDs of the posts.
+        db (Annotated[Session, Depends]): The database session.
+        current_user (User): The currently authenticated user.
+
+    Returns:
+        schemas.BatchPostResponse: The posts, in request order.
+    """
+    service = PostService(db=db)
+    posts = service.get_posts_by_ids(post_ids=batch.ids, current_user=current_user)
+
+    return api_response(
+        status_code=status.HTTP_200_OK,
+        message="Posts retrieved successfully",
+        data=posts,
+    )
+
+@post.get(
+    path="/tags",
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.TagListResponse,
+    summary="Get popular tags",
+    description="This endpoint allows users to retrieve the tags with the most posts, with their post counts.",
+    tags=["Blog Posts"],
+)
+def get_popular_tags(
+    db: Annotated[Session, Depends(get_db)],
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+):
+    """
+    Endpoint to retrieve the most used tags.
+
+    Args:
+        db (Annotated[Session, Depends]): The database session.
+        limit (int): Most tags returned.
+
+    Returns:
+        schemas.TagListResponse: The tags, most used first.
+    """
+    service = PostService(db=db)
+    tags = service.get_popular_tags(limit=limit)
+
+    return api_response(
+        status_code=status.HTTP_200_OK,
+        message="Tags retrieved successfully",
+        data=[tag.to_dict() for tag in tags],
+    )
+
 @post.get(
     path="/{post_id}",
     status_code=status.HTTP_200_OK,
@@ -71,23 +172,92 @@ def get_post_by_id(
     service = PostService(db=db)
     post = service.get_post_by_id(post_id=post_id, current_user=current_user)
     
-    return schemas.PostResponse(
+    return api_response(
         status_code=status.HTTP_200_OK,
         message="Post retrieved successfully",
         data=post.to_dict(),
     )
 
+@post.get(
+    path="/{post_id}/revisions",
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.RevisionListResponse,
+    summary="Get the revisions of a blog post",
+    description="This endpoint allows users to list the revisions of their blog post, oldest first. History starts at a post's first edit.",
+    tags=["Blog Posts"],
+)
+def get_post_revisions(
+    post_id: str,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Endpoint to list the revisions of a blog post.
+
+    Args:
+        post_id (str): The ID of the post.
+        db (Annotated[Session, Depends]): The database session.
+        current_user (User): The currently authenticated user.
+
+    Returns:
+        schemas.RevisionListResponse: The revisions, without their content.
+    """
+    service = PostService(db=db)
+    revisions = service.get_revisions(post_id=post_id, current_user=current_user)
+
+    return api_response(
+        status_code=status.HTTP_200_OK,
+        message="Revisions retrieved successfully",
+        data=revisions,
+    )
+
+@post.get(
+    path="/{post_id}/revisions/{number}",
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.RevisionResponse,
+    summary="Get a revision of a blog post",
+    description="This endpoint allows users to retrieve a revision of their blog post by its number.",
+    tags=["Blog Posts"],
+)
+def get_post_revision(
+    post_id: str,
+    number: Annotated[int, Path(ge=1)],
+    db: Annotated[Session, Depends(get_db)],
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Endpoint to retrieve a revision of a blog post.
+
+    Args:
+        post_id (str): The ID of the post.
+        number (int): The revision number.
+        db (Annotated[Session, Depends]): The database session.
+        current_user (User): The currently authenticated user.
+
+    Returns:
+        schemas.RevisionResponse: The revision with its title and content.
+    """
+    service = PostService(db=db)
+    revision = service.get_revision(post_id=post_id, number=number, current_user=current_user)
+
+    return api_response(
+        status_code=status.HTTP_200_OK,
+        message="Revision retrieved successfully",
+        data=revision,
+    )
+
 @post.get(
     path="/author/{author_id}",
     status_code=status.HTTP_200_OK,
     response_model=schemas.PostListResponse,
     summary="Get all posts by author",
-    description="This endpoint allows users to retrieve all blog posts by a specific author.",
+    description="This endpoint allows users to retrieve all blog posts by a specific author, optionally only those with all the given tags (`?tag=a&tag=b`).",
     tags=["Blog Posts"],
 )
 def get_posts_by_author(
     author_id: str,
     db: Annotated[Session, Depends(get_db)],
+    tag: Annotated[Optional[List[schemas.TagName]], Query(max_length=10)] = None,
     current_user: User = Depends(get_current_user),
 ):
     """
@@ -96,18 +266,19 @@ def get_posts_by_author(
     Args:
         author_id (str): The ID of the author whose posts to retrieve.
         db (Annotated[Session, Depends]): The database session.
+        tag (Optional[List[str]]): Only retrieve posts with all these tags.
         current_user (User): The currently authenticated user.
 
     Returns:
         schemas.PostListResponse: The list of posts by the specified author.
     """
     service = PostService(db=db)
-    posts = service.get_posts_by_author(author_id=author_id, current_user=current_user)
+    posts = service.get_posts_by_author(author_id=author_id, tags=tag)
     
-    return schemas.PostListResponse(
+    return api_list_response(
         status_code=status.HTTP_200_OK,
         message="Posts retrieved successfully",
-        data=[post.to_dict() for post in posts],
+        fragments=service.encode_posts(posts),
     )
 
 @post.get(
@@ -115,28 +286,30 @@ def get_posts_by_author(
     status_code=status.HTTP_200_OK,
     response_model=schemas.PostListResponse,
     summary="Get all blog posts",
-    description="This endpoint allows users to retrieve all blog posts.",
+    description="This endpoint allows users to retrieve all blog posts, optionally only those with all the given tags (`?tag=a&tag=b`).",
     tags=["Blog Posts"],
 )
 def get_all_posts(
-    db: Annotated[Session, Depends(get_db)]
+    db: Annotated[Session, Depends(get_db)],
+    tag: Annotated[Optional[List[schemas.TagName]], Query(max_length=10)] = None,
 ):
     """
     Endpoint to retrieve all blog posts.
 
     Args:
         db (Annotated[Session, Depends]): The database session.
+        tag (Optional[List[str]]): Only retrieve posts with all these tags.
 
     Returns:
         schemas.PostListResponse: The list of all blog posts.
     """
     service = PostService(db=db)
-    posts = service.get_all_posts()
+    posts = service.get_all_posts(tags=tag)
     
-    return schemas.PostListResponse(
+    return api_list_response(
         status_code=status.HTTP_200_OK,
         message="All posts retrieved successfully",
-        data=[post.to_dict() for post in posts],
+        fragments=service.encode_posts(posts),
     )
 
 @post.delete(
@@ -196,7 +369,7 @@ def update_post(
     service = PostService(db=db)
     updated_post = service.update_post(post_id=post_id, post_data=post_data, current_user=current_user)
     
-    return schemas.PostResponse(
+    return api_response(
         status_code=status.HTTP_200_OK,
         message="Post updated successfully",
         data=updated_post.to_dict(),
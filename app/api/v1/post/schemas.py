@@ -1,7 +1,9 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field, StringConstraints
+from typing import Annotated, List, Optional
 from app.core.base.schema import BaseResponseModel
 
+# Tag names are lowercase slugs, so they need no escaping in query strings
+TagName = Annotated[str, StringConstraints(pattern=r"^[a-z0-9][a-z0-9-]{0,49}$")]
 
 # Data model for Post
 class PostData(BaseModel):
@@ -9,17 +11,21 @@ class PostData(BaseModel):
     title: str
     content: str
     author_id: str
+    tags: List[str]
     created_at: str
+    updated_at: str
 
 # Request model for creating a new post
 class CreatePostRequest(BaseModel):
     title: str
     content: str
+    tags: List[TagName] = Field(default_factory=list, max_length=10)
 
-# Request model for updating an existing post
+# Request model for updating an existing post; `tags` replaces the post's tags
 class UpdatePostRequest(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None
+    tags: Optional[List[TagName]] = Field(default=None, max_length=10)
 
 # Response model for a single post
 class PostResponse(BaseResponseModel):
@@ -27,4 +33,49 @@ class PostResponse(BaseResponseModel):
 
 # Response model for a list of posts
 class PostListResponse(BaseResponseModel):
-    data: List[PostData]
\ No newline at end of file
+    data: List[PostData]
+
+# Request model for fetching several posts at once
+class BatchPostRequest(BaseModel):
+    ids: List[str] = Field(min_length=1)
+
+# Data model for one requested post; `post` is null when not found
+class BatchPostItem(BaseModel):
+    id: str
+    found: bool
+    post: Optional[PostData] = None
+
+# Response model for a batch fetch, in the order of the requested IDs
+class BatchPostResponse(BaseResponseModel):
+    data: List[BatchPostItem]
+
+# Data model for Tag
+class TagData(BaseModel):
+    name: str
+    post_count: int
+
+# Response model for a list of tags
+class TagListResponse(BaseResponseModel):
+    data: List[TagData]
+
+# Data model for a revision in a post's history
+class RevisionSummary(BaseModel):
+    number: int
+    title: str
+    snapshot: bool
+    created_at: str
+
+# Data model for a revision with its content
+class RevisionData(BaseModel):
+    number: int
+    title: str
+    content: str
+    created_at: str
+
+# Response model for a post's revisions
+class RevisionListResponse(BaseResponseModel):
+    data: List[RevisionSummary]
+
+# Response model for a single revision
+class RevisionResponse(BaseResponseModel):
+    data: RevisionData
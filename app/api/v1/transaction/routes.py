@@ -1,25 +1,38 @@
-from fastapi import APIRouter, Depends, status
+from datetime import datetime
+import hashlib
+from fastapi import APIRouter, Depends, Header, Query, status
+from fastapi.responses import StreamingResponse
+from pydantic import EmailStr
 from sqlalchemy.orm import Session
-from typing import Annotated
+from typing import Annotated, Optional
 
 from app.db.database import get_db
+from app.core.dependencies.security import get_admin_user
 
+from app.core.admission import AdmissionControlledRoute
+from app.core.responses import api_response
 from app.api.v1.transaction import schemas
+from app.api.services.idempotency import IdempotencyService
 from app.api.services.transaction import TransactionService
+from app.api.services.transaction_analytics import TransactionAnalyticsService
+from app.api.services.transaction_export import TransactionExportService
 
-transaction = APIRouter(prefix="/transaction", tags=["Transactions"])
+transaction = APIRouter(prefix="/transaction", tags=["Transactions"], route_class=AdmissionControlledRoute)
 
 @transaction.post(
     path="",
     status_code=status.HTTP_201_CREATED,
     response_model=schemas.CreateTransactionResponse,
     summary="Create a new transaction",
-    description="This endpoint allows users to create a new transaction.",
+    description="This endpoint allows users to create a new transaction. Retries that send the same `Idempotency-Key` header get the original response instead of creating another transaction.",
     tags=["Transactions"],
 )
 def create_transaction(
     transaction_data: schemas.CreateTransactionRequest,
     db: Annotated[Session, Depends(get_db)],
+    idempotency_key: Annotated[
+        Optional[str], Header(alias="Idempotency-Key", max_length=255)
+    ] = None,
 ):
     """
     Endpoint to create a new transaction.
@@ -27,17 +40,176 @@ def create_transaction(
     Args:
         transaction_data (schemas.CreateTransactionRequest): The data for the new transaction.
         db (Annotated[Session, Depends]): The database session.
-        current_user (str): The currently authenticated user.
+        idempotency_key (Optional[str]): Client supplied key making retries safe.
 
     Returns:
         schemas.CreateTransactionResponse: The created transaction data.
     """
     service = TransactionService(db=db)
-    created_transaction = service.create_transaction(transaction_data=transaction_data)
-    return schemas.CreateTransactionResponse(
+    replayed = False
+    if idempotency_key is None:
+        data = service.create_transaction(transaction_data=transaction_data).to_dict()
+    else:
+        request_hash = hashlib.sha256(transaction_data.model_dump_json().encode()).hexdigest()
+        data, replayed = IdempotencyService(db=db).execute(
+            key=idempotency_key,
+            request_hash=request_hash,
+            operation=lambda record: service.create_transaction(
+                transaction_data=transaction_data, idempotency_key=record
+            ).to_dict(),
+        )
+    return api_response(
         status_code=status.HTTP_201_CREATED,
         message="Transaction created successfully",
-        data=created_transaction.to_dict(),
+        headers={"Idempotent-Replayed": "true"} if replayed else None,
+        data=data,
+    )
+
+@transaction.get(
+    path="",
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.TransactionListResponse,
+    summary="Get the transaction history of an account",
+    description="This endpoint returns the transactions of an email, newest first, optionally within a time range. Pass `next_cursor` back as `cursor` to fetch the next page.",
+    tags=["Transactions"],
+)
+def get_transaction_history(
+    email: EmailStr,
+    db: Annotated[Session, Depends(get_db)],
+    start: Annotated[Optional[datetime], Query(alias="from")] = None,
+    end: Annotated[Optional[datetime], Query(alias="to")] = None,
+    cursor: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+):
+    """
+    Endpoint to retrieve the transaction history of an account.
+
+    Args:
+        email (EmailStr): The account email.
+        db (Annotated[Session, Depends]): The database session.
+        start (Optional[datetime]): Inclusive lower bound on created_at.
+        end (Optional[datetime]): Exclusive upper bound on created_at.
+        cursor (Optional[str]): Cursor returned with the previous page.
+        limit (int): Page size.
+
+    Returns:
+        schemas.TransactionListResponse: One page of transactions.
+    """
+    service = TransactionService(db=db)
+    transactions, next_cursor = service.get_transaction_history(
+        email=email, start=start, end=end, cursor=cursor, limit=limit
+    )
+    return api_response(
+        status_code=status.HTTP_200_OK,
+        message="Transactions retrieved successfully",
+        data=[transaction.to_dict() for transaction in transactions],
+        next_cursor=next_cursor,
+    )
+
+@transaction.get(
+    path="/balance/{email}",
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.BalanceResponse,
+    summary="Get the balance of an account",
+    description="This endpoint returns the running balance of all transactions for an email.",
+    tags=["Transactions"],
+)
+def get_balance(
+    email: EmailStr,
+    db: Annotated[Session, Depends(get_db)],
+):
+    """
+    Endpoint to retrieve the balance of an account.
+
+    Args:
+        email (EmailStr): The account email.
+        db (Annotated[Session, Depends]): The database session.
+
+    Returns:
+        schemas.BalanceResponse: The current balance.
+    """
+    service = TransactionService(db=db)
+    balance = service.get_balance(email=email)
+    return api_response(
+        status_code=status.HTTP_200_OK,
+        message="Balance retrieved successfully",
+        data=balance.to_dict(),
+    )
+
+@transaction.get(
+    path="/stats",
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.TransactionStatsResponse,
+    summary="Get transaction statistics",
+    description="This endpoint returns deposit and withdrawal counts, totals and percentiles per day or week, for one email or globally.",
+    tags=["Transactions"],
+)
+def get_transaction_stats(
+    db: Annotated[Session, Depends(get_db)],
+    period: schemas.StatsPeriod = schemas.StatsPeriod.DAY,
+    email: Optional[EmailStr] = None,
+    start: Annotated[Optional[datetime], Query(alias="from")] = None,
+    end: Annotated[Optional[datetime], Query(alias="to")] = None,
+    method: schemas.StatsMethod = schemas.StatsMethod.AUTO,
+):
+    """
+    Endpoint to retrieve aggregate transaction statistics.
+
+    Args:
+        db (Annotated[Session, Depends]): The database session.
+        period (schemas.StatsPeriod): Aggregation period.
+        email (Optional[EmailStr]): Restrict to one account; global stats when omitted.
+        start (Optional[datetime]): Inclusive lower bound on created_at.
+        end (Optional[datetime]): Exclusive upper bound on created_at.
+        method (schemas.StatsMethod): Force SQL or prefer vectorized aggregation;
+            vectorized falls back to SQL above TRANSACTION_STATS_VECTORIZED_MAX_ROWS.
+
+    Returns:
+        schemas.TransactionStatsResponse: The stats per period and type.
+    """
+    service = TransactionAnalyticsService(db=db)
+    stats, used_method = service.get_stats(
+        period=period.value, email=email, start=start, end=end, method=method.value
+    )
+    return api_response(
+        status_code=status.HTTP_200_OK,
+        message="Transaction stats retrieved successfully",
+        method=used_method,
+        data=stats,
+    )
+
+@transaction.get(
+    path="/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    summary="Export transactions",
+    description="This endpoint streams the transactions table as Parquet (one row group per month) or as an Arrow IPC stream, optionally restricted to a time range. Restricted to admins.",
+    tags=["Transactions"],
+    dependencies=[Depends(get_admin_user)],
+)
+def export_transactions(
+    format: schemas.ExportFormat = schemas.ExportFormat.PARQUET,
+    start: Annotated[Optional[datetime], Query(alias="from")] = None,
+    end: Annotated[Optional[datetime], Query(alias="to")] = None,
+):
+    """
+    Endpoint to export transactions in a columnar format.
+
+    Args:
+        format (schemas.ExportFormat): Parquet or Arrow IPC stream.
+        start (Optional[datetime]): Inclusive lower bound on created_at.
+        end (Optional[datetime]): Exclusive upper bound on created_at.
+
+    Returns:
+        StreamingResponse: The export file.
+    """
+    service = TransactionExportService(format=format.value)
+    return StreamingResponse(
+        service.stream(start=start, end=end),
+        media_type=service.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="transactions.{service.extension}"'
+        },
     )
 
 @transaction.get(
@@ -65,8 +237,8 @@ def get_transaction_by_id(
     """
     service = TransactionService(db=db)
     transaction = service.get_transaction(id=transaction_id)
-    return schemas.TransactionResponse(
+    return api_response(
         status_code=status.HTTP_200_OK,
         message="Transaction retrieved successfully",
-        data=transaction.to_dict(),
+        data=transaction,
     )
\ No newline at end of file
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, EmailStr
+from typing import List, Optional
 from enum import Enum
 from app.core.base.schema import BaseResponseModel
 
@@ -28,4 +29,50 @@ class TransactionResponse(BaseResponseModel):
 
 # Response model for creating a new transaction
 class CreateTransactionResponse(BaseResponseModel):
-    data: TransactionData
\ No newline at end of file
+    data: TransactionData
+
+# Response model for a page of transactions
+class TransactionListResponse(BaseResponseModel):
+    data: List[TransactionData]
+    next_cursor: Optional[str] = None
+
+# Account balance data model
+class BalanceData(BaseModel):
+    email: EmailStr
+    balance: float
+    updated_at: str
+
+# Response model for an account balance
+class BalanceResponse(BaseResponseModel):
+    data: BalanceData
+
+# File format of a transaction export
+class ExportFormat(str, Enum):
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+# Aggregation period for transaction stats
+class StatsPeriod(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+
+# Aggregation strategy for transaction stats
+class StatsMethod(str, Enum):
+    AUTO = "auto"
+    SQL = "sql"
+    VECTORIZED = "vectorized"
+
+# Stats of one transaction type over one period
+class TransactionStatsData(BaseModel):
+    period_start: str
+    type: TransactionType
+    count: int
+    total: float
+    p50: float
+    p90: float
+    p99: float
+
+# Response model for transaction stats
+class TransactionStatsResponse(BaseResponseModel):
+    method: StatsMethod
+    data: List[TransactionStatsData]
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""Per-route admission control.
+
+Handlers are sync and run on the AnyIO threadpool, where excess requests
+queue invisibly and without bound. Routes using `AdmissionControlledRoute`
+instead admit at most a fixed number of concurrent requests each, and all
+of them together at most THREADPOOL_SIZE (`process_limiter`, whose gauges
+are labelled "*"); further requests wait in a bounded queue for a bounded
+time and are otherwise shed with a 503 and Retry-After, so overload fails
+fast instead of making every request slow. Routes listed in SINGLE_FLIGHT_ROUTES also coalesce concurrent
+identical requests in front of the limiter, so followers take no slot.
+"""
+
+import asyncio
+from typing import Callable, Coroutine
+
+from fastapi import Request, Response, status
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+from app.core.metrics import REQUESTS_IN_FLIGHT, REQUESTS_QUEUED, REQUESTS_SHED
+from app.core.single_flight import single_flight_handler
+from app.utils.profiler import profiled_call
+
+
+class RouteLimiter:
+    """Concurrency limit with a bounded wait queue for one route."""
+
+    def __init__(
+        self, method: str, route: str, max_concurrency: int, max_queue: int, queue_timeout: float
+    ):
+        self.method = method
+        self.route = route
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.queued = 0
+        # Created on first use: the semaphore inside the worker's event loop,
+        # and the gauges only for the routes actually served (FastAPI also
+        # builds handlers for the intermediate copies of included routes)
+        self._semaphore = None
+        self._in_flight_gauge = self._queued_gauge = None
+
+    async def acquire(self) -> str:
+        """Returns an empty string once admitted, else why the request is shed."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._in_flight_gauge = REQUESTS_IN_FLIGHT.labels(self.method, self.route)
+            self._queued_gauge = REQUESTS_QUEUED.labels(self.method, self.route)
+
+        if self._semaphore.locked():
+            if self.queued >= self.max_queue:
+                return "queue_full"
+            self.queued += 1
+            self._queued_gauge.inc()
+            try:
+                async with asyncio.timeout(self.queue_timeout):
+                    await self._semaphore.acquire()
+            except TimeoutError:
+                return "queue_timeout"
+            finally:
+                self.queued -= 1
+                self._queued_gauge.dec()
+        else:
+            await self._semaphore.acquire()
+
+        self.in_flight += 1
+        self._in_flight_gauge.inc()
+        return ""
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._in_flight_gauge.dec()
+        self._semaphore.release()
+
+
+process_limiter = RouteLimiter(
+    method="*",
+    route="*",
+    max_concurrency=settings.THREADPOOL_SIZE,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+)
+
+
+def shed_response(reason: str) -> Response:
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER)},
+        content={
+            "status": False,
+            "status_code": status.HTTP_503_SERVICE_UNAVAILABLE,
+            "message": "Server is overloaded, please retry later.",
+            "reason": reason,
+        },
+    )
+
+
+class AdmissionControlledRoute(APIRoute):
+    """APIRoute whose handler (dependencies, endpoint and serialization)
+    runs under the route's RouteLimiter, then under `process_limiter`.
+
+    The concurrency limit is ADMISSION_MAX_CONCURRENCY, or the entry for
+    "<METHOD> <path>" in ADMISSION_ROUTE_LIMITS. Routes whose "<METHOD>
+    <path>" is in SINGLE_FLIGHT_ROUTES are wrapped in `single_flight_handler`.
+    Sync endpoints are wrapped in `profiled_call`, so the slow request
+    profiler samples the threadpool worker running them.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[None, None, Response]]:
+        if not asyncio.iscoroutinefunction(self.dependant.call):
+            self.dependant.call = profiled_call(self.dependant.call)
+        handler = super().get_route_handler()
+        method = ",".join(sorted(self.methods))
+        if settings.ADMISSION_CONTROL_ENABLED:
+            handler = self._admission_controlled(handler, method)
+        if f"{method} {self.path}" in settings.SINGLE_FLIGHT_ROUTES:
+            handler = single_flight_handler(handler, method, self.path)
+        return handler
+
+    def _admission_controlled(
+        self, handler: Callable[[Request], Coroutine[None, None, Response]], method: str
+    ) -> Callable[[Request], Coroutine[None, None, Response]]:
+        limiter = RouteLimiter(
+            method=method,
+            route=self.path,
+            max_concurrency=settings.ADMISSION_ROUTE_LIMITS.get(
+                f"{method} {self.path}", settings.ADMISSION_MAX_CONCURRENCY
+            ),
+            max_queue=settings.ADMISSION_MAX_QUEUE,
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+        )
+
+        async def admission_controlled_handler(request: Request) -> Response:
+            reason = await limiter.acquire()
+            if reason:
+                REQUESTS_SHED.labels(limiter.method, limiter.route, reason).inc()
+                return shed_response(reason)
+            try:
+                reason = await process_limiter.acquire()
+                if reason:
+                    REQUESTS_SHED.labels(limiter.method, limiter.route, reason).inc()
+                    return shed_response(reason)
+                try:
+                    return await handler(request)
+                finally:
+                    process_limiter.release()
+            finally:
+                limiter.release()
+
+        return admission_controlled_handler
@@ -2,7 +2,8 @@
 
 from uuid_extensions import uuid7
 from app.db.database import Base
-from sqlalchemy import Column, String, DateTime, func
+from app.db.types import GUID
+from sqlalchemy import Column, DateTime, func
 
 
 class BaseTableModel(Base):
@@ -10,7 +11,7 @@ class BaseTableModel(Base):
 
     __abstract__ = True
 
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid7()))
+    id = Column(GUID, primary_key=True, index=True, default=lambda: str(uuid7()))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
@@ -1,4 +1,5 @@
 import os
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 from pathlib import Path
 
@@ -24,6 +25,124 @@ class Settings(BaseSettings):
     DATABASE_NAME: str
     DATABASE_TYPE: str
 
+    # Connection pool, per worker. DB_WARMUP_CONNECTIONS are opened at
+    # startup; the readiness probe reports a background check run every
+    # READINESS_CHECK_INTERVAL seconds
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_CONNECT_TIMEOUT: int = 5
+    DB_WARMUP_CONNECTIONS: int = 2
+    READINESS_CHECK_INTERVAL: float = 5.0
+
+    # Idempotency keys (seconds)
+    IDEMPOTENCY_KEY_TTL: int = 86_400
+    IDEMPOTENCY_LOCK_TIMEOUT: int = 60
+    IDEMPOTENCY_WAIT_TIMEOUT: float = 10.0
+    IDEMPOTENCY_CACHE_SIZE: int = 10_000
+
+    # Group commit of transaction inserts: concurrent creates are collected for
+    # up to the window (or until the batch is full) and written in one commit.
+    # A create not yet taken into a write after TRANSACTION_WRITE_TIMEOUT is
+    # cancelled; one taken is waited for up to TRANSACTION_WRITE_MAX_DURATION
+    TRANSACTION_WRITE_COALESCING: bool = False
+    TRANSACTION_WRITE_BATCH_WINDOW_MS: float = 2.0
+    TRANSACTION_WRITE_BATCH_MAX_ROWS: int = 100
+    TRANSACTION_WRITE_TIMEOUT: float = 10.0
+    TRANSACTION_WRITE_MAX_DURATION: float = 30.0
+
+    # Transaction analytics: above this many matching rows stats are computed
+    # with a SQL GROUP BY instead of vectorized in the application
+    TRANSACTION_STATS_VECTORIZED_MAX_ROWS: int = 200_000
+    TRANSACTION_STATS_CHUNK_SIZE: int = 50_000
+
+    # Transaction export
+    TRANSACTION_EXPORT_CHUNK_SIZE: int = 50_000
+    TRANSACTION_EXPORT_MAX_ROW_GROUP_ROWS: int = 1_000_000
+
+    # Account deletion: accounts with more posts than one chunk are marked
+    # deleted and their posts purged in the background, one chunk per
+    # transaction with a pause (seconds) in between
+    ACCOUNT_PURGE_CHUNK_SIZE: int = 1_000
+    ACCOUNT_PURGE_PAUSE: float = 0.05
+
+    # Post revisions are stored as line deltas against the previous
+    # revision, with a full snapshot at least every this many revisions, so
+    # reading one applies at most INTERVAL - 1 deltas
+    POST_REVISION_SNAPSHOT_INTERVAL: int = 20
+
+    # Most post IDs accepted by one batch fetch (/api/v1/posts/batch)
+    POST_BATCH_MAX_IDS: int = 100
+
+    # Encoded JSON of post list items, keyed by (id, updated_at)
+    POST_FRAGMENT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Post and transaction IDs looked up and not found are answered with a
+    # 404 without a query for this many seconds. Created rows get new UUIDv7
+    # IDs, which cannot already be cached, so creates invalidate nothing
+    NEGATIVE_CACHE_TTL: float = 10.0
+    NEGATIVE_CACHE_SIZE: int = 10_000
+
+    # Logging: "text" or "json"; records below WARNING are kept with the
+    # given probability
+    LOG_FORMAT: str = "text"
+    LOG_INFO_SAMPLE_RATE: float = 1.0
+    LOG_QUEUE_SIZE: int = 10_000
+
+    # SQL instrumentation: statements slower than this are logged, and a
+    # statement shape running more than the threshold times in one request
+    # is reported ("off", "warn" or "raise")
+    SQL_SLOW_QUERY_MS: float = 200.0
+    SQL_N_PLUS_ONE_MODE: str = "off"
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10
+
+    # Report auth/db/serialize time of each request in a Server-Timing header
+    SERVER_TIMING_HEADER: bool = True
+
+    # CORS, and the path prefixes of routes that use cookie sessions (none
+    # by default: the API authenticates with bearer tokens)
+    CORS_ALLOW_ORIGINS: List[str] = ["*"]
+    CORS_ALLOW_CREDENTIALS: bool = True
+    SESSION_PATH_PREFIXES: List[str] = []
+
+    # Admission control: AnyIO threadpool size for sync handlers, which also
+    # caps the requests in flight across all routes, and per route
+    # concurrency; requests beyond either wait in a bounded queue for a
+    # bounded time, then get a 503. ADMISSION_ROUTE_LIMITS overrides the
+    # concurrency per route, keyed like "GET /api/v1/posts"
+    THREADPOOL_SIZE: int = 40
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 40
+    ADMISSION_MAX_QUEUE: int = 100
+    ADMISSION_QUEUE_TIMEOUT: float = 5.0
+    ADMISSION_RETRY_AFTER: int = 1
+    ADMISSION_ROUTE_LIMITS: Dict[str, int] = {}
+
+    # Single-flight routes: concurrent identical requests (same path, query
+    # and Authorization header) share one handler call and its response
+    SINGLE_FLIGHT_ROUTES: List[str] = [
+        "GET /api/v1/posts",
+        "GET /api/v1/posts/{post_id}",
+        "GET /api/v1/posts/author/{author_id}",
+    ]
+
+    # Users allowed to call the /admin diagnostics endpoints (JSON list)
+    ADMIN_EMAILS: List[str] = []
+
+    # Slow request profiler: requests slower than the threshold keep a
+    # sampled stack profile; the slowest PROFILER_MAX_PROFILES are retained
+    PROFILER_ENABLED: bool = False
+    PROFILER_SLOW_REQUEST_MS: float = 500.0
+    PROFILER_SAMPLE_INTERVAL_MS: float = 5.0
+    PROFILER_MAX_PROFILES: int = 20
+    PROFILER_MAX_SAMPLES: int = 12_000
+
+    # Memory diagnostics: tracemalloc snapshots kept per worker, and how
+    # often each worker refreshes its memory gauges (seconds)
+    MEMORY_MAX_SNAPSHOTS: int = 5
+    MEMORY_GAUGE_INTERVAL: float = 15.0
+
     # Directories
     MEDIA_DIR: str = os.path.join(BASE_DIR, "media")
     STATIC_DIR: str = os.path.join(BASE_DIR, "static")
@@ -7,6 +7,8 @@ from app.api.models.user import User
 from app.db.database import get_db
 from app.utils.jwt_helpers import verify_jwt_token
 from app.core import response_messages
+from app.core.config import settings
+from app.core.metrics import timed
 
 
 
@@ -35,13 +37,33 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    user_id = verify_jwt_token(
-        token=access_token, credentials_exception=credentials_exception
-    )
+    with timed("auth"):
+        user_id = verify_jwt_token(
+            token=access_token, credentials_exception=credentials_exception
+        )
 
-    user = db.query(User).filter(User.id == user_id).first()
+        user = db.query(User).filter(User.id == user_id, User.deleted_at.is_(None)).first()
 
     if not user:
         raise credentials_exception
 
     return user
+
+
+def get_admin_user(current_user: Annotated[User, Depends(get_current_user)]) -> User:
+    """Dependency restricting a route to the users listed in ADMIN_EMAILS
+
+    Args:
+        current_user (Annotated[User, Depends): Logged in User object
+
+    Returns:
+        User: Logged in admin User object
+    """
+
+    if current_user.email not in settings.ADMIN_EMAILS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=response_messages.ADMIN_REQUIRED,
+        )
+
+    return current_user
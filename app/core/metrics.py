@@ -0,0 +1,197 @@
+"""Prometheus metrics and per-request timing phases.
+
+When the app runs under several worker processes, set
+PROMETHEUS_MULTIPROC_DIR to an empty directory shared by the workers before
+they start; each worker then writes its samples there and `/metrics`
+aggregates all of them, whichever worker serves the scrape.
+"""
+
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Dict, Iterator, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+# Weak registry of all live sessions; private, but the only way to reach
+# their identity maps without tracking every session ourselves
+from sqlalchemy.orm.session import _sessions
+
+from app.core.config import settings
+from app.db.instrumentation import query_stats_var
+
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0
+)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+REQUEST_PHASE_LATENCY = Histogram(
+    "http_request_phase_duration_seconds",
+    "Time spent per request in auth, db, serialize and other.",
+    ["route", "phase"],
+    buckets=LATENCY_BUCKETS,
+)
+
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests admitted by admission control and not finished yet.",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+
+REQUESTS_QUEUED = Gauge(
+    "http_requests_queued",
+    "Requests waiting for admission.",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+
+REQUESTS_SHED = Counter(
+    "http_requests_shed_total",
+    "Requests rejected with 503 by admission control.",
+    ["method", "route", "reason"],
+)
+
+# Coalescing ratio of a route: role="follower" over all its requests
+COALESCED_REQUESTS = Counter(
+    "http_requests_coalesced_total",
+    "Requests to single-flight routes, by whether they ran the handler "
+    "(leader) or shared the response of a concurrent identical request (follower).",
+    ["method", "route", "role"],
+)
+
+DB_LOOKUPS_AVOIDED = Counter(
+    "db_lookups_avoided_total",
+    "Lookups of missing rows answered without a query, because the ID was "
+    "malformed or recently not found (cached).",
+    ["entity", "reason"],
+)
+
+ORM_IDENTITY_MAP_OBJECTS = Gauge(
+    "orm_identity_map_objects",
+    "ORM instances held in the identity maps of live sessions.",
+    multiprocess_mode="livesum",
+)
+
+ORM_SESSIONS = Gauge(
+    "orm_sessions",
+    "Live SQLAlchemy sessions.",
+    multiprocess_mode="livesum",
+)
+
+CACHE_ENTRIES = Gauge(
+    "cache_entries",
+    "Entries held by in-process caches.",
+    ["cache"],
+    multiprocess_mode="livesum",
+)
+
+TRACEMALLOC_TRACED_BYTES = Gauge(
+    "tracemalloc_traced_bytes",
+    "Memory currently traced by tracemalloc, 0 when tracing is off.",
+    multiprocess_mode="livesum",
+)
+
+# In-process caches reported by CACHE_ENTRIES, by name
+_caches: Dict[str, Any] = {}
+
+# Time per phase of the current request, set by TimingMiddleware
+request_timings_var: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Adds the time spent in the block to a phase of the current request.
+
+    Database time spent inside the block is left to the `db` phase so that
+    phases do not overlap.
+    """
+    timings = request_timings_var.get()
+    if timings is None:
+        yield
+        return
+
+    stats = query_stats_var.get()
+    db_before = stats.duration if stats else 0.0
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = perf_counter() - start
+        if stats:
+            elapsed -= stats.duration - db_before
+        timings[phase] = timings.get(phase, 0.0) + elapsed
+
+
+def register_cache(name: str, cache: Any) -> None:
+    """Reports the number of entries (`len`) of an in-process cache."""
+    _caches[name] = cache
+
+
+def cache_sizes() -> Dict[str, int]:
+    """Number of entries of each registered cache."""
+    return {name: len(cache) for name, cache in list(_caches.items())}
+
+
+def refresh_gauges() -> None:
+    """Updates the memory gauges of this process."""
+    sessions = list(_sessions.values())
+    ORM_SESSIONS.set(len(sessions))
+    ORM_IDENTITY_MAP_OBJECTS.set(sum(len(session.identity_map) for session in sessions))
+    for name, size in cache_sizes().items():
+        CACHE_ENTRIES.labels(name).set(size)
+    TRACEMALLOC_TRACED_BYTES.set(
+        tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+    )
+
+
+def _refresh_gauges_forever() -> None:
+    while True:
+        refresh_gauges()
+        time.sleep(settings.MEMORY_GAUGE_INTERVAL)
+
+
+def start_gauge_refresher() -> None:
+    """Refreshes this worker's gauges in the background, so that every
+    worker's values stay current in the aggregated metrics."""
+    threading.Thread(target=_refresh_gauges_forever, name="metrics-gauges", daemon=True).start()
+
+
+def render_metrics() -> bytes:
+    """Renders all metrics in the Prometheus text format."""
+    refresh_gauges()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drops a stopped worker's live gauges from the shared metrics directory."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid)
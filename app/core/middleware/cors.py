@@ -0,0 +1,147 @@
+from typing import List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+ALL_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+SAFELISTED_HEADERS = {"Accept", "Accept-Language", "Content-Language", "Content-Type"}
+
+RawHeaders = List[Tuple[bytes, bytes]]
+
+
+class CORSMiddleware:
+    """CORS with the response headers encoded once, at startup.
+
+    Behaves like Starlette's CORSMiddleware for the options this app uses,
+    but works on the raw ASGI header lists: requests without an Origin
+    header pass straight through after a single scan of their headers,
+    CORS responses get the precomputed headers appended without building
+    Headers/MutableHeaders objects, and preflights are answered without a
+    Response object.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origins: Sequence[str] = (),
+        allow_methods: Sequence[str] = ("GET",),
+        allow_headers: Sequence[str] = (),
+        allow_credentials: bool = False,
+        max_age: int = 600,
+    ):
+        if "*" in allow_methods:
+            allow_methods = ALL_METHODS
+
+        self.app = app
+        self.allow_all_origins = "*" in allow_origins
+        self.allow_origins = {origin.encode("latin-1") for origin in allow_origins}
+        self.allow_methods = {method.encode("latin-1") for method in allow_methods}
+        self.allow_all_headers = "*" in allow_headers
+        allow_headers = sorted(SAFELISTED_HEADERS | set(allow_headers))
+        self.allow_headers = {header.lower() for header in allow_headers}
+        # The origin has to be echoed instead of "*" whenever credentials
+        # may be involved
+        self.explicit_origin = not self.allow_all_origins or allow_credentials
+
+        # Added to responses as is, or followed by the echoed origin
+        self.explicit_origin_headers: RawHeaders = []
+        if allow_credentials:
+            self.explicit_origin_headers.append((b"access-control-allow-credentials", b"true"))
+        self.simple_headers: RawHeaders = list(self.explicit_origin_headers)
+        if self.allow_all_origins:
+            self.simple_headers.append((b"access-control-allow-origin", b"*"))
+
+        self.preflight_headers: RawHeaders = [
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            (b"content-type", b"text/plain; charset=utf-8"),
+        ]
+        if self.explicit_origin:
+            self.preflight_headers.append((b"vary", b"Origin"))
+        else:
+            self.preflight_headers.append((b"access-control-allow-origin", b"*"))
+        if allow_credentials:
+            self.preflight_headers.append((b"access-control-allow-credentials", b"true"))
+        if not self.allow_all_headers:
+            self.preflight_headers.append(
+                (b"access-control-allow-headers", ", ".join(allow_headers).encode("latin-1"))
+            )
+
+    def is_allowed_origin(self, origin: bytes) -> bool:
+        return self.allow_all_origins or origin in self.allow_origins
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        has_cookie = False
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"cookie":
+                has_cookie = True
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self.preflight(origin, request_method, request_headers, send)
+            return
+
+        # Echo allowed origins from an explicit list, and any origin sending
+        # cookies when all are allowed, since "*" is not valid with credentials
+        if has_cookie if self.allow_all_origins else self.is_allowed_origin(origin):
+            extra_headers = [
+                *self.explicit_origin_headers,
+                (b"access-control-allow-origin", origin),
+                (b"vary", b"Origin"),
+            ]
+        else:
+            extra_headers = self.simple_headers
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *extra_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def preflight(
+        self, origin: bytes, method: bytes, requested_headers: Optional[bytes], send: Send
+    ) -> None:
+        headers = list(self.preflight_headers)
+        failures = []
+
+        if self.is_allowed_origin(origin):
+            if self.explicit_origin:
+                headers.append((b"access-control-allow-origin", origin))
+        else:
+            failures.append("origin")
+
+        if method not in self.allow_methods:
+            failures.append("method")
+
+        if requested_headers is not None:
+            if self.allow_all_headers:
+                headers.append((b"access-control-allow-headers", requested_headers))
+            elif any(
+                header.strip() not in self.allow_headers
+                for header in requested_headers.decode("latin-1").lower().split(",")
+            ):
+                failures.append("headers")
+
+        if failures:
+            status, body = 400, ("Disallowed CORS " + ", ".join(failures)).encode()
+        else:
+            status, body = 200, b"OK"
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
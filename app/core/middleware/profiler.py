@@ -0,0 +1,30 @@
+from time import perf_counter
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.utils.logger import request_id_var
+from app.utils.profiler import current_profile_var, slow_request_profiler
+
+
+class ProfilerMiddleware:
+    """Profiles requests with the slow request sampler when enabled."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.PROFILER_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        profile = slow_request_profiler.start_request(
+            scope["method"], scope["path"], request_id_var.get()
+        )
+        token = current_profile_var.set(profile)
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            slow_request_profiler.finish_request(profile, perf_counter() - start)
+            current_profile_var.reset(token)
@@ -0,0 +1,37 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.db.instrumentation import QueryStats, query_stats_var
+from app.utils.logger import logger
+
+
+class QueryStatsMiddleware:
+    """Collects the SQL statements each request runs.
+
+    The stats object is published through `query_stats_var` (sync endpoints
+    and dependencies run in a copy of this context, so they record into the
+    same object) and on `scope["state"]["query_stats"]` for outer middleware.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        scope.setdefault("state", {})["query_stats"] = stats
+        token = query_stats_var.set(stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            query_stats_var.reset(token)
+            if stats.count:
+                logger.info(
+                    "%s %s ran %s queries in %.1f ms",
+                    scope["method"],
+                    scope["path"],
+                    stats.count,
+                    stats.duration * 1000,
+                )
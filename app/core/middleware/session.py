@@ -0,0 +1,26 @@
+from typing import Sequence
+
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class OptInSessionMiddleware:
+    """Runs Starlette's SessionMiddleware only under the given path prefixes.
+
+    The API authenticates with bearer tokens, so most requests have no use
+    for the signed session cookie; they skip its parsing and signing
+    entirely. Routes outside the prefixes that touch `request.session` fail
+    with Starlette's "SessionMiddleware must be installed" assertion.
+    """
+
+    def __init__(self, app: ASGIApp, path_prefixes: Sequence[str], **session_options):
+        self.app = app
+        self.path_prefixes = tuple(path_prefixes)
+        self.session_app = SessionMiddleware(app, **session_options)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # str.startswith(()) is False, so no prefixes disables sessions
+        if scope["type"] in ("http", "websocket") and scope["path"].startswith(self.path_prefixes):
+            await self.session_app(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
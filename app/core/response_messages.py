@@ -6,3 +6,5 @@ INVALID_PASSWORD = "Wrong user password"
 INVALID_CREDENTIALS = "Could not validate credentials"
 EXPIRED_REFRESH_TOKEN = "Refresh token expired"
 TOKEN_REFRESH_SUCCESSFUL = "Tokens refreshed succesfully"
+
+ADMIN_REQUIRED = "Admin privileges required"
@@ -0,0 +1,71 @@
+import orjson
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from typing import List, Mapping, Optional
+
+from app.core.metrics import timed
+
+
+def api_response(
+    status_code: int, message: str, headers: Optional[Mapping[str, str]] = None, **fields
+) -> ORJSONResponse:
+    """Builds the standard `status_code`/`message` response envelope.
+
+    Returning a Response from a route makes FastAPI skip validating the
+    content against the route's `response_model` and re-encoding it, so the
+    body is serialized exactly once, by orjson. The `response_model` is then
+    only used for the OpenAPI schema, and callers must pass data that is
+    already in the documented shape (e.g. from a model's `to_dict()`).
+
+    Args:
+        status_code (int): HTTP status code, also echoed in the body.
+        message (str): Human readable message.
+        headers (Optional[Mapping[str, str]]): Extra response headers.
+        **fields: Remaining top level fields, such as `data`.
+
+    Returns:
+        ORJSONResponse: The serialized response.
+    """
+
+    with timed("serialize"):
+        return ORJSONResponse(
+            status_code=status_code,
+            headers=headers,
+            content={"status_code": status_code, "message": message, **fields},
+        )
+
+
+def api_list_response(
+    status_code: int,
+    message: str,
+    fragments: List[bytes],
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Builds the standard response envelope around a `data` list whose items
+    are already JSON encoded, by concatenating the encoded items.
+
+    Args:
+        status_code (int): HTTP status code, also echoed in the body.
+        message (str): Human readable message.
+        fragments (List[bytes]): JSON encoded list items.
+        headers (Optional[Mapping[str, str]]): Extra response headers.
+
+    Returns:
+        Response: The serialized response.
+    """
+
+    with timed("serialize"):
+        body = b"".join(
+            (
+                b'{"status_code":',
+                str(status_code).encode(),
+                b',"message":',
+                orjson.dumps(message),
+                b',"data":[',
+                b",".join(fragments),
+                b"]}",
+            )
+        )
+    return Response(
+        content=body, status_code=status_code, headers=headers, media_type="application/json"
+    )
@@ -0,0 +1,117 @@
+"""Single-flight request coalescing.
+
+When a popular read endpoint gets many identical requests at once (after a
+deploy, or when a cache entry expires), each would run the same queries.
+On single-flight routes the first of them (the leader) runs the handler and
+the others (followers) arriving while it is in flight wait for it and get a
+copy of its response. Coalescing is per worker process.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.core.metrics import COALESCED_REQUESTS
+
+# Status, body and headers of a response, enough to send it again
+ResponseSnapshot = Tuple[int, bytes, Tuple[Tuple[bytes, bytes], ...]]
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls with the same key."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Returns the result of `fn()`, or of the call already in flight for
+        `key`, and whether it was shared. Exceptions are shared as well; if
+        the leading call is cancelled, a waiting caller takes over.
+        """
+        while (call := self._calls.get(key)) is not None:
+            try:
+                # Shielded: a waiting caller being cancelled must not cancel
+                # the call the others are waiting for
+                return await asyncio.shield(call), True
+            except asyncio.CancelledError:
+                if not call.cancelled():
+                    raise
+
+        call = asyncio.get_running_loop().create_future()
+        self._calls[key] = call
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except BaseException as e:
+            call.set_exception(e)
+            # Marks the exception retrieved, there may be no one waiting
+            call.exception()
+            raise
+        else:
+            call.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
+
+
+def snapshot_response(response: Response) -> Optional[ResponseSnapshot]:
+    """Copies what is needed to replay a response, or None for responses that
+    cannot be replayed (streamed bodies, background tasks).
+
+    Taken before the leader sends its response, since outer middleware add
+    headers to the header list of the message in place.
+    """
+    body = getattr(response, "body", None)
+    if body is None or response.background is not None:
+        return None
+    return response.status_code, body, tuple(response.raw_headers)
+
+
+def replay_response(snapshot: ResponseSnapshot) -> Response:
+    status_code, body, raw_headers = snapshot
+    response = Response(content=body, status_code=status_code)
+    response.raw_headers = list(raw_headers)
+    return response
+
+
+def single_flight_handler(
+    handler: Callable[[Request], Coroutine[None, None, Response]], method: str, route: str
+) -> Callable[[Request], Coroutine[None, None, Response]]:
+    """Wraps a route handler so that concurrent requests with the same path,
+    query string and Authorization header share one handler call.
+
+    Keying on the Authorization header keeps responses that depend on the
+    caller (ownership checks, 401s) from being shared between users.
+    """
+    flight = SingleFlight()
+    leaders = COALESCED_REQUESTS.labels(method, route, "leader")
+    followers = COALESCED_REQUESTS.labels(method, route, "follower")
+
+    async def lead(request: Request) -> Tuple[Any, Optional[ResponseSnapshot], bool]:
+        # Errors (HTTPException for 401 or 404) are returned rather than
+        # raised so that every caller is counted before re-raising them
+        try:
+            response = await handler(request)
+        except Exception as e:
+            return e, None, True
+        return response, snapshot_response(response), False
+
+    async def coalesced_handler(request: Request) -> Response:
+        key = (request.url.path, request.url.query, request.headers.get("authorization"))
+        (result, snapshot, failed), shared = await flight.do(key, lambda: lead(request))
+        if shared and not failed and snapshot is None:
+            leaders.inc()
+            return await handler(request)
+
+        (followers if shared else leaders).inc()
+        if failed:
+            raise result
+        return replay_response(snapshot) if shared else result
+
+    return coalesced_handler
@@ -0,0 +1,78 @@
+"""Work done before serving so the first requests after a deploy do not
+pay for it: mapper configuration, the OpenAPI schema, pool connections and
+the SQL compilation of hot queries.
+"""
+
+import time
+
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from app.api.repositories.balance import BalanceRepository
+from app.api.repositories.idempotency_key import IdempotencyKeyRepository
+from app.api.repositories.post import PostRepository
+from app.api.repositories.transaction import TransactionRepository
+from app.api.repositories.user import UserRepository
+from app.db.database import SessionLocal, engine
+from app.utils.logger import logger
+
+# Lookup values that match no rows
+NIL_ID = "00000000-0000-0000-0000-000000000000"
+NIL_EMAIL = "warmup@example.invalid"
+
+
+def warm_up_app(app: FastAPI) -> None:
+    """Database-free warm-up; the launcher runs it before forking so that
+    workers inherit the result."""
+    configure_mappers()
+    app.openapi()
+
+
+def warm_pool(connections: int) -> int:
+    """Opens up to `connections` pool connections and returns them to the pool."""
+    opened = []
+    try:
+        for _ in range(connections):
+            connection = engine.connect()
+            opened.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
+
+def compile_hot_queries() -> None:
+    """Runs the statements of the busiest endpoints with lookup values that
+    match nothing, which fills the engine's compiled statement cache."""
+    db = SessionLocal()
+    try:
+        UserRepository(db).get(NIL_ID)
+        UserRepository(db).get_by_email(NIL_EMAIL)
+        PostRepository(db).get_post_by_id(NIL_ID)
+        PostRepository(db).get_author_post_by_id(NIL_ID, NIL_ID)
+        PostRepository(db).get_post_rows(author_id=NIL_ID)
+        TransactionRepository(db).get_row(NIL_ID)
+        TransactionRepository(db).get_history(email=NIL_EMAIL, limit=1)
+        BalanceRepository(db).get_by_email(NIL_EMAIL)
+        IdempotencyKeyRepository(db).get_by_key(NIL_ID)
+        db.rollback()
+    finally:
+        db.close()
+
+
+def warm_up(app: FastAPI, connections: int) -> None:
+    """Full warm-up of a worker. Database failures are logged, not raised:
+    the worker still starts and the readiness probe reports the database."""
+    started = time.perf_counter()
+    warm_up_app(app)
+    try:
+        opened = warm_pool(connections)
+        compile_hot_queries()
+    except Exception as e:
+        logger.error("Database warm-up failed: %s", e)
+        return
+    logger.info(
+        "Warmed up in %.0f ms (%s pool connections)", (time.perf_counter() - started) * 1000, opened
+    )
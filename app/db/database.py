@@ -4,11 +4,26 @@ from sqlalchemy.orm import sessionmaker, scoped_session, declarative_base
 from sqlalchemy import create_engine
 
 from app.core.config import settings
+from app.db.health import DatabaseHealthCheck
+from app.db.instrumentation import instrument_engine
 from app.utils.logger import logger
 
 DATABASE_URL = settings.database_url
 
-engine = create_engine(DATABASE_URL)
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args=(
+        {"connect_timeout": settings.DB_CONNECT_TIMEOUT}
+        if settings.DATABASE_TYPE.startswith("postgresql")
+        else {}
+    ),
+)
+instrument_engine(engine)
+database_health = DatabaseHealthCheck(engine, interval=settings.READINESS_CHECK_INTERVAL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 db_session = scoped_session(SessionLocal)
 
@@ -26,7 +41,7 @@ def get_db():
     try:
         yield db
     except Exception as e:
-        logger.error(f"Database Error: {e}")
+        logger.error("Database Error: %s", e)
         raise
     finally:
         db.close()
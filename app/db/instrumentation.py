@@ -0,0 +1,133 @@
+"""Per-request SQL instrumentation.
+
+Engine event hooks count statements and accumulate database time into the
+`QueryStats` of the current request (set by QueryStatsMiddleware), log slow
+statements with their parameters redacted, and flag the same statement
+shape running many times in one request (the usual N+1 pattern).
+"""
+
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.utils.logger import logger
+
+
+class NPlusOneError(RuntimeError):
+    """Raised when a statement shape repeats too often in one request."""
+
+
+class QueryStats:
+    """Statement count and database time for one request or block."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+
+query_stats_var: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Collectors from track_queries(), which see statements from every thread
+_collectors: List[QueryStats] = []
+_collectors_lock = threading.Lock()
+
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so expanded IN lists of any length compare equal."""
+    return _PLACEHOLDER_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """Replace parameter values by their type names."""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect statements executed anywhere in the process within the block.
+
+    Unlike the per-request stats this does not rely on context variables, so
+    it also sees statements issued from the test client's event loop thread.
+    """
+    stats = QueryStats()
+    with _collectors_lock:
+        _collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        with _collectors_lock:
+            _collectors.remove(stats)
+
+
+def _check_repeats(stats: QueryStats, shape: str) -> None:
+    mode = settings.SQL_N_PLUS_ONE_MODE
+    threshold = settings.SQL_N_PLUS_ONE_THRESHOLD
+    # Only the first time a shape crosses the threshold, not on every repeat
+    if mode == "off" or stats.statements[shape] != threshold + 1:
+        return
+    message = "Statement ran %s times in one request (possible N+1): %s"
+    if mode == "raise":
+        raise NPlusOneError(message % (stats.statements[shape], shape))
+    logger.warning(message, stats.statements[shape], shape)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = perf_counter() - conn.info["query_start"].pop()
+    shape = statement_shape(statement)
+
+    if duration * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms): %s; parameters: %s",
+            duration * 1000,
+            shape,
+            redact_parameters(parameters, executemany),
+        )
+
+    for stats in list(_collectors):
+        stats.record(shape, duration)
+
+    stats = query_stats_var.get()
+    if stats is not None:
+        stats.record(shape, duration)
+        _check_repeats(stats, shape)
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start"):
+        connection.info["query_start"].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach the query hooks to an engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,46 @@
+"""Column types shared by the models."""
+
+import uuid
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import TypeDecorator
+
+
+class GUID(TypeDecorator):
+    """UUID stored natively on PostgreSQL and as 16 raw bytes elsewhere
+    (SQLite), instead of 36 characters of text.
+
+    The application keeps using canonical strings: values are bound from
+    strings (or UUIDs) and always read back as strings. Malformed strings
+    fail the statement, so IDs from clients are validated first (see
+    `app.utils.ids.is_uuid7`).
+    """
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            # psycopg2 sends and returns UUIDs as text, no conversion needed
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, uuid.UUID):
+            value = str(value)
+        if dialect.name == "postgresql":
+            return value
+        # Several times faster than going through uuid.UUID
+        raw = bytes.fromhex(value.replace("-", ""))
+        if len(raw) != 16:
+            raise ValueError(f"Badly formed UUID: {value!r}")
+        return raw
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        h = value.hex()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
@@ -1,36 +1,65 @@
+import os
 import uvicorn
+from anyio import to_thread
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, status
-from fastapi import HTTPException, Request
+from fastapi import HTTPException, Request, Response
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.exc import IntegrityError
-from starlette.middleware.sessions import SessionMiddleware
 
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from app.core.config import settings
+from app.core.metrics import (
+    METRICS_CONTENT_TYPE,
+    mark_process_dead,
+    register_cache,
+    render_metrics,
+    start_gauge_refresher,
+)
+from app.core.middleware.cors import CORSMiddleware
+from app.core.middleware.profiler import ProfilerMiddleware
+from app.core.middleware.query_stats import QueryStatsMiddleware
+from app.core.middleware.request_id import RequestIdMiddleware
+from app.core.middleware.session import OptInSessionMiddleware
+from app.core.middleware.timing import TimingMiddleware
+from app.core.warmup import warm_up
+from app.db.database import database_health
 from app.utils.logger import logger
 from app.api.v1 import main_router
+from app.api.services.account_purge import account_purger
+from app.api.services.transaction_writer import transaction_writer
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    start_gauge_refresher()
+    await run_in_threadpool(warm_up, app, settings.DB_WARMUP_CONNECTIONS)
+    database_health.start()
     logger.info("Application started")
     yield
+    database_health.stop()
+    transaction_writer.stop()
+    account_purger.stop()
+    mark_process_dead(os.getpid())
     logger.info("Application shutdown")
 
 
 limiter = Limiter(key_func=get_remote_address)
+# Counters of the in-memory rate limit storage, one per client and limit
+register_cache("rate_limiter", limiter._storage.storage)
 
 app = FastAPI(
     title="Simple Blog API",
     description="Simple Blog API built with FastAPI",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/v1/docs",
     redoc_url="/v1/redoc",
     openapi_url="/v1/openapi.json",
@@ -39,14 +68,22 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
-app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY)
+app.add_middleware(
+    OptInSessionMiddleware,
+    path_prefixes=settings.SESSION_PATH_PREFIXES,
+    secret_key=settings.SECRET_KEY,
+)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
+    allow_origins=settings.CORS_ALLOW_ORIGINS,
+    allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(TimingMiddleware)
+app.add_middleware(ProfilerMiddleware)
+app.add_middleware(RequestIdMiddleware)
 
 app.include_router(main_router)
 
@@ -54,7 +91,7 @@ app.include_router(main_router)
 @app.get("/", tags=["Home"])
 @limiter.limit("5/minute")
 async def get_root(request: Request) -> dict:
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_200_OK,
         content={"URL": "", "message": "Welcome to the Simple Blog API"},
     )
@@ -65,14 +102,30 @@ async def probe():
     return {"message": "I am the Python FastAPI API responding"}
 
 
+@app.get("/ready", tags=["Home"])
+async def ready():
+    """Readiness probe: 503 until the latest background database check,
+    which is at most a few intervals old, succeeded."""
+    is_ready = database_health.is_ready()
+    return ORJSONResponse(
+        status_code=status.HTTP_200_OK if is_ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"ready": is_ready, "database": database_health.status()},
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 # REGISTER EXCEPTION HANDLERS
 @app.exception_handler(HTTPException)
 async def http_exception(request: Request, exc: HTTPException):
     """HTTP exception handler"""
 
-    logger.error(f"HTTP Exception occured; {exc}")
+    logger.error("HTTP Exception occured; %s", exc)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "status": False,
@@ -91,9 +144,9 @@ async def validation_exception(request: Request, exc: RequestValidationError):
         for error in exc.errors()
     ]
 
-    logger.error(f"Validation Exception occured; {errors}")
+    logger.error("Validation Exception occured; %s", errors)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content={
             "status": False,
@@ -108,9 +161,9 @@ async def validation_exception(request: Request, exc: RequestValidationError):
 async def integrity_exception(request: Request, exc: IntegrityError):
     """Integrity error exception handlers"""
 
-    logger.error(f"Integrity Exception occured; {exc}")
+    logger.error("Integrity Exception occured; %s", exc)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=400,
         content={
             "status": False,
@@ -124,9 +177,9 @@ async def integrity_exception(request: Request, exc: IntegrityError):
 async def exception(request: Request, exc: Exception):
     """Other exception handlers"""
 
-    logger.error(f"Exception occured; {exc}")
+    logger.error("Exception occured; %s", exc)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "status": False,
@@ -140,9 +193,9 @@ async def exception(request: Request, exc: Exception):
 async def custom_rate_limit_handler(request: Request, exc: RateLimitExceeded):
     """Rate limit exceeded exception handler"""
 
-    logger.error(f"Rate limit exceeded! {exc}")
+    logger.error("Rate limit exceeded! %s", exc)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=429,
         content={
             "status": False,
@@ -152,10 +205,11 @@ async def custom_rate_limit_handler(request: Request, exc: RateLimitExceeded):
     )
 
 
+# Development server with auto-reload; in production use the preforking
+# launcher instead: python -m app.scripts.serve
 if __name__ == "__main__":
     uvicorn.run(
-        "main:app",
+        "app.main:app",
         port=7001,
         reload=True,
-        workers=4,
     )
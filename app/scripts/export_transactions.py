@@ -0,0 +1,23 @@
+"""Export the transactions table to Parquet or Arrow IPC.
+
+    python -m app.scripts.export_transactions transactions.parquet
+    python -m app.scripts.export_transactions transactions.arrows --format arrow --from 2025-01-01 --to 2025-07-01
+"""
+
+import argparse
+from datetime import datetime
+
+from app.api.services.transaction_export import TransactionExportService
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output")
+    parser.add_argument("--format", choices=("parquet", "arrow"), default="parquet")
+    parser.add_argument("--from", dest="start", type=datetime.fromisoformat)
+    parser.add_argument("--to", dest="end", type=datetime.fromisoformat)
+    args = parser.parse_args()
+
+    TransactionExportService(format=args.format).export_to_file(
+        args.output, start=args.start, end=args.end
+    )
@@ -0,0 +1,40 @@
+"""Finish purging deleted accounts.
+
+    python -m app.scripts.purge_deleted_accounts
+
+Accounts with many posts are purged in the background by the worker that
+deleted them; a purge interrupted by a restart leaves the account marked
+deleted (and unusable). This resumes every such purge and should run on a
+schedule (e.g. hourly).
+"""
+
+from app.db.database import SessionLocal
+from app.api.repositories.user import UserRepository
+from app.api.services.account_purge import purge_account
+from app.core.config import settings
+from app.utils.logger import logger
+
+
+def purge() -> int:
+    """Purges every account marked deleted.
+
+    Returns:
+        int: Number of purged accounts.
+    """
+    db = SessionLocal()
+    try:
+        user_ids = UserRepository(db).get_deleted_ids()
+    finally:
+        db.close()
+    for user_id in user_ids:
+        purge_account(
+            user_id,
+            chunk_size=settings.ACCOUNT_PURGE_CHUNK_SIZE,
+            pause=settings.ACCOUNT_PURGE_PAUSE,
+        )
+    logger.info("Purged %s deleted accounts.", len(user_ids))
+    return len(user_ids)
+
+
+if __name__ == "__main__":
+    purge()
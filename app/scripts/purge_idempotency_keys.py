@@ -0,0 +1,32 @@
+"""Delete expired idempotency keys.
+
+    python -m app.scripts.purge_idempotency_keys
+
+Expired keys are already ignored when a request arrives; this only reclaims
+the space and should run on a schedule (e.g. hourly).
+"""
+
+from datetime import datetime, timezone
+
+from app.db.database import SessionLocal
+from app.api.repositories.idempotency_key import IdempotencyKeyRepository
+from app.utils.logger import logger
+
+
+def purge() -> int:
+    """Deletes every expired idempotency key.
+
+    Returns:
+        int: Number of deleted keys.
+    """
+    db = SessionLocal()
+    try:
+        deleted = IdempotencyKeyRepository(db).purge_expired(now=datetime.now(timezone.utc))
+    finally:
+        db.close()
+    logger.info("Purged %s expired idempotency keys.", deleted)
+    return deleted
+
+
+if __name__ == "__main__":
+    purge()
@@ -0,0 +1,216 @@
+"""Production launcher: preload the app once, then fork uvicorn workers.
+
+The master imports the application, runs a full collection and
+`gc.freeze()`s everything it allocated before forking, so the workers share
+the imported modules, settings and compiled schemas copy-on-write instead
+of each importing them again. Workers share one listening socket, use
+uvloop and httptools when installed, and are restarted if they die, after
+a delay that grows while they keep dying soon after starting; the launcher
+gives up after MAX_FAST_FAILURES such failures in a row.
+
+    python -m app.scripts.serve --host 0.0.0.0 --port 8000
+    python -m app.scripts.serve --workers 4 --import-report 25
+"""
+
+import argparse
+import gc
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from importlib.util import find_spec
+from typing import Dict, List, Tuple
+
+# A worker exiting within FAST_FAILURE_SECONDS of its start is a fast
+# failure; each one in a row doubles the restart delay
+MIN_RESTART_DELAY = 1.0
+MAX_RESTART_DELAY = 30.0
+FAST_FAILURE_SECONDS = 10.0
+MAX_FAST_FAILURES = 5
+
+
+def default_workers() -> int:
+    """WEB_CONCURRENCY if set, else the CPUs this process may run on."""
+    if "WEB_CONCURRENCY" in os.environ:
+        return int(os.environ["WEB_CONCURRENCY"])
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def import_report(module: str, limit: int) -> List[Tuple[int, int, str]]:
+    """Slowest imports of a cold `import module`, from `python -X importtime`.
+
+    Returns (cumulative us, self us, module name) tuples, slowest first.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=os.environ,
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings.append((int(cumulative_us), int(self_us), name.strip()))
+    timings.sort(reverse=True)
+    return timings[:limit]
+
+
+def restart_delay(fast_failures: int) -> float:
+    """Seconds to wait before restarting a worker after `fast_failures` fast
+    failures in a row."""
+    return min(MIN_RESTART_DELAY * 2 ** max(fast_failures - 1, 0), MAX_RESTART_DELAY)
+
+
+def run_worker(config, sock) -> None:
+    import uvicorn
+
+    from app.db.database import engine
+
+    # Connections opened by the master must not be shared with the workers
+    engine.dispose(close=False)
+    gc.enable()
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(host: str, port: int, workers: int, report: int) -> int:
+    """Serves until stopped; returns the launcher's exit status."""
+    # Must be set before prometheus_client is imported so that every worker
+    # writes its samples where /metrics can aggregate them
+    if workers > 1 and "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+
+    if report:
+        # Command output asked for on the command line rather than a log
+        # record, so it goes to stdout as a plain table
+        sys.stdout.write(f"{'cumulative ms':>14} {'self ms':>8}  module\n")
+        for cumulative_us, self_us, name in import_report("app.main", report):
+            sys.stdout.write(f"{cumulative_us / 1000:14.1f} {self_us / 1000:8.1f}  {name}\n")
+        sys.stdout.flush()
+
+    # No collections while preloading, the objects allocated now are frozen
+    # below; the master itself only waits on its workers and keeps gc off
+    gc.disable()
+    started = time.perf_counter()
+
+    import uvicorn
+
+    from app.core.metrics import mark_process_dead
+    from app.core.warmup import warm_up_app
+    from app.main import app
+    from app.utils.logger import flush_logs, logger
+
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        loop="uvloop" if find_spec("uvloop") else "asyncio",
+        http="httptools" if find_spec("httptools") else "h11",
+        lifespan="on",
+    )
+    config.load()
+    warm_up_app(app)
+    sock = config.bind_socket()
+
+    gc.collect()
+    gc.freeze()
+    logger.info(
+        "Preloaded app in %.0f ms (%s frozen objects, loop=%s, http=%s)",
+        (time.perf_counter() - started) * 1000,
+        gc.get_freeze_count(),
+        config.loop,
+        config.http,
+    )
+
+    # pid -> (worker index, start time)
+    children: Dict[int, Tuple[int, float]] = {}
+    fast_failures = [0] * workers
+    stopping = False
+    exit_status = 0
+
+    def spawn(index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(config, sock)
+            finally:
+                # os._exit() skips atexit, which would otherwise write the
+                # records still queued, such as uvicorn's shutdown logs
+                flush_logs()
+                os._exit(0)
+        children[pid] = (index, time.monotonic())
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            os.kill(pid, signum)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for index in range(workers):
+        spawn(index)
+    logger.info("Started %s workers on %s:%s", workers, host, port)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        child = children.pop(pid, None)
+        mark_process_dead(pid)
+        if child is None or stopping:
+            continue
+        index, started_at = child
+        if time.monotonic() - started_at < FAST_FAILURE_SECONDS:
+            fast_failures[index] += 1
+        else:
+            fast_failures[index] = 0
+        if fast_failures[index] >= MAX_FAST_FAILURES:
+            logger.error(
+                "Worker %s failed %s times in a row right after starting, stopping",
+                index,
+                fast_failures[index],
+            )
+            exit_status = 1
+            stop(signal.SIGTERM, None)
+            continue
+        delay = restart_delay(fast_failures[index])
+        logger.warning(
+            "Worker %s exited with status %s, restarting in %.0f s",
+            pid,
+            os.waitstatus_to_exitcode(status),
+            delay,
+        )
+        time.sleep(delay)
+        if not stopping:
+            spawn(index)
+
+    sock.close()
+    logger.info("All workers stopped")
+    return exit_status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument(
+        "--import-report",
+        type=int,
+        default=0,
+        metavar="N",
+        help="print the N slowest module imports of a cold start before serving",
+    )
+    args = parser.parse_args()
+
+    sys.exit(serve(args.host, args.port, args.workers, args.import_report))
@@ -0,0 +1,163 @@
+"""Manage the monthly partitions of the transactions table.
+
+    python -m app.scripts.transaction_partitions create --months-ahead 3
+    python -m app.scripts.transaction_partitions detach --before 2024-01
+
+`create` should run on a schedule (e.g. daily) so the next months exist before
+rows arrive for them. `detach` turns every month older than `--before` into a
+standalone table that can be archived or dropped without touching the live
+table. In the same transaction it adds each email's sum over the detached
+months to `account_balances.opening_balance`, which
+`python -m app.scripts.reconcile_balances` adds to the sums of the months
+still attached; without it, reconciling would reset balances to the attached
+months only.
+"""
+
+import argparse
+from datetime import date
+from typing import List
+
+from sqlalchemy import text
+
+from app.db.database import engine
+from app.utils.logger import logger
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition_name(month: date) -> str:
+    return f"transactions_{month:%Y_%m}"
+
+
+def list_partitions() -> List[str]:
+    """Returns the names of the monthly partitions currently attached."""
+
+    query = text(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+        JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+        WHERE parent.relname = 'transactions' AND child.relname <> 'transactions_default'
+        ORDER BY child.relname
+        """
+    )
+    with engine.connect() as connection:
+        return [row[0] for row in connection.execute(query)]
+
+
+def _create_partition(connection, month: date) -> None:
+    """Creates the partition of `month`, moving its rows out of the default
+    partition first if some already landed there."""
+
+    name = _partition_name(month)
+    bounds = {"start": month, "end": _add_months(month, 1)}
+    in_month = "created_at >= :start AND created_at < :end"
+    create = text(
+        f"CREATE TABLE {name} PARTITION OF transactions "
+        f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+    )
+    has_rows = connection.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM transactions_default WHERE {in_month})"), bounds
+    ).scalar()
+    if not has_rows:
+        connection.execute(create)
+        return
+
+    # The partition cannot be created while the default partition holds rows
+    # in its range. Detaching the default locks the table until the commit,
+    # which only lasts as long as moving the month's rows.
+    logger.warning("Moving rows of %s out of transactions_default.", name)
+    connection.execute(text("ALTER TABLE transactions DETACH PARTITION transactions_default"))
+    connection.execute(create)
+    connection.execute(
+        text(f"INSERT INTO {name} SELECT * FROM transactions_default WHERE {in_month}"), bounds
+    )
+    connection.execute(text(f"DELETE FROM transactions_default WHERE {in_month}"), bounds)
+    connection.execute(text("ALTER TABLE transactions ATTACH PARTITION transactions_default DEFAULT"))
+
+
+def create_partitions(months_ahead: int = 3) -> List[str]:
+    """Creates any missing partitions from the current month up to `months_ahead`,
+    each in its own transaction.
+
+    Returns:
+        List[str]: The names of the partitions that were created.
+    """
+
+    existing = set(list_partitions())
+    current = date.today().replace(day=1)
+    created = []
+    for offset in range(months_ahead + 1):
+        month = _add_months(current, offset)
+        name = _partition_name(month)
+        if name in existing:
+            continue
+        try:
+            with engine.begin() as connection:
+                _create_partition(connection, month)
+        except Exception:
+            logger.error("Creating %s failed; created so far: %s", name, created)
+            raise
+        created.append(name)
+    logger.info("Created transaction partitions: %s", created)
+    return created
+
+
+def _carry_opening_balances(connection, name: str) -> None:
+    """Adds each email's sum over the detached partition `name` to its opening balance."""
+
+    connection.execute(
+        text(
+            f"""
+            INSERT INTO account_balances (id, email, balance, opening_balance)
+            SELECT gen_random_uuid(), email, total, total
+            FROM (
+                SELECT email, SUM(CASE WHEN type = 'withdrawal' THEN -amount ELSE amount END) AS total
+                FROM {name}
+                GROUP BY email
+            ) AS detached
+            ON CONFLICT (email) DO UPDATE
+            SET opening_balance = account_balances.opening_balance + EXCLUDED.opening_balance
+            """
+        )
+    )
+
+
+def detach_partitions(before: date) -> List[str]:
+    """Detaches every monthly partition that ends on or before `before`,
+    carrying its sums over to the opening balances.
+
+    Returns:
+        List[str]: The names of the detached partitions.
+    """
+
+    cutoff = _partition_name(before.replace(day=1))
+    detached = []
+    with engine.begin() as connection:
+        for name in list_partitions():
+            if name >= cutoff:
+                break
+            connection.execute(text(f"ALTER TABLE transactions DETACH PARTITION {name}"))
+            _carry_opening_balances(connection, name)
+            detached.append(name)
+    logger.info("Detached transaction partitions: %s", detached)
+    return detached
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    create_parser = subparsers.add_parser("create")
+    create_parser.add_argument("--months-ahead", type=int, default=3)
+    detach_parser = subparsers.add_parser("detach")
+    detach_parser.add_argument("--before", required=True, help="First month to keep, as YYYY-MM")
+    args = parser.parse_args()
+
+    if args.command == "create":
+        create_partitions(months_ahead=args.months_ahead)
+    else:
+        detach_partitions(before=date.fromisoformat(f"{args.before}-01"))
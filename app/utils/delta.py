@@ -0,0 +1,33 @@
+"""Line deltas between two versions of a text.
+
+A delta is a JSON-serializable list of operations that rebuilds the new
+version from the old one: a `[start, end]` pair copies lines start to end
+of the old version, a string is new text. Lines keep their line endings,
+so applying a delta reproduces the new version exactly.
+"""
+
+from difflib import SequenceMatcher
+from typing import List, Union
+
+Delta = List[Union[List[int], str]]
+
+
+def make_delta(old: str, new: str) -> Delta:
+    """Returns the delta turning `old` into `new`."""
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    delta: Delta = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, old_lines, new_lines).get_opcodes():
+        if tag == "equal":
+            delta.append([i1, i2])
+        elif j2 > j1:
+            delta.append("".join(new_lines[j1:j2]))
+    return delta
+
+
+def apply_delta(old: str, delta: Delta) -> str:
+    """Returns the version `delta` was made for, from the version before it."""
+    old_lines = old.splitlines(keepends=True)
+    return "".join(
+        op if isinstance(op, str) else "".join(old_lines[op[0]:op[1]]) for op in delta
+    )
@@ -0,0 +1,10 @@
+import re
+
+# Primary keys are generated as canonical, lowercase uuid7 strings
+UUID7_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-7[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}")
+
+
+def is_uuid7(value: str) -> bool:
+    """Whether `value` has the form of a primary key; anything else matches
+    no row and can be rejected without a query."""
+    return UUID7_PATTERN.fullmatch(value) is not None
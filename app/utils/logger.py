@@ -1,22 +1,123 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import random
 import sys
-from logging.handlers import RotatingFileHandler
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+
+# Id of the request being handled, set by RequestIdMiddleware
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps records with the current request id.
+
+    Runs on the queue handler, i.e. in the caller's context, since the
+    listener thread cannot see the request's context variables.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get() or "-"
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps only a fraction of records below WARNING."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+            "process": record.process,
+        }
+        return json.dumps(entry, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class DrainingQueueListener(QueueListener):
+    """Queue listener whose stop() writes every queued record first.
+
+    The stop sentinel is queued with a blocking put, behind the pending
+    records (the listener thread frees room as it writes them), and stopping
+    a listener that is not running does nothing.
+    """
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            super().stop()
+
+
+# Listener of the application logger, set by setup_logger
+_listener: Optional[QueueListener] = None
+
+
+def flush_logs() -> None:
+    """Writes every queued record and stops the listener thread.
+
+    For processes that leave with os._exit(), which skips the atexit flush.
+    """
+    if _listener is not None:
+        _listener.stop()
+
 
 def setup_logger(log_dir: str = "logs") -> logging.Logger:
+    global _listener
+
     # Create logs directory if it doesn't exist
     Path(log_dir).mkdir(exist_ok=True)
-    
+
     # Configure the logger
     logger = logging.getLogger(__name__)
     logger.setLevel(logging.INFO)
-    
+
     # Log format
-    log_format = logging.Formatter(
-        "[%(asctime)s] - %(levelname)s: %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
-    
+    if settings.LOG_FORMAT == "json":
+        log_format = JSONFormatter()
+    else:
+        log_format = logging.Formatter(
+            "[%(asctime)s] - %(levelname)s [%(request_id)s]: %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S"
+        )
+
     # File handler with rotation (10MB max size, keep 5 backup files)
     file_handler = RotatingFileHandler(
         f"{log_dir}/app.log",
@@ -25,7 +126,7 @@ def setup_logger(log_dir: str = "logs") -> logging.Logger:
     )
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(log_format)
-    
+
     # Error file handler
     error_handler = RotatingFileHandler(
         f"{log_dir}/error.log",
@@ -34,23 +135,45 @@ def setup_logger(log_dir: str = "logs") -> logging.Logger:
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(log_format)
-    
+
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(log_format)
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(error_handler)
-    logger.addHandler(console_handler)
-    
+
+    # The logger itself only enqueues records; file and console writes (and
+    # rotation) happen on the listener's background thread, off the request path
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    queue_handler.addFilter(SamplingFilter(settings.LOG_INFO_SAMPLE_RATE))
+    logger.addHandler(queue_handler)
+
+    listener = _listener = DrainingQueueListener(
+        log_queue,
+        file_handler,
+        error_handler,
+        console_handler,
+        respect_handler_level=True,
+    )
+    listener.start()
+    # Flush whatever is still queued on exit. Around fork() the queue is
+    # drained first, so children do not write the parent's pending records
+    # again, and the writer thread, which children do not inherit, restarted
+    atexit.register(listener.stop)
+    os.register_at_fork(
+        before=listener.stop,
+        after_in_parent=listener.start,
+        after_in_child=listener.start,
+    )
+
     return logger
 
 logger = setup_logger()
 
-# Usage example:
+# Usage example (arguments are only formatted if the record is emitted):
 # logger.debug("Debug message")
-# logger.info("Info message")
+# logger.info("Created post %s", post.id)
 # logger.warning("Warning message")
 # logger.error("Error message")
-# logger.critical("Critical message")
\ No newline at end of file
+# logger.critical("Critical message")
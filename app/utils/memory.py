@@ -0,0 +1,157 @@
+"""tracemalloc snapshots and live object counts for memory diagnostics.
+
+State is per process: with several workers, each request reaches one of
+them, so every response includes the worker's pid.
+"""
+
+import gc
+import itertools
+import os
+import threading
+import tracemalloc
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+# Allocations made by tracemalloc itself and by the import machinery
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def _stat_location(traceback: tracemalloc.Traceback) -> dict:
+    frame = traceback[0]
+    return {
+        "file": frame.filename,
+        "line": frame.lineno,
+        "traceback": [f"{f.filename}:{f.lineno}" for f in traceback],
+    }
+
+
+class MemoryTracer:
+    """Starts and stops tracemalloc and keeps the most recent snapshots."""
+
+    def __init__(self, max_snapshots: int):
+        self.max_snapshots = max_snapshots
+        # id -> (taken at, snapshot, traced bytes)
+        self._snapshots: "OrderedDict[int, Tuple[datetime, tracemalloc.Snapshot, int]]" = (
+            OrderedDict()
+        )
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def status(self) -> dict:
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "pid": os.getpid(),
+            "tracing": tracemalloc.is_tracing(),
+            "traceback_limit": tracemalloc.get_traceback_limit(),
+            "traced_bytes": current,
+            "peak_traced_bytes": peak,
+            "snapshots": self.snapshots(),
+        }
+
+    def start(self, frames: int) -> dict:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        return self.status()
+
+    def stop(self) -> dict:
+        """Stops tracing; snapshots taken so far are kept."""
+        tracemalloc.stop()
+        return self.status()
+
+    def take_snapshot(self) -> dict:
+        if not tracemalloc.is_tracing():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="tracemalloc is not running",
+            )
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        traced_bytes = sum(trace.size for trace in snapshot.traces)
+        taken_at = datetime.now(timezone.utc)
+        with self._lock:
+            snapshot_id = next(self._ids)
+            self._snapshots[snapshot_id] = (taken_at, snapshot, traced_bytes)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return {
+            "id": snapshot_id,
+            "taken_at": taken_at.isoformat(),
+            "traced_bytes": traced_bytes,
+        }
+
+    def snapshots(self) -> List[dict]:
+        with self._lock:
+            entries = list(self._snapshots.items())
+        return [
+            {"id": snapshot_id, "taken_at": taken_at.isoformat(), "traced_bytes": traced_bytes}
+            for snapshot_id, (taken_at, _, traced_bytes) in entries
+        ]
+
+    def top(self, snapshot_id: int, group_by: str, limit: int) -> List[dict]:
+        """Largest allocation sites of a snapshot."""
+        _, snapshot, _ = self._get(snapshot_id)
+        return [
+            {**_stat_location(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+            for stat in snapshot.statistics(group_by)[:limit]
+        ]
+
+    def diff(self, snapshot_id: int, base_id: int, group_by: str, limit: int) -> List[dict]:
+        """Allocation sites that grew the most between two snapshots."""
+        _, snapshot, _ = self._get(snapshot_id)
+        _, base, _ = self._get(base_id)
+        return [
+            {
+                **_stat_location(stat.traceback),
+                "size_bytes": stat.size,
+                "size_diff_bytes": stat.size_diff,
+                "count": stat.count,
+                "count_diff": stat.count_diff,
+            }
+            for stat in snapshot.compare_to(base, group_by)[:limit]
+        ]
+
+    def _get(self, snapshot_id: int) -> Tuple[datetime, tracemalloc.Snapshot, int]:
+        with self._lock:
+            entry = self._snapshots.get(snapshot_id)
+        if entry is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Snapshot {snapshot_id} not found in worker {os.getpid()}",
+            )
+        return entry
+
+
+def count_objects(base: Optional[type] = None, limit: int = 50) -> dict:
+    """Live objects by type, walking everything tracked by the garbage
+    collector. Takes a while on large heaps, so it is only run on demand.
+
+    Args:
+        base (Optional[type]): Declarative base; instances of its mapped
+            classes are also counted separately.
+        limit (int): Number of most common types to return.
+    """
+    by_type: Counter = Counter()
+    orm: Counter = Counter()
+    for obj in gc.get_objects():
+        cls = type(obj)
+        by_type[cls.__qualname__] += 1
+        if base is not None and isinstance(obj, base):
+            orm[cls.__name__] += 1
+    return {
+        "pid": os.getpid(),
+        "gc_counts": list(gc.get_count()),
+        "orm_instances": dict(orm.most_common()),
+        "types": dict(by_type.most_common(limit)),
+    }
+
+
+memory_tracer = MemoryTracer(max_snapshots=settings.MEMORY_MAX_SNAPSHOTS)
@@ -0,0 +1,34 @@
+import base64
+from datetime import datetime
+from typing import Tuple
+
+from fastapi import HTTPException, status
+
+from app.utils.ids import is_uuid7
+
+
+def encode_cursor(created_at: datetime, id: str) -> str:
+    """Encodes a (created_at, id) keyset position as an opaque cursor string."""
+
+    raw = f"{created_at.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decodes a cursor produced by `encode_cursor`.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id = raw.split("|", 1)
+        if not is_uuid7(id):
+            raise ValueError(id)
+        return datetime.fromisoformat(created_at), id
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor.",
+        )
@@ -0,0 +1,242 @@
+"""Wall-clock sampling profiler for slow requests.
+
+While requests are in flight, a single background thread periodically
+samples, for each in-flight request, the stack of the thread running it:
+the threadpool worker while its sync endpoint runs (see `profiled_call`),
+otherwise the thread that started the request (the event loop). Requests
+slower than the configured threshold keep their profile; only the slowest
+few are retained.
+"""
+
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+
+# (file, first line, function name)
+FrameKey = Tuple[str, int, str]
+# (thread name, frames from the outermost call inwards)
+StackKey = Tuple[str, Tuple[FrameKey, ...]]
+
+T = TypeVar("T")
+
+
+class RequestProfile:
+    """Stack samples taken while one request was in flight."""
+
+    def __init__(self, method: str, path: str, request_id: Optional[str], max_samples: int):
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.request_id = request_id
+        self.started_at = datetime.now(timezone.utc)
+        self.duration = 0.0
+        self.sample_count = 0
+        self.max_samples = max_samples
+        self.samples: Counter = Counter()
+        # The thread running the request, sampled for its profile
+        self.thread_ident = threading.get_ident()
+
+    def add(self, stack: StackKey) -> None:
+        if self.sample_count >= self.max_samples:
+            return
+        self.sample_count += 1
+        self.samples[stack] += 1
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "request_id": self.request_id,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 3),
+            "samples": self.sample_count,
+        }
+
+
+# Profile of the request being served, set by ProfilerMiddleware
+current_profile_var: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "current_profile", default=None
+)
+
+
+def profiled_call(call: Callable[..., T]) -> Callable[..., T]:
+    """Wraps a sync endpoint so that, while it runs on a threadpool worker,
+    the profile of its request samples that worker instead of the event loop."""
+
+    @wraps(call)
+    def wrapper(*args, **kwargs) -> T:
+        profile = current_profile_var.get()
+        if profile is None:
+            return call(*args, **kwargs)
+        previous = profile.thread_ident
+        profile.thread_ident = threading.get_ident()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            profile.thread_ident = previous
+
+    return wrapper
+
+
+def _stack(frame) -> Tuple[FrameKey, ...]:
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append((code.co_filename, code.co_firstlineno, code.co_name))
+        frame = frame.f_back
+    frames.reverse()
+    return tuple(frames)
+
+
+class SlowRequestProfiler:
+    """Samples in-flight requests and keeps the slowest profiles."""
+
+    def __init__(self, interval: float, threshold: float, max_profiles: int, max_samples: int):
+        self.interval = interval
+        self.threshold = threshold
+        self.max_profiles = max_profiles
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._active: Dict[str, RequestProfile] = {}
+        # Set while any request is in flight; the sampler sleeps on it otherwise
+        self._busy = threading.Event()
+        # Min-heap of (duration, tiebreak, profile), slowest max_profiles kept
+        self._slowest: List[Tuple[float, int, RequestProfile]] = []
+        self._counter = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+
+    def start_request(self, method: str, path: str, request_id: Optional[str]) -> RequestProfile:
+        profile = RequestProfile(method, path, request_id, self.max_samples)
+        with self._lock:
+            self._active[profile.id] = profile
+            self._busy.set()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="slow-request-profiler", daemon=True
+                )
+                self._thread.start()
+        return profile
+
+    def finish_request(self, profile: RequestProfile, duration: float) -> None:
+        profile.duration = duration
+        with self._lock:
+            self._active.pop(profile.id, None)
+            if not self._active:
+                self._busy.clear()
+            if duration < self.threshold or not profile.sample_count:
+                return
+            entry = (duration, next(self._counter), profile)
+            if len(self._slowest) < self.max_profiles:
+                heapq.heappush(self._slowest, entry)
+            elif duration > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def profiles(self) -> List[RequestProfile]:
+        """Retained profiles, slowest first."""
+        with self._lock:
+            return [profile for _, _, profile in sorted(self._slowest, reverse=True)]
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        return next((p for p in self.profiles() if p.id == profile_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slowest.clear()
+
+    def _reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._active = {}
+        self._busy = threading.Event()
+        self._thread = None
+
+    def _sample(self, idents: set) -> Dict[int, StackKey]:
+        """Stacks of the given threads, by thread ident."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        return {
+            ident: (names.get(ident, str(ident)), _stack(frame))
+            for ident, frame in sys._current_frames().items()
+            if ident in idents
+        }
+
+    def _run(self) -> None:
+        while True:
+            self._busy.wait()
+            time.sleep(self.interval)
+            with self._lock:
+                active = [(profile, profile.thread_ident) for profile in self._active.values()]
+            if not active:
+                continue
+            stacks = self._sample({ident for _, ident in active})
+            for profile, ident in active:
+                if ident in stacks:
+                    profile.add(stacks[ident])
+
+
+def _frame_name(frame: FrameKey) -> str:
+    filename, line, name = frame
+    return f"{name} ({filename}:{line})"
+
+
+def to_collapsed(profile: RequestProfile) -> str:
+    """Folded stacks ("thread;outer;...;inner count"), as read by flamegraph.pl."""
+    lines = []
+    for (thread, frames), count in profile.samples.most_common():
+        stack = ";".join([thread, *(_frame_name(frame) for frame in frames)])
+        lines.append(f"{stack} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def to_speedscope(profile: RequestProfile, interval: float) -> dict:
+    """Speedscope sampled profile, one per thread, weights in milliseconds."""
+    frame_index: Dict[FrameKey, int] = {}
+    threads: Dict[str, dict] = {}
+    for (thread, frames), count in profile.samples.items():
+        indexes = [frame_index.setdefault(frame, len(frame_index)) for frame in frames]
+        samples = threads.setdefault(thread, {"samples": [], "weights": []})
+        samples["samples"].append(indexes)
+        samples["weights"].append(count * interval * 1000)
+
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": f"{profile.method} {profile.path} ({profile.duration * 1000:.0f} ms)",
+        "exporter": "simple-blog-api",
+        "shared": {
+            "frames": [
+                {"name": name, "file": filename, "line": line}
+                for filename, line, name in frame_index
+            ]
+        },
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": thread,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(samples["weights"]),
+                "samples": samples["samples"],
+                "weights": samples["weights"],
+            }
+            for thread, samples in threads.items()
+        ],
+    }
+
+
+slow_request_profiler = SlowRequestProfiler(
+    interval=settings.PROFILER_SAMPLE_INTERVAL_MS / 1000,
+    threshold=settings.PROFILER_SLOW_REQUEST_MS / 1000,
+    max_profiles=settings.PROFILER_MAX_PROFILES,
+    max_samples=settings.PROFILER_MAX_SAMPLES,
+)
+os.register_at_fork(after_in_child=slow_request_profiler._reset_after_fork)
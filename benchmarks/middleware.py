@@ -0,0 +1,113 @@
+"""Benchmark the /probe round trip through the middleware stack.
+
+Drives ASGI apps in-process (no server or client overhead) and compares a
+bare app serving /probe with the same app wrapped in the previous
+SessionMiddleware + Starlette CORSMiddleware pair, in the current opt-in
+session + precomputed CORS pair, and with the full application:
+
+    python -m benchmarks.middleware --repeat 20000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from starlette.middleware.cors import CORSMiddleware as StarletteCORSMiddleware
+from starlette.middleware.sessions import SessionMiddleware
+
+from app.main import app as application
+from app.core.config import settings
+from app.core.middleware.cors import CORSMiddleware
+from app.core.middleware.session import OptInSessionMiddleware
+
+CORS_OPTIONS = dict(allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+
+
+def bare_app() -> FastAPI:
+    bare = FastAPI(default_response_class=ORJSONResponse)
+
+    @bare.get("/probe")
+    async def probe():
+        return {"message": "I am the Python FastAPI API responding"}
+
+    return bare
+
+
+def make_scope(origin: bool) -> dict:
+    headers = [(b"host", b"testserver"), (b"user-agent", b"benchmark"), (b"accept", b"*/*")]
+    if origin:
+        headers.append((b"origin", b"https://example.com"))
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/probe",
+        "raw_path": b"/probe",
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+
+async def receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message: dict) -> None:
+    pass
+
+
+async def timed(app, origin: bool, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        scope = make_scope(origin)
+        started = time.perf_counter()
+        await app(scope, receive, send)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20_000)
+    args = parser.parse_args()
+
+    bare = bare_app()
+    stacks = {
+        "bare": bare,
+        "previous": SessionMiddleware(
+            StarletteCORSMiddleware(bare, **CORS_OPTIONS), secret_key=settings.SECRET_KEY
+        ),
+        "current": OptInSessionMiddleware(
+            CORSMiddleware(bare, **CORS_OPTIONS),
+            path_prefixes=settings.SESSION_PATH_PREFIXES,
+            secret_key=settings.SECRET_KEY,
+        ),
+        "full app": application,
+    }
+
+    for origin in (False, True):
+        print("with Origin header" if origin else "without Origin header")
+        baseline = None
+        for name, app in stacks.items():
+            # Warm up routing and middleware stack construction
+            await timed(app, origin, 100)
+            samples = sorted(await timed(app, origin, args.repeat))
+            median = statistics.median(samples)
+            p99 = samples[int(len(samples) * 0.99)]
+            baseline = baseline or median
+            print(
+                f"{name:>10}: median {median * 1e6:7.1f} us, p99 {p99 * 1e6:7.1f} us, "
+                f"overhead {(median - baseline) * 1e6:6.1f} us"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
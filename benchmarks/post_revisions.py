@@ -0,0 +1,114 @@
+"""Benchmark delta-compressed post revisions against full copies.
+
+Edits a synthetic long post a number of times, a few paragraphs per edit,
+stores its revisions the way `PostService` does for each snapshot interval
+(an interval of 1 stores every revision as a full copy), and prints the
+storage size and the median time to rebuild a random revision:
+
+    python -m benchmarks.post_revisions --paragraphs 200 --edits 500
+    python -m benchmarks.post_revisions --intervals 1 10 20 50
+
+Rebuild times only cover applying the deltas; the rows of one chain are
+loaded with a single indexed query whatever the interval.
+"""
+
+import argparse
+import random
+import statistics
+import string
+import time
+from typing import List, Tuple
+
+import orjson
+
+from app.utils.delta import apply_delta, make_delta
+
+
+def paragraph(size: int) -> str:
+    words = ("".join(random.choices(string.ascii_lowercase, k=random.randint(2, 9))) for _ in range(size))
+    return " ".join(words)[:size] + "\n"
+
+
+def edit(paragraphs: List[str], changes: int, size: int) -> None:
+    """Rewrites, inserts or removes `changes` random paragraphs in place."""
+    for _ in range(changes):
+        at = random.randrange(len(paragraphs))
+        action = random.random()
+        if action < 0.6:
+            paragraphs[at] = paragraph(size)
+        elif action < 0.8 or len(paragraphs) < 2:
+            paragraphs.insert(at, paragraph(size))
+        else:
+            del paragraphs[at]
+
+
+def store(versions: List[str], interval: int) -> List[Tuple[bool, object]]:
+    """The stored (snapshot, content or delta) of each version."""
+    stored = [(True, versions[0])]
+    last_snapshot = 0
+    for number in range(1, len(versions)):
+        delta = make_delta(versions[number - 1], versions[number])
+        if number - last_snapshot >= interval or len(orjson.dumps(delta)) >= len(
+            versions[number].encode()
+        ):
+            stored.append((True, versions[number]))
+            last_snapshot = number
+        else:
+            stored.append((False, delta))
+    return stored
+
+
+def rebuild(stored: List[Tuple[bool, object]], number: int) -> str:
+    start = number
+    while not stored[start][0]:
+        start -= 1
+    content = stored[start][1]
+    for _, delta in stored[start + 1:number + 1]:
+        content = apply_delta(content, delta)
+    return content
+
+
+def size(stored: List[Tuple[bool, object]]) -> int:
+    return sum(
+        len(value.encode()) if snapshot else len(orjson.dumps(value)) for snapshot, value in stored
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=100)
+    parser.add_argument("--paragraph-size", type=int, default=400)
+    parser.add_argument("--edits", type=int, default=200)
+    parser.add_argument("--changes-per-edit", type=int, default=3)
+    parser.add_argument("--intervals", type=int, nargs="+", default=[1, 5, 10, 20, 50])
+    parser.add_argument("--reads", type=int, default=500)
+    args = parser.parse_args()
+
+    paragraphs = [paragraph(args.paragraph_size) for _ in range(args.paragraphs)]
+    versions = ["".join(paragraphs)]
+    for _ in range(args.edits):
+        edit(paragraphs, args.changes_per_edit, args.paragraph_size)
+        versions.append("".join(paragraphs))
+    reads = [random.randrange(len(versions)) for _ in range(args.reads)]
+
+    print(f"{len(versions)} revisions of ~{len(versions[-1].encode()) / 1024:.0f}KB")
+    print(f"{'interval':>8} {'snapshots':>10} {'size':>10} {'ratio':>7} {'rebuild':>10} {'max':>10}")
+    full_size = sum(len(version.encode()) for version in versions)
+    for interval in args.intervals:
+        stored = store(versions, interval)
+        samples = []
+        for number in reads:
+            started = time.perf_counter()
+            content = rebuild(stored, number)
+            samples.append(time.perf_counter() - started)
+            assert content == versions[number]
+        stored_size = size(stored)
+        print(
+            f"{interval:>8} {sum(snapshot for snapshot, _ in stored):>10} "
+            f"{stored_size / 1024:>8.0f}KB {stored_size / full_size:>7.3f} "
+            f"{statistics.median(samples) * 1e6:>8.0f}us {max(samples) * 1e6:>8.0f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark per-request serialization of a PostListResponse with 1k items.
+
+Compares the previous path (build the Pydantic envelope, let FastAPI
+re-validate it against response_model, encode with the stdlib JSONResponse)
+with the current one (pass the to_dict() data straight to api_response):
+
+    python -m benchmarks.serialization --items 1000 --repeat 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timezone
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.v1.post import schemas
+from app.core.responses import api_response
+
+
+def make_items(count: int) -> list:
+    now = datetime.now(timezone.utc).isoformat()
+    return [
+        {
+            "id": f"0686f2a4-{index:04d}-7b1c-8000-6e2f51c0a9d3",
+            "title": f"Post {index}",
+            "content": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8,
+            "author_id": "0686f2a4-0000-7b1c-8000-6e2f51c0a9d3",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for index in range(count)
+    ]
+
+
+async def before(items: list, field) -> bytes:
+    model = schemas.PostListResponse(status_code=200, message="ok", data=items)
+    content = await serialize_response(field=field, response_content=model)
+    return JSONResponse(content=content).body
+
+
+async def after(items: list, field) -> bytes:
+    return api_response(status_code=200, message="ok", data=items).body
+
+
+async def timed(func, items: list, field, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await func(items, field)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+    field = create_model_field(name="Response_get_all_posts", type_=schemas.PostListResponse)
+    results = {}
+    for name, func in (("before", before), ("after", after)):
+        results[name] = await timed(func, items, field, args.repeat)
+        print(f"{name:>7}: {results[name] * 1000:8.3f} ms per response")
+    print(f"speedup: {results['before'] / results['after']:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+"""Benchmark vectorized vs SQL GROUP BY transaction stats.
+
+Runs both aggregation paths of TransactionAnalyticsService against the
+configured database for growing row limits and prints the median time of
+each, to pick TRANSACTION_STATS_VECTORIZED_MAX_ROWS for this deployment:
+
+    python -m benchmarks.transaction_stats --period day --repeat 5
+
+Use --seed N to first insert N synthetic transactions.
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.db.database import SessionLocal
+from app.api.models.transaction import Transaction
+from app.api.repositories.transaction import TransactionRepository
+from app.api.services.transaction_analytics import TransactionAnalyticsService
+
+
+def seed(db, rows: int, emails: int = 1_000, days: int = 365) -> None:
+    now = datetime.now(timezone.utc)
+    for offset in range(0, rows, 10_000):
+        db.bulk_insert_mappings(
+            Transaction,
+            [
+                {
+                    "email": f"user{random.randrange(emails)}@example.com",
+                    "amount": round(random.lognormvariate(3, 1), 2),
+                    "type": random.choice(("deposit", "withdrawal")),
+                    "created_at": now - timedelta(seconds=random.randrange(days * 86_400)),
+                }
+                for _ in range(min(10_000, rows - offset))
+            ],
+        )
+        db.commit()
+
+
+def timed(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--period", choices=("day", "week"), default="day")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    if args.seed:
+        seed(db, args.seed)
+
+    service = TransactionAnalyticsService(db)
+    total = TransactionRepository(db).count()
+    newest = datetime.now(timezone.utc)
+    print(f"{'rows':>10} {'vectorized':>12} {'sql':>12}")
+    for days in (1, 7, 30, 90, 365, None):
+        start = newest - timedelta(days=days) if days else None
+        rows = TransactionRepository(db).count(start=start)
+        vectorized = timed(lambda: service.vectorized_stats(args.period, start=start), args.repeat)
+        sql = timed(lambda: service.sql_stats(args.period, start=start), args.repeat)
+        print(f"{rows:>10} {vectorized * 1000:>10.1f}ms {sql * 1000:>10.1f}ms")
+        if rows == total:
+            break
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
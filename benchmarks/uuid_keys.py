@@ -0,0 +1,158 @@
+"""Benchmark text vs native UUID keys.
+
+Builds the same users/posts pair twice, once with VARCHAR ids (the schema
+before migration d7a4c2e9f813) and once with GUID ids, fills both with the
+same uuid7 ids and prints their index sizes and the median time of primary
+key lookups and of a posts-users join:
+
+    python -m benchmarks.uuid_keys --users 100000 --posts-per-user 5
+    python -m benchmarks.uuid_keys --url sqlite:///uuid_keys.db
+
+Runs against the configured database unless --url is given; the benchmark
+tables are dropped afterwards.
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Index,
+    MetaData,
+    String,
+    Table,
+    bindparam,
+    create_engine,
+    func,
+    select,
+    text,
+)
+from uuid_extensions import uuid7
+
+from app.db.database import engine as default_engine
+from app.db.types import GUID
+
+
+def build_tables(metadata: MetaData, name: str, id_type) -> tuple:
+    users = Table(
+        f"bench_{name}_users",
+        metadata,
+        Column("id", id_type, primary_key=True),
+        Column("username", String, nullable=False),
+    )
+    posts = Table(
+        f"bench_{name}_posts",
+        metadata,
+        Column("id", id_type, primary_key=True),
+        Column("author_id", id_type, ForeignKey(users.c.id), nullable=False),
+        Column("title", String, nullable=False),
+    )
+    Index(f"ix_bench_{name}_posts_author_id", posts.c.author_id)
+    return users, posts
+
+
+def seed(connection, users, posts, user_ids, post_ids) -> None:
+    for offset in range(0, len(user_ids), 10_000):
+        connection.execute(
+            users.insert(),
+            [{"id": id, "username": f"user{id}"} for id in user_ids[offset:offset + 10_000]],
+        )
+    for offset in range(0, len(post_ids), 10_000):
+        connection.execute(
+            posts.insert(),
+            [
+                {"id": id, "author_id": author_id, "title": "..."}
+                for id, author_id in post_ids[offset:offset + 10_000]
+            ],
+        )
+
+
+def index_bytes(connection, table: Table) -> int:
+    """Total size of the table's indexes."""
+    if connection.dialect.name == "postgresql":
+        return connection.execute(
+            text("SELECT pg_indexes_size(CAST(:table AS regclass))"), {"table": table.name}
+        ).scalar()
+    # SQLite: the primary key index is sqlite_autoindex_<table>_1
+    return connection.execute(
+        text(
+            "SELECT coalesce(sum(pgsize), 0) FROM dbstat WHERE name IN "
+            "(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table)"
+        ),
+        {"table": table.name},
+    ).scalar()
+
+
+def timed(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="database URL (default: the configured database)")
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--posts-per-user", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url) if args.url else default_engine
+    user_ids = [str(uuid7()) for _ in range(args.users)]
+    post_ids = [
+        (str(uuid7()), author_id) for author_id in user_ids for _ in range(args.posts_per_user)
+    ]
+    sample = random.sample(user_ids, min(args.lookups, len(user_ids)))
+
+    metadata = MetaData()
+    schemas = {
+        "text": build_tables(metadata, "text", String),
+        "guid": build_tables(metadata, "guid", GUID),
+    }
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    try:
+        # Both schemas are filled before either is measured, so that neither
+        # runs on a colder cache or a smaller file
+        for users, posts in schemas.values():
+            with engine.begin() as connection:
+                seed(connection, users, posts, user_ids, post_ids)
+            if engine.dialect.name == "postgresql":
+                with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                    connection.execute(text(f"VACUUM ANALYZE {users.name}, {posts.name}"))
+
+        print(f"{'ids':>6} {'user idx':>10} {'post idx':>10} {'lookup':>10} {'join':>10}")
+        for name, (users, posts) in schemas.items():
+            lookup_query = select(users.c.username).where(users.c.id == bindparam("id"))
+            join_query = (
+                select(func.count())
+                .select_from(posts.join(users, posts.c.author_id == users.c.id))
+                .where(users.c.id.in_(sample[:100]))
+            )
+            with engine.connect() as connection:
+                user_index = index_bytes(connection, users)
+                post_index = index_bytes(connection, posts)
+                lookup = timed(
+                    lambda: [
+                        connection.execute(lookup_query, {"id": id}).scalar() for id in sample
+                    ],
+                    args.repeat,
+                ) / len(sample)
+                join = timed(lambda: connection.execute(join_query).scalar(), args.repeat)
+            print(
+                f"{name:>6} {user_index / 1024:>8.0f}KB {post_index / 1024:>8.0f}KB "
+                f"{lookup * 1e6:>8.1f}us {join * 1000:>8.2f}ms"
+            )
+    finally:
+        metadata.drop_all(engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.db.database import Base, get_db
+from app.db.instrumentation import instrument_engine, track_queries
+
+
+@pytest.fixture
+def db_engine():
+    """In-memory SQLite engine with the application's tables."""
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    instrument_engine(engine)
+
+    # SQLite only enforces foreign keys, and ON DELETE CASCADE, when asked to
+    @event.listens_for(engine, "connect")
+    def enable_foreign_keys(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_client(db_engine):
+    """Test client whose requests use the SQLite engine."""
+    TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+
+    def override_get_db():
+        db = TestingSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def assert_max_queries():
+    """Fail if the block runs more than the given number of SQL statements.
+
+    Usage:
+        with assert_max_queries(2):
+            client.get("/api/v1/posts")
+    """
+
+    @contextmanager
+    def _assert_max_queries(limit: int):
+        with track_queries() as stats:
+            yield stats
+        assert stats.count <= limit, (
+            f"Expected at most {limit} queries, ran {stats.count}:\n"
+            + "\n".join(f"{count}x {statement}" for statement, count in stats.statements.items())
+        )
+
+    return _assert_max_queries
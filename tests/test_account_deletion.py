@@ -0,0 +1,86 @@
+from fastapi import status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.api.services.account_purge as account_purge
+from app.api.models.post import Post
+from app.api.models.tag import Tag, post_tags
+from app.api.repositories.post import PostRepository
+from app.api.models.user import User
+from app.core.config import settings
+from app.utils.jwt_helpers import create_jwt_token
+
+
+def _seed_author(engine, posts: int) -> dict:
+    """A user with `posts` posts, and the headers to authenticate as them."""
+    with Session(engine) as db:
+        user = User(username="author", email="author@example.com")
+        db.add(user)
+        db.flush()
+        db.add_all(Post(title=f"Post {i}", content="...", author_id=user.id) for i in range(posts))
+        db.commit()
+        user_id = user.id
+    return {"Authorization": f"Bearer {create_jwt_token('access', user_id)}"}
+
+
+def _counts(engine) -> tuple:
+    with Session(engine) as db:
+        return (
+            db.execute(select(func.count()).select_from(User)).scalar_one(),
+            db.execute(select(func.count()).select_from(Post)).scalar_one(),
+        )
+
+
+def test_small_account_is_deleted_with_its_posts(db_engine, db_client, assert_max_queries):
+    headers = _seed_author(db_engine, 3)
+
+    # Authentication, count, lookup and a single cascading DELETE; no post is loaded
+    with assert_max_queries(4):
+        response = db_client.delete("/api/v1/auth/user", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert _counts(db_engine) == (0, 0)
+
+
+def test_large_account_is_disabled_then_purged_in_chunks(db_engine, db_client, monkeypatch):
+    monkeypatch.setattr(settings, "ACCOUNT_PURGE_CHUNK_SIZE", 2)
+    submitted = []
+    monkeypatch.setattr(account_purge.account_purger, "submit", submitted.append)
+    headers = _seed_author(db_engine, 5)
+
+    response = db_client.delete("/api/v1/auth/user", headers=headers)
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert db_client.get("/api/v1/auth/user", headers=headers).status_code == status.HTTP_401_UNAUTHORIZED
+    assert _counts(db_engine) == (1, 5)
+
+    monkeypatch.setattr(account_purge, "SessionLocal", sessionmaker(bind=db_engine))
+    assert account_purge.purge_account(submitted[0], chunk_size=2) == 5
+    assert _counts(db_engine) == (0, 0)
+
+
+def test_purge_uncounts_tags_of_posts_left_for_the_cascade(db_engine, monkeypatch):
+    _seed_author(db_engine, 1)
+    with Session(db_engine) as db:
+        user_id = db.execute(select(User.id)).scalar_one()
+    delete_author_posts = PostRepository.delete_author_posts
+
+    def delete_then_race(self, author_id, limit):
+        count = delete_author_posts(self, author_id=author_id, limit=limit)
+        # A tagged post written concurrently after the last chunk
+        with Session(db_engine) as db:
+            post = Post(title="Late", content="...", author_id=author_id)
+            tag = Tag(name="python", post_count=1)
+            db.add_all([post, tag])
+            db.flush()
+            db.execute(post_tags.insert().values(tag_id=tag.id, post_id=post.id))
+            db.commit()
+        return count
+
+    monkeypatch.setattr(PostRepository, "delete_author_posts", delete_then_race)
+    monkeypatch.setattr(account_purge, "SessionLocal", sessionmaker(bind=db_engine))
+
+    assert account_purge.purge_account(user_id, chunk_size=2) == 1
+    assert _counts(db_engine) == (0, 0)
+    with Session(db_engine) as db:
+        assert db.execute(select(Tag.post_count)).scalar_one() == 0
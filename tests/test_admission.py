@@ -0,0 +1,42 @@
+import asyncio
+
+from fastapi import status
+
+from app.core import admission
+from app.core.admission import RouteLimiter
+
+
+def test_route_limiter_sheds_when_queue_is_full_or_too_slow():
+    async def scenario():
+        limiter = RouteLimiter("GET", "/test", max_concurrency=1, max_queue=1, queue_timeout=0.05)
+        assert await limiter.acquire() == ""
+
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queued == 1
+        assert await limiter.acquire() == "queue_full"
+        assert await queued == "queue_timeout"
+
+        limiter.release()
+        assert await limiter.acquire() == ""
+        assert limiter.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_routes_share_the_process_limit(db_client, monkeypatch):
+    limiter = RouteLimiter("*", "*", max_concurrency=1, max_queue=0, queue_timeout=0.05)
+    monkeypatch.setattr(admission, "process_limiter", limiter)
+
+    async def hold():
+        assert await limiter.acquire() == ""
+
+    # Another route's request holds the only slot
+    asyncio.run(hold())
+    response = db_client.get("/api/v1/posts")
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json()["reason"] == "queue_full"
+
+    limiter.release()
+    assert db_client.get("/api/v1/posts").status_code == status.HTTP_200_OK
+    assert limiter.in_flight == 0
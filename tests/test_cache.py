@@ -0,0 +1,23 @@
+import time
+
+from app.utils.cache import ByteSizeLRUCache, TTLCache
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+
+def test_byte_size_cache_evicts_least_recently_used():
+    cache = ByteSizeLRUCache(max_bytes=10)
+    cache.set("a", b"1234")
+    cache.set("b", b"1234")
+    cache.get("a")
+    cache.set("c", b"1234")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.size == 8
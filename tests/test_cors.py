@@ -0,0 +1,48 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.middleware.cors import CORSMiddleware as StarletteCORSMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.middleware.cors import CORSMiddleware
+
+CORS_OPTIONS = [
+    {"allow_origins": ["*"], "allow_credentials": True, "allow_methods": ["*"], "allow_headers": ["*"]},
+    {"allow_origins": ["https://example.com"], "allow_methods": ["GET"], "allow_headers": ["X-Token"]},
+]
+
+REQUESTS = [
+    ("GET", {}),
+    ("GET", {"Origin": "https://example.com"}),
+    ("GET", {"Origin": "https://other.com", "Cookie": "a=b"}),
+    ("OPTIONS", {"Origin": "https://example.com", "Access-Control-Request-Method": "GET"}),
+    (
+        "OPTIONS",
+        {
+            "Origin": "https://other.com",
+            "Access-Control-Request-Method": "PUT",
+            "Access-Control-Request-Headers": "X-Token, X-Other",
+        },
+    ),
+]
+
+CORS_HEADERS = ("access-control-", "vary")
+
+
+def _client(middleware, options) -> TestClient:
+    app = Starlette(routes=[Route("/", lambda request: PlainTextResponse("ok"))])
+    return TestClient(middleware(app, **options))
+
+
+@pytest.mark.parametrize("options", CORS_OPTIONS)
+@pytest.mark.parametrize("method,headers", REQUESTS)
+def test_matches_starlette_cors(options, method, headers):
+    expected = _client(StarletteCORSMiddleware, options).request(method, "/", headers=headers)
+    actual = _client(CORSMiddleware, options).request(method, "/", headers=headers)
+
+    assert actual.status_code == expected.status_code
+    assert actual.text == expected.text
+    for name in {*expected.headers, *actual.headers}:
+        if name.startswith(CORS_HEADERS):
+            assert actual.headers.get(name) == expected.headers.get(name), name
@@ -0,0 +1,23 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from uuid_extensions import uuid7
+
+from app.api.models.post import Post
+from app.api.models.user import User
+
+
+def test_ids_are_stored_as_bytes_and_read_as_strings(db_engine):
+    user_id = str(uuid7())
+    with Session(db_engine) as db:
+        db.add(User(id=user_id, username="author", email="author@example.com"))
+        db.add(Post(title="Post", content="...", author_id=user_id))
+        db.commit()
+
+        post = db.query(Post).filter(Post.author_id == user_id).one()
+        assert post.author_id == user_id
+        assert post.author.id == user_id
+
+        with db_engine.connect() as connection:
+            stored = connection.execute(text("SELECT id, author_id FROM posts")).one()
+    assert stored.author_id == bytes.fromhex(user_id.replace("-", ""))
+    assert len(stored.id) == 16
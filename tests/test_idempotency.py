@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.api.models.idempotency_key import IdempotencyKey
+from app.api.models.transaction import Transaction
+from app.api.services.idempotency import response_cache
+from app.core.config import settings
+
+DEPOSIT = {"email": "user@example.com", "amount": 10.0, "type": "deposit"}
+
+
+def _transactions(engine) -> int:
+    with Session(engine) as db:
+        return db.execute(select(func.count()).select_from(Transaction)).scalar_one()
+
+
+def test_retry_with_same_key_replays_the_response(db_engine, db_client):
+    response_cache.clear()
+    headers = {"Idempotency-Key": "replay"}
+
+    first = db_client.post("/api/v1/transaction", json=DEPOSIT, headers=headers)
+    retry = db_client.post("/api/v1/transaction", json=DEPOSIT, headers=headers)
+    # Also from the database, as another worker would
+    response_cache.clear()
+    stored = db_client.post("/api/v1/transaction", json=DEPOSIT, headers=headers)
+
+    assert first.status_code == status.HTTP_201_CREATED
+    assert "Idempotent-Replayed" not in first.headers
+    for replay in (retry, stored):
+        assert replay.status_code == status.HTTP_201_CREATED
+        assert replay.headers["Idempotent-Replayed"] == "true"
+        assert replay.json()["data"] == first.json()["data"]
+    assert _transactions(db_engine) == 1
+
+
+def test_key_reused_with_another_body_is_rejected(db_engine, db_client):
+    response_cache.clear()
+    headers = {"Idempotency-Key": "conflict"}
+
+    db_client.post("/api/v1/transaction", json=DEPOSIT, headers=headers)
+    response = db_client.post(
+        "/api/v1/transaction", json={**DEPOSIT, "amount": 20.0}, headers=headers
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert _transactions(db_engine) == 1
+
+
+def test_key_in_progress_elsewhere_is_not_run_again(db_engine, db_client, monkeypatch):
+    response_cache.clear()
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_TIMEOUT", 0.1)
+    now = datetime.now(timezone.utc)
+    with Session(db_engine) as db:
+        # Claimed by a request still running in another worker
+        db.add(
+            IdempotencyKey(
+                key="in-progress",
+                request_hash="...",
+                locked_at=now,
+                expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+            )
+        )
+        db.commit()
+
+    response = db_client.post(
+        "/api/v1/transaction", json=DEPOSIT, headers={"Idempotency-Key": "in-progress"}
+    )
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert _transactions(db_engine) == 0
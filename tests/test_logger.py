@@ -0,0 +1,65 @@
+import json
+import logging
+import queue
+
+from app.utils.logger import (
+    DrainingQueueListener,
+    JSONFormatter,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+)
+
+
+def _record(level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 1, "Created post %s", ("p1",), None)
+
+
+def test_full_queue_drops_records_and_counts_them():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+
+    for _ in range(5):
+        handler.handle(_record())
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_sampling_keeps_warnings_and_a_fraction_of_info(monkeypatch):
+    sampling = SamplingFilter(rate=0.25)
+    monkeypatch.setattr("app.utils.logger.random.random", iter([0.1, 0.5]).__next__)
+
+    assert sampling.filter(_record())
+    assert not sampling.filter(_record())
+    assert sampling.filter(_record(logging.WARNING))
+    assert SamplingFilter(rate=1.0).filter(_record())
+
+
+def test_json_formatter_writes_one_object_per_record():
+    record = _record()
+    record.request_id = "req-1"
+
+    entry = json.loads(JSONFormatter().format(record))
+
+    assert entry["level"] == "INFO"
+    assert entry["message"] == "Created post p1"
+    assert entry["request_id"] == "req-1"
+    assert entry["time"].endswith("+00:00")
+
+
+def test_stopping_a_full_queue_writes_every_record():
+    written = []
+
+    class Collect(logging.Handler):
+        def emit(self, record):
+            written.append(record)
+
+    log_queue = queue.Queue(maxsize=2)
+    listener = DrainingQueueListener(log_queue, Collect())
+    for _ in range(2):
+        log_queue.put(_record())
+
+    listener.start()
+    listener.stop()
+    listener.stop()
+
+    assert len(written) == 2
@@ -0,0 +1,17 @@
+from app.utils.memory import MemoryTracer
+
+
+def test_snapshot_diff_reports_growth():
+    tracer = MemoryTracer(max_snapshots=2)
+    tracer.start(frames=1)
+    try:
+        base = tracer.take_snapshot()
+        retained = [bytearray(1024) for _ in range(1000)]
+        later = tracer.take_snapshot()
+        diff = tracer.diff(later["id"], base["id"], group_by="lineno", limit=1)
+    finally:
+        tracer.stop()
+
+    assert diff[0]["file"] == __file__
+    assert diff[0]["size_diff_bytes"] >= 1024 * 1000
+    assert len(retained) == 1000
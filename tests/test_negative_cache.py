@@ -0,0 +1,36 @@
+from fastapi import status
+from uuid_extensions import uuid7
+
+from app.api.services.transaction import missing_transaction_cache
+from app.utils.ids import is_uuid7
+
+
+def test_is_uuid7():
+    assert is_uuid7(str(uuid7()))
+    assert not is_uuid7(str(uuid7()).upper())
+    assert not is_uuid7("00000000-0000-0000-0000-000000000000")
+    assert not is_uuid7("1; DROP TABLE transactions")
+
+
+def test_missing_transaction_lookups_skip_the_database(db_client, assert_max_queries, monkeypatch):
+    transaction_id = str(uuid7())
+    missing_transaction_cache.clear()
+
+    with assert_max_queries(0):
+        response = db_client.get("/api/v1/transaction/not-a-uuid")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    with assert_max_queries(1):
+        response = db_client.get(f"/api/v1/transaction/{transaction_id}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    with assert_max_queries(0):
+        response = db_client.get(f"/api/v1/transaction/{transaction_id}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    # Misses are only remembered for the TTL
+    monkeypatch.setattr(missing_transaction_cache, "ttl", 0)
+    missing_transaction_cache.clear()
+    for _ in range(2):
+        with assert_max_queries(1) as stats:
+            db_client.get(f"/api/v1/transaction/{transaction_id}")
+        assert stats.count == 1
@@ -0,0 +1,61 @@
+from fastapi import status
+from sqlalchemy.orm import Session
+from uuid_extensions import uuid7
+
+from app.api.models.post import Post
+from app.api.models.user import User
+from app.api.services.post import missing_post_cache
+from app.core.config import settings
+from app.utils.jwt_helpers import create_jwt_token
+
+
+def _seed(engine) -> tuple:
+    """Three posts by one author and one by another; the first author's headers."""
+    with Session(engine) as db:
+        author = User(username="author", email="author@example.com")
+        other = User(username="other", email="other@example.com")
+        db.add_all([author, other])
+        db.flush()
+        posts = [Post(title=f"Post {i}", content="...", author_id=author.id) for i in range(3)]
+        posts.append(Post(title="Other", content="...", author_id=other.id))
+        db.add_all(posts)
+        db.commit()
+        headers = {"Authorization": f"Bearer {create_jwt_token('access', author.id)}"}
+        return headers, [post.id for post in posts]
+
+
+def test_batch_returns_posts_in_request_order(db_engine, db_client, assert_max_queries):
+    missing_post_cache.clear()
+    headers, (first, second, _, others) = _seed(db_engine)
+    ids = [second, str(uuid7()), others, first, "not-a-uuid", second]
+
+    # Authentication, then one IN query
+    with assert_max_queries(2):
+        response = db_client.get(f"/api/v1/posts/batch?ids={','.join(ids)}", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()["data"]
+    assert [(item["id"], item["found"]) for item in data] == [
+        (second, True),
+        (ids[1], False),
+        (others, False),
+        (first, True),
+        ("not-a-uuid", False),
+        (second, True),
+    ]
+    assert data[0]["post"]["title"] == "Post 1"
+    assert data[1]["post"] is None
+
+    # Known missing IDs are not looked up again
+    with assert_max_queries(1):
+        response = db_client.post("/api/v1/posts/batch", json={"ids": ids[1:3]}, headers=headers)
+    assert [item["found"] for item in response.json()["data"]] == [False, False]
+
+
+def test_batch_size_is_limited(db_client, db_engine, monkeypatch):
+    monkeypatch.setattr(settings, "POST_BATCH_MAX_IDS", 2)
+    headers, ids = _seed(db_engine)
+
+    response = db_client.post("/api/v1/posts/batch", json={"ids": ids[:3]}, headers=headers)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,100 @@
+from fastapi import status
+from sqlalchemy.orm import Session
+
+from app.api.models.post import Post
+from app.api.models.user import User
+from app.api.services.post import PostService
+from app.api.v1.post.schemas import UpdatePostRequest
+from app.core.config import settings
+from app.utils.delta import apply_delta, make_delta
+from app.utils.jwt_helpers import create_jwt_token
+
+
+def test_delta_round_trip():
+    old = "first\nsecond\r\nthird\n\nfifth"
+    new = "first\nsecond, edited\r\nthird\n\nfifth\nsixth\n"
+
+    delta = make_delta(old, new)
+
+    assert apply_delta(old, delta) == new
+    assert [0, 1] in delta
+    assert apply_delta(new, make_delta(new, "")) == ""
+
+
+def test_revisions_are_rebuilt_from_snapshots_and_deltas(db_engine, db_client, monkeypatch):
+    monkeypatch.setattr(settings, "POST_REVISION_SNAPSHOT_INTERVAL", 3)
+    with Session(db_engine) as db:
+        user = User(username="author", email="author@example.com")
+        db.add(user)
+        db.commit()
+        headers = {"Authorization": f"Bearer {create_jwt_token('access', user.id)}"}
+
+    paragraphs = [f"Paragraph {i} of a long post.\n" for i in range(50)]
+    versions = ["".join(paragraphs)]
+    post_id = db_client.post(
+        "/api/v1/posts", json={"title": "v1", "content": versions[0]}, headers=headers
+    ).json()["data"]["id"]
+    assert db_client.get(f"/api/v1/posts/{post_id}/revisions", headers=headers).json()["data"] == []
+
+    for i in range(1, 6):
+        paragraphs[i * 7] = f"Paragraph {i * 7}, edited in version {i + 1}.\n"
+        versions.append("".join(paragraphs))
+        db_client.put(
+            f"/api/v1/posts/{post_id}",
+            json={"title": f"v{i + 1}", "content": versions[-1]},
+            headers=headers,
+        )
+    # Tag-only edits do not add a revision
+    db_client.put(f"/api/v1/posts/{post_id}", json={"tags": ["python"]}, headers=headers)
+
+    response = db_client.get(f"/api/v1/posts/{post_id}/revisions", headers=headers)
+    revisions = response.json()["data"]
+    assert [(r["number"], r["title"], r["snapshot"]) for r in revisions] == [
+        (1, "v1", True),
+        (2, "v2", False),
+        (3, "v3", False),
+        (4, "v4", True),
+        (5, "v5", False),
+        (6, "v6", False),
+    ]
+
+    for number, content in enumerate(versions, start=1):
+        response = db_client.get(f"/api/v1/posts/{post_id}/revisions/{number}", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"]["content"] == content
+        assert response.json()["data"]["title"] == f"v{number}"
+
+    response = db_client.get(f"/api/v1/posts/{post_id}/revisions/7", headers=headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_interleaved_edits_build_deltas_from_the_latest_content(db_engine, db_client, monkeypatch):
+    monkeypatch.setattr(settings, "POST_REVISION_SNAPSHOT_INTERVAL", 100)
+    with Session(db_engine) as db:
+        user = User(username="author", email="author@example.com")
+        db.add(user)
+        db.commit()
+        headers = {"Authorization": f"Bearer {create_jwt_token('access', user.id)}"}
+
+    versions = ["".join(f"Line {i}\n" for i in range(20))]
+    post_id = db_client.post(
+        "/api/v1/posts", json={"title": "v1", "content": versions[0]}, headers=headers
+    ).json()["data"]["id"]
+
+    first, second = Session(db_engine), Session(db_engine)
+    try:
+        # Both requests have read the post before either one saves its edit;
+        # the copies are kept referenced so each session's identity map holds one
+        _stale = [db.get(Post, post_id) for db in (first, second)]
+        for number, db in enumerate((first, second, first, second), start=2):
+            versions.append(f"Inserted in v{number}\n" + versions[-1])
+            update = UpdatePostRequest(title=f"v{number}", content=versions[-1])
+            author = db.get(User, user.id)
+            PostService(db).update_post(post_id, update, author)
+    finally:
+        first.close()
+        second.close()
+
+    for number, content in enumerate(versions, start=1):
+        response = db_client.get(f"/api/v1/posts/{post_id}/revisions/{number}", headers=headers)
+        assert response.json()["data"]["content"] == content
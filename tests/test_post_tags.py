@@ -0,0 +1,77 @@
+from fastapi import status
+from sqlalchemy.orm import Session
+
+from app.api.models.tag import Tag
+from app.api.models.user import User
+from app.utils.jwt_helpers import create_jwt_token
+
+
+def _author_headers(engine) -> dict:
+    with Session(engine) as db:
+        user = User(username="author", email="author@example.com")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    return {"Authorization": f"Bearer {create_jwt_token('access', user_id)}"}
+
+
+def _post_counts(engine) -> dict:
+    with Session(engine) as db:
+        return {tag.name: tag.post_count for tag in db.query(Tag).all()}
+
+
+def _titles(response) -> set:
+    assert response.status_code == status.HTTP_200_OK
+    return {post["title"] for post in response.json()["data"]}
+
+
+def test_tag_filters_intersect_postings(db_engine, db_client, assert_max_queries):
+    headers = _author_headers(db_engine)
+    for title, tags in [("a", ["python", "web"]), ("b", ["python"]), ("c", ["web", "rust"])]:
+        response = db_client.post(
+            "/api/v1/posts", json={"title": title, "content": "...", "tags": tags}, headers=headers
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["data"]["tags"] == ["rust", "web"]
+    assert _post_counts(db_engine) == {"python": 2, "web": 2, "rust": 1}
+
+    # The tag lookup, then the posts with their tags
+    with assert_max_queries(2):
+        response = db_client.get("/api/v1/posts?tag=python&tag=web")
+    assert _titles(response) == {"a"}
+    assert response.json()["data"][0]["tags"] == ["python", "web"]
+    assert _titles(db_client.get("/api/v1/posts?tag=web")) == {"a", "c"}
+    with assert_max_queries(1):
+        assert _titles(db_client.get("/api/v1/posts?tag=python&tag=missing")) == set()
+
+    author_id = response.json()["data"][0]["author_id"]
+    response = db_client.get(f"/api/v1/posts/author/{author_id}?tag=rust", headers=headers)
+    assert _titles(response) == {"c"}
+
+
+def test_post_counts_follow_updates_and_deletes(db_engine, db_client):
+    headers = _author_headers(db_engine)
+    post_ids = [
+        db_client.post(
+            "/api/v1/posts", json={"title": "a", "content": "...", "tags": tags}, headers=headers
+        ).json()["data"]["id"]
+        for tags in (["python", "web"], ["python"])
+    ]
+
+    response = db_client.put(
+        f"/api/v1/posts/{post_ids[0]}", json={"tags": ["web", "rust"]}, headers=headers
+    )
+    assert response.json()["data"]["tags"] == ["rust", "web"]
+    assert _post_counts(db_engine) == {"python": 1, "web": 1, "rust": 1}
+
+    db_client.delete(f"/api/v1/posts/{post_ids[1]}", headers=headers)
+    assert _post_counts(db_engine) == {"python": 0, "web": 1, "rust": 1}
+
+    response = db_client.get("/api/v1/posts/tags?limit=2")
+    assert response.json()["data"] == [
+        {"name": "rust", "post_count": 1},
+        {"name": "web", "post_count": 1},
+    ]
+
+    db_client.delete("/api/v1/auth/user", headers=headers)
+    assert _post_counts(db_engine) == {"python": 0, "web": 0, "rust": 0}
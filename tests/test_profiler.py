@@ -0,0 +1,70 @@
+import contextvars
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.utils.profiler import (
+    SlowRequestProfiler,
+    current_profile_var,
+    profiled_call,
+    to_collapsed,
+    to_speedscope,
+)
+
+
+def _busy_wait(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_slow_request_profile_captures_busy_stack():
+    profiler = SlowRequestProfiler(interval=0.001, threshold=0.01, max_profiles=1, max_samples=1000)
+
+    fast = profiler.start_request("GET", "/fast", None)
+    profiler.finish_request(fast, 0.001)
+    slow = profiler.start_request("GET", "/slow", "req-1")
+    _busy_wait(0.1)
+    profiler.finish_request(slow, 0.1)
+
+    assert profiler.profiles() == [slow]
+    assert "_busy_wait" in to_collapsed(slow)
+    speedscope = to_speedscope(slow, interval=0.001)
+    assert any(frame["name"] == "_busy_wait" for frame in speedscope["shared"]["frames"])
+
+
+def _spin(seconds: float) -> None:
+    _busy_wait(seconds)
+
+
+def test_concurrent_requests_sample_only_their_own_thread():
+    profiler = SlowRequestProfiler(interval=0.001, threshold=0.01, max_profiles=2, max_samples=1000)
+    endpoints = {"/busy": profiled_call(_busy_wait), "/spin": profiled_call(_spin)}
+
+    def serve(path: str):
+        # Started on this thread, like the event loop; the endpoint runs on a worker
+        profile = profiler.start_request("GET", path, None)
+        current_profile_var.set(profile)
+        context = contextvars.copy_context()
+        return profile, pool.submit(context.run, endpoints[path], 0.1)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        requests = [serve("/busy"), serve("/spin")]
+        for profile, future in requests:
+            future.result()
+            profiler.finish_request(profile, 0.1)
+
+    busy, spin = (to_collapsed(profile) for profile, _ in requests)
+    assert "_busy_wait" in busy and "_spin" not in busy
+    assert "_spin" in spin
+
+
+def test_sampler_waits_while_no_request_is_in_flight():
+    profiler = SlowRequestProfiler(interval=0.001, threshold=0.01, max_profiles=1, max_samples=1000)
+    profiler.finish_request(profiler.start_request("GET", "/fast", None), 0.001)
+    time.sleep(0.05)
+
+    # Parked on the event rather than waking up every interval
+    frame = sys._current_frames()[profiler._thread.ident]
+    assert (frame.f_code.co_name, os.path.basename(frame.f_code.co_filename)) == ("wait", "threading.py")
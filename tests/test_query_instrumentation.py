@@ -0,0 +1,52 @@
+import pytest
+from fastapi import status
+from sqlalchemy.orm import Session
+
+from app.api.models.post import Post
+from app.api.models.user import User
+from app.core.config import settings
+from app.db.instrumentation import NPlusOneError, QueryStats, query_stats_var, statement_shape
+
+
+def _seed_posts(engine, count: int) -> None:
+    """One post each by `count` different authors."""
+    with Session(engine) as db:
+        for i in range(count):
+            user = User(username=f"author{i}", email=f"author{i}@example.com")
+            db.add(user)
+            db.flush()
+            db.add(Post(title=f"Post {i}", content="...", author_id=user.id))
+        db.commit()
+
+
+def test_list_posts_runs_a_single_query(db_engine, db_client, assert_max_queries):
+    _seed_posts(db_engine, 5)
+
+    with assert_max_queries(1):
+        response = db_client.get("/api/v1/posts")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["data"]) == 5
+
+
+def test_statement_shape_collapses_in_lists():
+    assert statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?)") == statement_shape(
+        "SELECT *\n FROM t WHERE id IN (?, ?)"
+    )
+
+
+def test_repeated_statement_raises_in_raise_mode(db_engine, monkeypatch):
+    monkeypatch.setattr(settings, "SQL_N_PLUS_ONE_MODE", "raise")
+    monkeypatch.setattr(settings, "SQL_N_PLUS_ONE_THRESHOLD", 3)
+    _seed_posts(db_engine, 5)
+
+    token = query_stats_var.set(QueryStats())
+    try:
+        with Session(db_engine) as db:
+            posts = db.query(Post).all()
+            with pytest.raises(NPlusOneError):
+                for post in posts:
+                    # Post.__str__ lazily loads the author
+                    str(post)
+    finally:
+        query_stats_var.reset(token)
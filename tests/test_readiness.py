@@ -0,0 +1,41 @@
+import logging
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+import app.core.warmup as warmup
+import app.main as main
+from app.db.health import DatabaseHealthCheck
+
+
+def test_ready_follows_the_latest_health_check(db_engine, db_client, monkeypatch):
+    health = DatabaseHealthCheck(db_engine, interval=60)
+    monkeypatch.setattr(main, "database_health", health)
+
+    # Not checked yet
+    assert db_client.get("/ready").status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    assert health.check()
+    response = db_client.get("/ready")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["database"]["healthy"] is True
+
+    health.engine = create_engine("sqlite:////nonexistent/directory/db.sqlite")
+    assert not health.check()
+    response = db_client.get("/ready")
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json()["database"]["error"] == "OperationalError"
+
+
+def test_failed_warm_up_is_logged_and_startup_continues(db_engine, monkeypatch, caplog):
+    def unreachable(connections: int) -> int:
+        raise ConnectionError("database unreachable")
+
+    monkeypatch.setattr(warmup, "warm_pool", unreachable)
+    monkeypatch.setattr(main, "database_health", DatabaseHealthCheck(db_engine, interval=60))
+
+    with caplog.at_level(logging.ERROR), TestClient(main.app) as client:
+        assert client.get("/").status_code == status.HTTP_200_OK
+
+    assert "Database warm-up failed: database unreachable" in caplog.text
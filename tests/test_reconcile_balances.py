@@ -0,0 +1,71 @@
+from fastapi import status
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.scripts.reconcile_balances as reconcile_balances
+from app.api.models.balance import AccountBalance
+from app.api.models.transaction import Transaction
+
+
+def test_balance_is_updated_with_each_transaction(db_client):
+    for amount, type in ((10.0, "deposit"), (4.0, "withdrawal"), (2.5, "deposit")):
+        response = db_client.post(
+            "/api/v1/transaction",
+            json={"email": "user@example.com", "amount": amount, "type": type},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+    response = db_client.get("/api/v1/transaction/balance/user@example.com")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"]["balance"] == 8.5
+
+
+def test_reconcile_corrects_drifted_balances(db_engine, monkeypatch):
+    with Session(db_engine) as db:
+        for email in ("exact@example.com", "drifted@example.com", "missing@example.com"):
+            db.add_all(
+                Transaction(email=email, amount=amount, type="deposit") for amount in (1.0, 2.0)
+            )
+        db.add(AccountBalance(email="exact@example.com", balance=3.0))
+        db.add(AccountBalance(email="drifted@example.com", balance=2.0))
+        db.commit()
+    monkeypatch.setattr(reconcile_balances, "SessionLocal", sessionmaker(bind=db_engine))
+
+    assert reconcile_balances.reconcile(batch_size=2) == 2
+
+    with Session(db_engine) as db:
+        balances = {balance.email: balance.balance for balance in db.query(AccountBalance)}
+    assert balances == {
+        "exact@example.com": 3.0,
+        "drifted@example.com": 3.0,
+        "missing@example.com": 3.0,
+    }
+
+
+def test_only_real_drift_is_corrected(db_engine, monkeypatch):
+    with Session(db_engine) as db:
+        for email in ("exact@example.com", "drifted@example.com"):
+            db.add_all(
+                Transaction(email=email, amount=amount, type="deposit") for amount in (0.1, 0.2, 0.3)
+            )
+        # Incremental sums may differ from SUM() in the last bits
+        db.add(AccountBalance(email="exact@example.com", balance=0.6 + 1e-15))
+        db.add(AccountBalance(email="drifted@example.com", balance=0.5))
+        db.commit()
+    monkeypatch.setattr(reconcile_balances, "SessionLocal", sessionmaker(bind=db_engine))
+
+    assert reconcile_balances.reconcile() == 1
+
+    with Session(db_engine) as db:
+        balance = db.query(AccountBalance).filter_by(email="drifted@example.com").one().balance
+    assert abs(balance - 0.6) < 1e-9
+
+
+def test_opening_balance_of_detached_months_is_kept(db_engine, monkeypatch):
+    with Session(db_engine) as db:
+        db.add(Transaction(email="old@example.com", amount=5.0, type="deposit"))
+        db.add(AccountBalance(email="old@example.com", balance=15.0, opening_balance=10.0))
+        db.commit()
+    monkeypatch.setattr(reconcile_balances, "SessionLocal", sessionmaker(bind=db_engine))
+
+    assert reconcile_balances.reconcile() == 0
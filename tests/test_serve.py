@@ -0,0 +1,40 @@
+import subprocess
+
+from app.scripts import serve
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2500 |       9000 | app.core.config
+import time:       300 |        300 |     typing_extensions
+import time:      4000 |      30000 | app.main
+"""
+
+
+def test_import_report_parses_importtime_slowest_first(monkeypatch):
+    def run(args, **kwargs):
+        assert args[1:] == ["-X", "importtime", "-c", "import app.main"]
+        return subprocess.CompletedProcess(args, 0, stdout="", stderr=IMPORTTIME)
+
+    monkeypatch.setattr(serve.subprocess, "run", run)
+
+    assert serve.import_report("app.main", 2) == [
+        (30000, 4000, "app.main"),
+        (9000, 2500, "app.core.config"),
+    ]
+
+
+def test_default_workers(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    assert serve.default_workers() == 3
+
+    monkeypatch.delenv("WEB_CONCURRENCY")
+    monkeypatch.setattr(serve.os, "sched_getaffinity", lambda pid: {0, 1}, raising=False)
+    assert serve.default_workers() == 2
+
+
+def test_restart_delay_grows_with_fast_failures():
+    assert serve.restart_delay(0) == serve.MIN_RESTART_DELAY
+    assert serve.restart_delay(1) == serve.MIN_RESTART_DELAY
+    assert serve.restart_delay(3) == 4 * serve.MIN_RESTART_DELAY
+    assert serve.restart_delay(100) == serve.MAX_RESTART_DELAY
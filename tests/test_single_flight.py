@@ -0,0 +1,53 @@
+import asyncio
+
+from fastapi import Response
+
+from app.core.single_flight import SingleFlight, replay_response, snapshot_response
+
+
+def test_concurrent_calls_share_one_result_and_exceptions():
+    async def scenario():
+        flight = SingleFlight()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(flight.do("key", compute) for _ in range(5)))
+        assert calls == 1
+        assert [shared for _, shared in results] == [False, True, True, True, True]
+        assert {value for value, _ in results} == {1}
+        assert len(flight) == 0
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            *(flight.do("key", fail) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+
+        # A cancelled leader hands over to a waiting caller
+        leader = asyncio.ensure_future(flight.do("key", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("key", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        value, shared = await follower
+        assert not shared and value == calls == 3
+
+    asyncio.run(scenario())
+
+
+def test_replayed_response_does_not_share_header_list():
+    response = Response(content=b'{"ok":true}', status_code=200, media_type="application/json")
+    replay = replay_response(snapshot_response(response))
+    replay.raw_headers.append((b"x-request-id", b"abc"))
+
+    assert replay.body == response.body
+    assert (b"x-request-id", b"abc") not in response.raw_headers
+    assert replay.raw_headers[:-1] == response.raw_headers
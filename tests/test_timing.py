@@ -0,0 +1,59 @@
+from fastapi import status
+from prometheus_client import REGISTRY
+from sqlalchemy.orm import Session
+
+from app.api.models.user import User
+from app.core.config import settings
+from app.utils.jwt_helpers import create_jwt_token
+
+
+def _headers(engine) -> dict:
+    with Session(engine) as db:
+        user = User(username="user", email="user@example.com")
+        db.add(user)
+        db.commit()
+        return {"Authorization": f"Bearer {create_jwt_token('access', user.id)}"}
+
+
+def _phases(response) -> dict:
+    entries = (entry.split(";dur=") for entry in response.headers["Server-Timing"].split(", "))
+    return {phase: float(duration) for phase, duration in entries}
+
+
+def test_server_timing_header_splits_the_request(db_engine, db_client, monkeypatch):
+    headers = _headers(db_engine)
+
+    response = db_client.get("/api/v1/auth/user", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    phases = _phases(response)
+    assert set(phases) == {"auth", "db", "serialize", "other", "total"}
+    assert phases["auth"] > 0 and phases["db"] > 0
+
+    monkeypatch.setattr(settings, "SERVER_TIMING_HEADER", False)
+    assert "Server-Timing" not in db_client.get("/api/v1/auth/user", headers=headers).headers
+
+
+def test_latency_is_labelled_by_route_template(db_client):
+    def count(route: str):
+        # No transactions for the email, so the response is a 404
+        return REGISTRY.get_sample_value(
+            "http_request_duration_seconds_count",
+            {"method": "GET", "route": route, "status": "404"},
+        )
+
+    before = count("/api/v1/transaction/balance/{email}") or 0
+
+    db_client.get("/api/v1/transaction/balance/someone@example.com")
+
+    assert count("/api/v1/transaction/balance/{email}") == before + 1
+    assert count("/api/v1/transaction/balance/someone@example.com") is None
+
+
+def test_metrics_expose_the_latency_histograms(db_client):
+    db_client.get("/api/v1/transaction/balance/someone@example.com")
+
+    body = db_client.get("/metrics").text
+
+    assert "http_request_duration_seconds_bucket{" in body
+    assert 'http_request_phase_duration_seconds_bucket{le="0.001",phase="db"' in body
@@ -0,0 +1,68 @@
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.api.models.transaction import Transaction
+from app.api.services.transaction_analytics import (
+    TransactionAnalyticsService,
+    grouped_stats,
+    load_columns,
+)
+from app.core.config import settings
+
+DAY = 86_400
+
+
+def test_grouped_stats_matches_numpy():
+    rng = np.random.default_rng(0)
+    amounts = rng.lognormal(3, 1, 1_000)
+    is_withdrawal = rng.integers(0, 2, 1_000)
+    epochs = rng.integers(0, 14 * DAY, 1_000) + 1_700_000_000
+
+    stats = grouped_stats(np.column_stack([amounts, is_withdrawal, epochs]).astype(float), "day")
+
+    for entry in stats:
+        day = np.datetime64(entry["period_start"][:19]).astype("datetime64[s]").astype(int)
+        mask = (epochs // DAY * DAY == day) & (is_withdrawal == (entry["type"] == "withdrawal"))
+        assert entry["count"] == mask.sum()
+        assert np.isclose(entry["total"], amounts[mask].sum())
+        assert np.isclose(entry["p90"], np.percentile(amounts[mask], 90))
+    assert sum(entry["count"] for entry in stats) == 1_000
+
+
+def test_weeks_start_on_monday():
+    monday = 1_704_067_200  # 2024-01-01T00:00:00Z
+    columns = load_columns([[(5.0, 0, monday + 6 * DAY)], [(7.0, 0, monday + 7 * DAY)]])
+
+    stats = grouped_stats(columns, "week")
+
+    assert [entry["period_start"] for entry in stats] == [
+        "2024-01-01T00:00:00+00:00",
+        "2024-01-08T00:00:00+00:00",
+    ]
+
+
+def test_forced_vectorized_stats_respect_the_row_cap(db_engine, monkeypatch):
+    with Session(db_engine) as db:
+        db.add_all(Transaction(email="user@example.com", amount=1.0, type="deposit") for _ in range(3))
+        db.commit()
+        service = TransactionAnalyticsService(db)
+        monkeypatch.setattr(service, "sql_stats", lambda *args: [])
+
+        monkeypatch.setattr(settings, "TRANSACTION_STATS_VECTORIZED_MAX_ROWS", 3)
+        stats, method = service.get_stats(method="vectorized")
+        assert method == "vectorized"
+        assert stats[0]["count"] == 3
+
+        monkeypatch.setattr(settings, "TRANSACTION_STATS_VECTORIZED_MAX_ROWS", 2)
+        assert service.get_stats(method="vectorized") == ([], "sql")
+
+
+def test_row_count_stops_at_the_limit(db_engine):
+    with Session(db_engine) as db:
+        db.add_all(Transaction(email="user@example.com", amount=1.0, type="deposit") for _ in range(3))
+        db.commit()
+        repository = TransactionAnalyticsService(db).repository
+
+        assert repository.count() == 3
+        assert repository.count(limit=2) == 2
+        assert repository.count(email="other@example.com", limit=2) == 0
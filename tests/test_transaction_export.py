@@ -0,0 +1,21 @@
+from fastapi import status
+from sqlalchemy.orm import Session
+
+from app.api.models.user import User
+from app.core.config import settings
+from app.utils.jwt_helpers import create_jwt_token
+
+
+def test_export_requires_an_admin(db_engine, db_client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", ["admin@example.com"])
+    with Session(db_engine) as db:
+        user = User(username="user", email="user@example.com")
+        db.add(user)
+        db.commit()
+        headers = {"Authorization": f"Bearer {create_jwt_token('access', user.id)}"}
+
+    response = db_client.get("/api/v1/transaction/export")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = db_client.get("/api/v1/transaction/export", headers=headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
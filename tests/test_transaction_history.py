@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import status
+from sqlalchemy.orm import Session
+
+from app.api.models.transaction import Transaction
+from app.utils.pagination import decode_cursor, encode_cursor
+
+EMAIL = "user@example.com"
+T0 = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+
+def _seed(engine) -> list:
+    """Five transactions an hour apart, two of them at the same time; the
+    IDs in the history's order."""
+    hours = [0, 1, 2, 2, 3]
+    with Session(engine) as db:
+        transactions = [
+            Transaction(email=EMAIL, amount=float(i), type="deposit", created_at=T0 + timedelta(hours=h))
+            for i, h in enumerate(hours)
+        ]
+        db.add_all(transactions)
+        db.add(Transaction(email="other@example.com", amount=1.0, type="deposit", created_at=T0))
+        db.commit()
+        rows = sorted(((t.created_at, t.id) for t in transactions), reverse=True)
+    return [id for _, id in rows]
+
+
+def _history(client, **params):
+    return client.get("/api/v1/transaction", params={"email": EMAIL, **params})
+
+
+def test_cursor_round_trip():
+    created_at, id = T0, "0190a5b2-7c3e-7d4f-8a1b-2c3d4e5f6a7b"
+
+    assert decode_cursor(encode_cursor(created_at, id)) == (created_at, id)
+
+
+def test_pages_follow_the_keyset_across_equal_timestamps(db_engine, db_client):
+    expected = _seed(db_engine)
+
+    seen, cursor = [], None
+    for page in range(3):
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        response = _history(db_client, **params)
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        seen += [item["id"] for item in body["data"]]
+        cursor = body["next_cursor"]
+        # The first page ends between the two transactions sharing a timestamp
+        if page == 0:
+            assert decode_cursor(cursor)[1] == expected[1]
+
+    assert seen == expected
+    assert cursor is None
+
+
+def test_range_filters_bound_created_at(db_engine, db_client):
+    expected = _seed(db_engine)
+
+    response = _history(
+        db_client,
+        **{"from": (T0 + timedelta(hours=1)).isoformat(), "to": (T0 + timedelta(hours=3)).isoformat()},
+    )
+
+    assert [item["id"] for item in response.json()["data"]] == expected[1:4]
+    assert response.json()["next_cursor"] is None
+
+
+def test_malformed_cursor_and_limits_are_rejected(db_engine, db_client):
+    _seed(db_engine)
+
+    assert _history(db_client, cursor="not-a-cursor").status_code == status.HTTP_400_BAD_REQUEST
+    assert _history(db_client, cursor=encode_cursor(T0, "not-a-uuid")).status_code == status.HTTP_400_BAD_REQUEST
+    assert _history(db_client, limit=0).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert _history(db_client, limit=201).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
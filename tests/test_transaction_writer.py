@@ -0,0 +1,122 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.api.services.transaction_writer as transaction_writer
+from app.api.models.balance import AccountBalance
+from app.api.models.transaction import Transaction
+from app.api.repositories.transaction import TransactionRepository
+
+DEPOSIT = {"email": "user@example.com", "amount": 10.0, "type": "deposit"}
+
+
+@pytest.fixture
+def writer(db_engine, monkeypatch):
+    """Creates writers whose sessions use the SQLite engine, stopping them afterwards."""
+    monkeypatch.setattr(transaction_writer, "SessionLocal", sessionmaker(bind=db_engine))
+    writers = []
+
+    def _writer(window: float, max_rows: int = 100, write_timeout: float = 5.0):
+        writers.append(
+            transaction_writer.TransactionBatchWriter(
+                window=window, max_rows=max_rows, write_timeout=write_timeout
+            )
+        )
+        return writers[-1]
+
+    yield _writer
+    for created in writers:
+        created.stop()
+
+
+def _transactions(engine) -> int:
+    with Session(engine) as db:
+        return db.execute(select(func.count()).select_from(Transaction)).scalar_one()
+
+
+def test_timed_out_rows_waiting_for_a_batch_are_never_written(db_engine, writer):
+    batch_writer = writer(window=0.3)
+
+    with pytest.raises(TimeoutError):
+        batch_writer.submit(DEPOSIT, timeout=0.05)
+    batch_writer.stop()
+
+    assert _transactions(db_engine) == 0
+
+
+def test_rows_already_being_written_are_waited_for(db_engine, writer, monkeypatch):
+    started = threading.Event()
+    create_many = TransactionRepository.create_many_with_balance
+
+    def slow_create_many(self, values):
+        started.set()
+        time.sleep(0.2)
+        return create_many(self, values)
+
+    monkeypatch.setattr(TransactionRepository, "create_many_with_balance", slow_create_many)
+    batch_writer = writer(window=0)
+
+    transaction = batch_writer.submit(DEPOSIT, timeout=0.05)
+
+    assert started.is_set()
+    assert transaction.amount == 10.0
+    assert _transactions(db_engine) == 1
+
+
+def test_failed_batch_is_retried_row_by_row(db_engine, writer):
+    batch_writer = writer(window=0.2)
+    rows = [DEPOSIT, {**DEPOSIT, "type": None}, {**DEPOSIT, "amount": 5.0}]
+
+    with ThreadPoolExecutor(len(rows)) as pool:
+        futures = [pool.submit(batch_writer.submit, values, 5.0) for values in rows]
+
+    assert futures[0].result().amount == 10.0
+    assert isinstance(futures[1].exception(), IntegrityError)
+    assert futures[2].result().amount == 5.0
+    with Session(db_engine) as db:
+        assert db.query(AccountBalance).filter_by(email="user@example.com").one().balance == 15.0
+    assert _transactions(db_engine) == 2
+
+
+def test_writer_survives_a_failure_outside_the_write(db_engine, writer, monkeypatch):
+    batch_writer = writer(window=0)
+    monkeypatch.setattr(transaction_writer, "SessionLocal", None)
+
+    with pytest.raises(TypeError):
+        batch_writer.submit(DEPOSIT, timeout=1.0)
+
+    monkeypatch.setattr(transaction_writer, "SessionLocal", sessionmaker(bind=db_engine))
+    assert batch_writer.submit(DEPOSIT, timeout=1.0).amount == 10.0
+
+
+def test_dead_writer_thread_is_restarted(db_engine, writer):
+    batch_writer = writer(window=0)
+    batch_writer.submit(DEPOSIT, timeout=1.0)
+    batch_writer._queue.put(None)
+    batch_writer._thread.join()
+
+    assert batch_writer.submit(DEPOSIT, timeout=1.0).amount == 10.0
+    assert _transactions(db_engine) == 2
+
+
+def test_wait_for_a_write_in_progress_is_bounded(writer, monkeypatch):
+    release = threading.Event()
+    create_many = TransactionRepository.create_many_with_balance
+
+    def stuck_create_many(self, values):
+        release.wait()
+        return create_many(self, values)
+
+    monkeypatch.setattr(TransactionRepository, "create_many_with_balance", stuck_create_many)
+    batch_writer = writer(window=0, write_timeout=0.1)
+
+    try:
+        with pytest.raises(RuntimeError):
+            batch_writer.submit(DEPOSIT, timeout=0.05)
+    finally:
+        release.set()